@@ -3,6 +3,9 @@ from .connection import get_connection
 from .auth import AuthManager
 from .users import UserManager
 from .applications import ApplicationManager
+from .scrape_cache import ScrapeCacheManager
+from .skill_cache import SkillCacheManager
+from .resumes import ResumeManager
 
 # Global database instance
 db_manager = DatabaseManager()
@@ -13,5 +16,8 @@ __all__ = [
     'get_connection',
     'AuthManager',
     'UserManager', 
-    'ApplicationManager'
+    'ApplicationManager',
+    'ScrapeCacheManager',
+    'SkillCacheManager',
+    'ResumeManager'
 ]
@@ -2,10 +2,13 @@ import sqlite3
 import os
 from typing import Optional
 
+# SQLite database file, relative to the working directory unless absolute
+DATABASE_PATH = os.getenv("DATABASE_PATH", "job_tracker.db")
+
 class DatabaseConnection:
     """Database connection handler"""
 
-    def __init__(self, db_path: str = "job_tracker.db"):
+    def __init__(self, db_path: str = DATABASE_PATH):
         self.db_path = db_path
         self._ensure_db_directory()
 
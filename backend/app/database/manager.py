@@ -1,5 +1,5 @@
 from typing import Optional, List, Dict, Any, Tuple
-from .connection import get_connection, set_database_path
+from .connection import get_connection, set_database_path, DATABASE_PATH
 from .models import ALL_TABLES
 from .auth import AuthManager
 from .users import UserManager
@@ -8,10 +8,10 @@ from .applications import ApplicationManager
 class DatabaseManager:
     """Main database manager that combines all database operations"""
 
-    def __init__(self, db_path: str = "job_tracker.db"):
+    def __init__(self, db_path: str = DATABASE_PATH):
         """Initialize database manager with SQLite database"""
         self.db_path = db_path
-        if db_path != "job_tracker.db":
+        if db_path != DATABASE_PATH:
             set_database_path(db_path)
 
         # Initialize managers
@@ -77,13 +77,69 @@ CREATE TABLE IF NOT EXISTS user_sessions (
 )
 '''
 
+# Scraped job description cache table
+CREATE_SCRAPE_CACHE_TABLE = '''
+CREATE TABLE IF NOT EXISTS scrape_cache (
+    url TEXT PRIMARY KEY,
+    description TEXT,
+    skills TEXT,  -- JSON string of skills array
+    skills_digest TEXT,  -- skill taxonomy the skills were extracted with
+    etag TEXT,
+    last_modified TEXT,
+    is_negative BOOLEAN DEFAULT FALSE,  -- failed scrape, cached briefly
+    size_bytes INTEGER DEFAULT 0,
+    fetched_at REAL NOT NULL,  -- unix time of last (re)validation
+    last_accessed REAL NOT NULL
+)
+'''
+
+CREATE_SCRAPE_CACHE_ACCESS_INDEX = '''
+CREATE INDEX IF NOT EXISTS idx_scrape_cache_last_accessed ON scrape_cache (last_accessed)
+'''
+
+CREATE_SKILL_CACHE_TABLE = '''
+CREATE TABLE IF NOT EXISTS skill_cache (
+    text_hash TEXT NOT NULL,  -- blake2b of the lowercased input text
+    taxonomy_digest TEXT NOT NULL,  -- skill taxonomy the skills were extracted with
+    skills TEXT NOT NULL,  -- JSON string of skills array
+    last_accessed REAL NOT NULL,
+    PRIMARY KEY (text_hash, taxonomy_digest)
+)
+'''
+
+CREATE_SKILL_CACHE_ACCESS_INDEX = '''
+CREATE INDEX IF NOT EXISTS idx_skill_cache_last_accessed ON skill_cache (last_accessed)
+'''
+
+# Latest parsed resume of each user, so features that need its content never re-parse it
+CREATE_USER_RESUMES_TABLE = '''
+CREATE TABLE IF NOT EXISTS user_resumes (
+    user_id INTEGER PRIMARY KEY,
+    filename TEXT NOT NULL,
+    content_hash TEXT NOT NULL,  -- SHA-256 of the uploaded file
+    text_hash TEXT NOT NULL,  -- SHA-256 of the extracted text
+    text BLOB NOT NULL,  -- zlib-compressed extracted text
+    word_count INTEGER NOT NULL,
+    sections TEXT NOT NULL,  -- JSON object of section heading to offsets
+    skills TEXT NOT NULL,  -- JSON string of skills array
+    analysis_key TEXT NOT NULL,  -- analyzer version and skill taxonomy the sections and skills come from
+    updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+    FOREIGN KEY (user_id) REFERENCES users (id) ON DELETE CASCADE
+)
+'''
+
 # All table creation statements
 ALL_TABLES = [
     CREATE_USERS_TABLE,
     CREATE_USER_PROFILES_TABLE,
     CREATE_JOB_APPLICATIONS_TABLE,
     CREATE_APPLICATION_STATUS_HISTORY_TABLE,
-    CREATE_USER_SESSIONS_TABLE
+    CREATE_USER_SESSIONS_TABLE,
+    CREATE_SCRAPE_CACHE_TABLE,
+    CREATE_SCRAPE_CACHE_ACCESS_INDEX,
+    CREATE_SKILL_CACHE_TABLE,
+    CREATE_SKILL_CACHE_ACCESS_INDEX,
+    CREATE_USER_RESUMES_TABLE
 ]
 
 def get_schema_script() -> str:
@@ -0,0 +1,72 @@
+import json
+import zlib
+from typing import Optional, Dict, Any
+from .connection import get_connection
+
+class ResumeManager:
+    """Handle the latest parsed resume of each user"""
+
+    def get_resume(self, user_id: int, include_text: bool = True) -> Optional[Dict[str, Any]]:
+        """Get a user's stored resume, with its text decompressed unless include_text is False"""
+        with get_connection() as conn:
+            cursor = conn.cursor()
+            cursor.execute(f'''
+                SELECT user_id, filename, content_hash, text_hash, word_count, sections, skills,
+                       analysis_key, updated_at{', text' if include_text else ''}
+                FROM user_resumes WHERE user_id = ?
+            ''', (user_id,))
+
+            entry = cursor.fetchone()
+            if not entry:
+                return None
+
+            resume = dict(entry)
+            resume['sections'] = json.loads(resume['sections'])
+            resume['skills'] = json.loads(resume['skills'])
+            if include_text:
+                resume['text'] = zlib.decompress(resume['text']).decode('utf-8')
+            return resume
+
+    def store_resume(self, user_id: int, resume: Dict[str, Any]) -> None:
+        """Store a user's parsed resume, replacing the previous one"""
+        with get_connection() as conn:
+            cursor = conn.cursor()
+            cursor.execute('''
+                INSERT OR REPLACE INTO user_resumes (user_id, filename, content_hash, text_hash, text, word_count,
+                                                     sections, skills, analysis_key, updated_at)
+                VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, CURRENT_TIMESTAMP)
+            ''', (
+                user_id, resume['filename'], resume['content_hash'], resume['text_hash'],
+                zlib.compress(resume['text'].encode('utf-8')), resume['word_count'],
+                json.dumps(resume['sections']), json.dumps(resume['skills']), resume['analysis_key']
+            ))
+            conn.commit()
+
+    def update_analysis(self, user_id: int, word_count: int, sections: Dict[str, Any], skills: list,
+                        analysis_key: str) -> None:
+        """Replace the analysis of a stored resume, keeping its text"""
+        with get_connection() as conn:
+            cursor = conn.cursor()
+            cursor.execute('''
+                UPDATE user_resumes SET word_count = ?, sections = ?, skills = ?, analysis_key = ?
+                WHERE user_id = ?
+            ''', (word_count, json.dumps(sections), json.dumps(skills), analysis_key, user_id))
+            conn.commit()
+
+    def update_source(self, user_id: int, filename: str, content_hash: str) -> None:
+        """Record a new upload whose text is the same as the stored one"""
+        with get_connection() as conn:
+            cursor = conn.cursor()
+            cursor.execute('''
+                UPDATE user_resumes SET filename = ?, content_hash = ?, updated_at = CURRENT_TIMESTAMP
+                WHERE user_id = ?
+            ''', (filename, content_hash, user_id))
+            conn.commit()
+
+    def delete_resume(self, user_id: int) -> bool:
+        """Delete a user's stored resume"""
+        with get_connection() as conn:
+            cursor = conn.cursor()
+            cursor.execute('DELETE FROM user_resumes WHERE user_id = ?', (user_id,))
+            conn.commit()
+            return cursor.rowcount > 0
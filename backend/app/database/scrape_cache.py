@@ -0,0 +1,106 @@
+import json
+import time
+from typing import Optional, List, Dict, Any
+from .connection import get_connection
+
+# A read only refreshes an entry's last_accessed once it is this many seconds
+# old, so that cache hits are plain reads and don't queue for the write lock
+ACCESS_TIME_RESOLUTION = 60
+
+class ScrapeCacheManager:
+    """Handle the on-disk cache of scraped job descriptions"""
+
+    def get_entry(self, url: str) -> Optional[Dict[str, Any]]:
+        """
+        Get a cached scrape entry by URL and mark it as recently used, to within
+        ACCESS_TIME_RESOLUTION seconds
+        """
+        with get_connection() as conn:
+            cursor = conn.cursor()
+            cursor.execute('''
+                SELECT url, description, skills, skills_digest, etag, last_modified, is_negative, fetched_at, last_accessed
+                FROM scrape_cache WHERE url = ?
+            ''', (url,))
+
+            entry = cursor.fetchone()
+            if not entry:
+                return None
+
+            now = time.time()
+            if now - entry['last_accessed'] >= ACCESS_TIME_RESOLUTION:
+                cursor.execute('''
+                    UPDATE scrape_cache SET last_accessed = ? WHERE url = ?
+                ''', (now, url))
+                conn.commit()
+
+            entry = dict(entry)
+            entry['is_negative'] = bool(entry['is_negative'])
+            entry['skills'] = json.loads(entry['skills']) if entry['skills'] else []
+            return entry
+
+    def store_entry(self, url: str, description: str, skills: List[str], skills_digest: Optional[str] = None,
+                    etag: Optional[str] = None, last_modified: Optional[str] = None) -> None:
+        """Store a successfully scraped description with its skills, extracted with the given taxonomy"""
+        now = time.time()
+        size_bytes = len(url) + len(description.encode('utf-8'))
+        with get_connection() as conn:
+            cursor = conn.cursor()
+            cursor.execute('''
+                INSERT OR REPLACE INTO scrape_cache
+                (url, description, skills, skills_digest, etag, last_modified, is_negative, size_bytes, fetched_at, last_accessed)
+                VALUES (?, ?, ?, ?, ?, ?, FALSE, ?, ?, ?)
+            ''', (url, description, json.dumps(skills), skills_digest, etag, last_modified, size_bytes, now, now))
+            conn.commit()
+
+    def store_negative(self, url: str) -> None:
+        """Remember a failed scrape so the URL is not retried immediately"""
+        now = time.time()
+        with get_connection() as conn:
+            cursor = conn.cursor()
+            cursor.execute('''
+                INSERT OR REPLACE INTO scrape_cache
+                (url, description, skills, etag, last_modified, is_negative, size_bytes, fetched_at, last_accessed)
+                VALUES (?, '', '[]', NULL, NULL, TRUE, ?, ?, ?)
+            ''', (url, len(url), now, now))
+            conn.commit()
+
+    def store_skills(self, url: str, skills: List[str], skills_digest: str) -> None:
+        """Replace the skills of an entry, extracted again with another taxonomy"""
+        with get_connection() as conn:
+            cursor = conn.cursor()
+            cursor.execute('''
+                UPDATE scrape_cache SET skills = ?, skills_digest = ? WHERE url = ?
+            ''', (json.dumps(skills), skills_digest, url))
+            conn.commit()
+
+    def mark_revalidated(self, url: str) -> None:
+        """Reset the freshness of an entry after a 304 Not Modified response"""
+        with get_connection() as conn:
+            cursor = conn.cursor()
+            cursor.execute('''
+                UPDATE scrape_cache SET fetched_at = ? WHERE url = ?
+            ''', (time.time(), url))
+            conn.commit()
+
+    def evict(self, max_bytes: int) -> int:
+        """Evict least recently used entries until the cache fits in max_bytes"""
+        with get_connection() as conn:
+            cursor = conn.cursor()
+            cursor.execute('SELECT COALESCE(SUM(size_bytes), 0) FROM scrape_cache')
+            total = cursor.fetchone()[0]
+            if total <= max_bytes:
+                return 0
+
+            cursor.execute('''
+                SELECT url, size_bytes FROM scrape_cache ORDER BY last_accessed ASC
+            ''')
+            evicted = []
+            for row in cursor.fetchall():
+                if total <= max_bytes:
+                    break
+                evicted.append((row['url'],))
+                total -= row['size_bytes']
+
+            cursor.executemany('DELETE FROM scrape_cache WHERE url = ?', evicted)
+            conn.commit()
+            return len(evicted)
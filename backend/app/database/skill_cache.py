@@ -0,0 +1,61 @@
+import json
+import time
+from typing import Optional, List, Tuple
+from .connection import get_connection
+
+class SkillCacheManager:
+    """Handle the on-disk tier of the skill extraction cache"""
+
+    def get_skills(self, text_hash: str, taxonomy_digest: str) -> Optional[List[str]]:
+        """Get the cached skills of a text and mark them as recently used"""
+        with get_connection() as conn:
+            cursor = conn.cursor()
+            cursor.execute('''
+                SELECT skills FROM skill_cache WHERE text_hash = ? AND taxonomy_digest = ?
+            ''', (text_hash, taxonomy_digest))
+
+            entry = cursor.fetchone()
+            if not entry:
+                return None
+
+            cursor.execute('''
+                UPDATE skill_cache SET last_accessed = ? WHERE text_hash = ? AND taxonomy_digest = ?
+            ''', (time.time(), text_hash, taxonomy_digest))
+            conn.commit()
+            return json.loads(entry['skills'])
+
+    def store_skills(self, entries: List[Tuple[str, List[str]]], taxonomy_digest: str) -> None:
+        """Store (text hash, skills) pairs extracted with the given taxonomy"""
+        now = time.time()
+        with get_connection() as conn:
+            cursor = conn.cursor()
+            cursor.executemany('''
+                INSERT OR REPLACE INTO skill_cache (text_hash, taxonomy_digest, skills, last_accessed)
+                VALUES (?, ?, ?, ?)
+            ''', [(text_hash, taxonomy_digest, json.dumps(skills), now) for text_hash, skills in entries])
+            conn.commit()
+
+    def delete_other_taxonomies(self, taxonomy_digest: str) -> int:
+        """Drop entries extracted with any taxonomy other than the given one"""
+        with get_connection() as conn:
+            cursor = conn.cursor()
+            cursor.execute('DELETE FROM skill_cache WHERE taxonomy_digest != ?', (taxonomy_digest,))
+            conn.commit()
+            return cursor.rowcount
+
+    def evict(self, max_entries: int) -> int:
+        """Evict least recently used entries until at most max_entries remain"""
+        with get_connection() as conn:
+            cursor = conn.cursor()
+            cursor.execute('SELECT COUNT(*) FROM skill_cache')
+            excess = cursor.fetchone()[0] - max_entries
+            if excess <= 0:
+                return 0
+
+            cursor.execute('''
+                DELETE FROM skill_cache WHERE rowid IN (
+                    SELECT rowid FROM skill_cache ORDER BY last_accessed ASC LIMIT ?
+                )
+            ''', (excess,))
+            conn.commit()
+            return cursor.rowcount
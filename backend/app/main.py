@@ -2,8 +2,10 @@ import logging
 from fastapi import FastAPI
 from fastapi.staticfiles import StaticFiles
 from fastapi.responses import FileResponse
-from app.routers import jobs, cv_review, grammar_check, resources, auth, users, applications
+from app.routers import jobs, cv_review, grammar_check, resources, auth, users, applications, metrics, skills
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.middleware.gzip import GZipMiddleware
+from app.services.uploads import UploadSizeLimitMiddleware, CV_MAX_UPLOAD_BYTES, CV_BATCH_MAX_UPLOAD_BYTES
 import os
 
 logging.basicConfig(level=logging.INFO)
@@ -25,6 +27,8 @@ app.include_router(resources.router, prefix="/api/resources", tags=["resources"]
 app.include_router(auth.router, prefix="/api/auth", tags=["authentication"])
 app.include_router(users.router, prefix="/api/users", tags=["users"])
 app.include_router(applications.router, prefix="/api", tags=["applications"])
+app.include_router(metrics.router, prefix="/api/metrics", tags=["metrics"])
+app.include_router(skills.router, prefix="/api/skills", tags=["skills"])
 
 origins = [
     "http://localhost",  
@@ -33,6 +37,18 @@ origins = [
     "*"  # Allow all origins for development
 ]
 
+# Compress larger responses (job listings and search results are mostly repetitive JSON)
+app.add_middleware(GZipMiddleware, minimum_size=1000, compresslevel=6)
+
+# Refuse oversized resume uploads before they are read
+app.add_middleware(UploadSizeLimitMiddleware, limits={
+    "/api/cv-review": CV_MAX_UPLOAD_BYTES,
+    "/api/cv-review/batch": CV_BATCH_MAX_UPLOAD_BYTES,
+    "/api/users/resume": CV_MAX_UPLOAD_BYTES
+})
+
+# Middleware added last runs first: CORS is outermost, so that every response,
+# including a 413 from the upload limit, carries its headers
 app.add_middleware(
     CORSMiddleware,
     allow_origins=origins,
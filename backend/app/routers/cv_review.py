@@ -1,16 +1,109 @@
-from fastapi import APIRouter, UploadFile, File, HTTPException
-from app.services.cv_service import parse_resume
+import os
+from typing import List, Optional
+from fastapi import APIRouter, UploadFile, File, HTTPException, Query, Request
+from fastapi.responses import StreamingResponse
+from starlette.background import BackgroundTask
+from starlette.concurrency import run_in_threadpool
+from app.services.cv_parser_pool import resume_parser, ResumeParserBusyError, ResumeParseTimeoutError
+from app.services.cv_service import UNSUPPORTED_FILE_MESSAGE
+from app.services.job_ranking import match_resume
+from app.routers.jobs import parse_fields, project_job, FIELDS_DESCRIPTION
+from app.services.cv_results import review_resume
+from app.services.uploads import spool_upload, read_uploaded_files
+from app.services.cv_batch import stream_batch_review, CV_BATCH_MAX_FILES
 
 router = APIRouter()
 
+STRUCTURED_DESCRIPTION = "Return only structured results, without the formatted analysis text"
+
 @router.post("/")
-async def review_cv(file: UploadFile = File(...)):
+async def review_cv(
+    file: UploadFile = File(...),
+    structured: bool = Query(False, description=STRUCTURED_DESCRIPTION)
+):
     """
     Endpoint to accept resume upload and return parsing info.
+    The upload is spooled to a temporary file and parsed in a worker process,
+    so large documents are never held in memory or block other requests.
+    Results are cached by document content; cache_hit tells whether this one was.
     """
+    path, sha256 = await spool_upload(file)
     try:
-        contents = await file.read()
-        result = parse_resume(contents, file.filename)
+        result = await review_resume(path, sha256, file.filename, structured)
         return result
+    except ResumeParserBusyError as e:
+        raise HTTPException(status_code=503, detail=str(e))
+    except ResumeParseTimeoutError as e:
+        raise HTTPException(status_code=422, detail=f"Failed to parse resume: {str(e)}")
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Failed to parse resume: {str(e)}")
+    finally:
+        os.remove(path)
+
+# The batch endpoint parses its upload itself, so the form is documented by hand
+BATCH_REQUEST_BODY = {
+    "requestBody": {
+        "required": True,
+        "content": {"multipart/form-data": {"schema": {
+            "type": "object",
+            "required": ["files"],
+            "properties": {"files": {
+                "type": "array",
+                "items": {"type": "string", "format": "binary"},
+                "description": "Resumes (.pdf, .docx, .txt) and/or ZIP archives of resumes"
+            }}
+        }}}
+    }
+}
+
+@router.post("/batch", openapi_extra=BATCH_REQUEST_BODY)
+async def review_cv_batch(
+    request: Request,
+    structured: bool = Query(False, description=STRUCTURED_DESCRIPTION)
+):
+    """
+    Review many resumes at once. Results are streamed as NDJSON: one line per
+    resume as soon as it is reviewed, then a summary of the whole batch.
+    The upload is parsed as it arrives, writing the files to disk, and is
+    refused as soon as it holds more than CV_BATCH_MAX_FILES files.
+    """
+    files = await read_uploaded_files(request, "files", CV_BATCH_MAX_FILES)
+
+    async def close_files():
+        for upload in files:
+            await upload.close()
+
+    return StreamingResponse(stream_batch_review(files, structured), media_type="application/x-ndjson",
+                             background=BackgroundTask(close_files))
+
+@router.post("/match")
+async def match_cv_to_jobs(
+    file: UploadFile = File(...),
+    limit: int = Query(10, ge=1, le=50, description="Number of jobs to return"),
+    fields: Optional[str] = Query(None, description=FIELDS_DESCRIPTION)
+):
+    """
+    Rank the jobs fetched so far by relevance to an uploaded resume.
+    Each match lists the job's required skills the resume covers and those it is missing.
+    """
+    selected_fields = parse_fields(fields)
+    path, _ = await spool_upload(file)
+    try:
+        text = await resume_parser.extract_text(path, file.filename)
+        if text is None:
+            raise HTTPException(status_code=400, detail=UNSUPPORTED_FILE_MESSAGE)
+        result = await run_in_threadpool(match_resume, text, limit)
+    except HTTPException:
+        raise
+    except ResumeParserBusyError as e:
+        raise HTTPException(status_code=503, detail=str(e))
+    except ResumeParseTimeoutError as e:
+        raise HTTPException(status_code=422, detail=f"Failed to parse resume: {str(e)}")
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Failed to match resume: {str(e)}")
+    finally:
+        os.remove(path)
+
+    for match in result["matches"]:
+        match["job"] = project_job(match["job"], selected_fields)
+    return {"filename": file.filename, **result}
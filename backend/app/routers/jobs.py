@@ -1,94 +1,204 @@
+import json
 import logging
-from fastapi import APIRouter, HTTPException, Query
-from typing import List, Dict, Any
+from fastapi import APIRouter, HTTPException, Query, Depends
+from fastapi.responses import StreamingResponse
+from typing import List, Dict, Any, Optional, Tuple
 from app.services.job_service import fetch_jobs
-from app.services.skill_service import extract_skills_from_job, analyze_skills_demand, get_skill_recommendations
+from app.services.job_store import job_store
+from app.services.job_sources import JOB_FIELDS
+from app.services.skill_service import analyze_skills_demand, get_skill_recommendations
+from app.services import metrics
 from app.services.resource_service import fetch_resources
+from app.services.skill_index import skill_index, profile_skills_to_bitset, skills_to_bitset, bitset_to_skills
+from app.services.skill_demand import market_demand
+from app.services.skill_cooccurrence import skill_cooccurrence
+from app.services.user_resumes import get_user_resume
+from app.database import db_manager
+from app.auth import get_current_user, parse_skills
+from app.models import SessionUser
 
 logger = logging.getLogger(__name__)
 router = APIRouter()
 
+# Every field a job can be projected to: the common schema plus what the job store adds
+JOB_RESPONSE_FIELDS = JOB_FIELDS + ('id', 'source', 'clean_description', 'location', 'salary', 'required_skills')
+
+# Listings return this compact view by default; full descriptions come from GET /{job_id}
+JOB_SUMMARY_FIELDS = (
+    'id', 'source', 'title', 'companyName', 'companyLogo', 'excerpt', 'applicationLink',
+    'pubDate', 'employmentType', 'seniority', 'categories', 'location', 'salary',
+    'minSalary', 'maxSalary', 'currency', 'required_skills'
+)
+
+FIELDS_DESCRIPTION = "Comma-separated job fields to return, or '*' for every field"
+
+def parse_fields(fields: Optional[str], default: Optional[Tuple[str, ...]] = JOB_SUMMARY_FIELDS) -> Optional[Tuple[str, ...]]:
+    """
+    Turn the fields query parameter into the job keys to return.
+    None means every field. The id is always included so jobs can be fetched in full later.
+    """
+    if fields is None:
+        return default
+    if fields.strip() == "*":
+        return None
+
+    requested = [field.strip() for field in fields.split(",") if field.strip()]
+    unknown = [field for field in requested if field not in JOB_RESPONSE_FIELDS]
+    if unknown:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Unknown job fields: {', '.join(unknown)}. Available fields: {', '.join(JOB_RESPONSE_FIELDS)}"
+        )
+    return tuple(dict.fromkeys(["id"] + requested))
+
+def project_job(job: Dict[str, Any], fields: Optional[Tuple[str, ...]]) -> Dict[str, Any]:
+    """Copy the requested fields of a stored job (all of them if fields is None)"""
+    if fields is None:
+        return dict(job)
+    return {field: job[field] for field in fields if field in job}
+
 @router.get("/")
-def get_jobs(limit: int = Query(20, ge=1, le=50), offset: int = Query(0, ge=0)):
+def get_jobs(
+    limit: int = Query(20, ge=1, le=50),
+    offset: int = Query(0, ge=0),
+    fields: Optional[str] = Query(None, description=FIELDS_DESCRIPTION)
+):
     """
     Fetch jobs from external API with pagination.
+    Returns a compact view of each job unless other fields are requested.
     """
+    selected_fields = parse_fields(fields)
     try:
         # Return just job list (use .get if API returns a dict)
         jobs = fetch_jobs(limit, offset)
-        return {"jobs": jobs}
+        return {"jobs": [project_job(job, selected_fields) for job in jobs]}
     except Exception as e:
         logger.error(f"Error fetching jobs: {e}")
         raise HTTPException(status_code=503, detail=f"Failed to fetch jobs from external API: {e}")
 
+def filter_jobs_by_query(jobs: List[Dict[str, Any]], query: str) -> List[Dict[str, Any]]:
+    """Keep the jobs whose title, description or company mention the query"""
+    filtered_jobs = []
+    for job in jobs:
+        job_text = f"{job.get('title', '')} {job.get('description', '')} {job.get('companyName', '')}".lower()
+        if query.lower() in job_text:
+            filtered_jobs.append(job)
+    return filtered_jobs
+
+def build_skills_summary(jobs_with_skills: List[Dict[str, Any]]) -> Dict[str, Any]:
+    """Build the skill demand analysis, recommendations and resources for enriched jobs"""
+    all_skills = []
+    for job in jobs_with_skills:
+        all_skills.extend(job["required_skills"])
+
+    # Analyze skill demand across the jobs in these results
+    skill_demand = analyze_skills_demand(jobs_with_skills)
+
+    # Get top skills from search results
+    top_skills = list(skill_demand.keys())[:10]
+
+    # Fetch learning resources for top skills
+    resources_by_skill = {}
+    for skill in top_skills[:5]:  # Limit to top 5 skills to avoid too many API calls
+        try:
+            resources = fetch_resources(skill)
+            if resources:
+                resources_by_skill[skill] = resources[:3]  # Limit to 3 resources per skill
+        except Exception as e:
+            logger.warning(f"Failed to fetch resources for skill {skill}: {e}")
+            resources_by_skill[skill] = []
+
+    # Get skill recommendations: skills that co-occur with these ones across every
+    # known job first, then related and in-demand skills
+    unique_skills = sorted(set(all_skills))
+    related_skills = [skill for skill, _ in skill_cooccurrence.related(unique_skills)]
+    recommendations = get_skill_recommendations(unique_skills, market_demand.job_counts(), related_skills)
+
+    return {
+        "skills_analysis": {
+            "top_skills": [{"skill": skill, "demand": count} for skill, count in list(skill_demand.items())[:10]],
+            "total_unique_skills": len(skill_demand),
+            "market_top_skills": market_demand.top_skills(10),
+            "skill_recommendations": recommendations
+        },
+        "learning_resources": resources_by_skill
+    }
+
+def stream_search_results(query: str, limit: int, offset: int, filtered_jobs: List[Dict[str, Any]],
+                          fields: Optional[Tuple[str, ...]] = JOB_SUMMARY_FIELDS, has_more: bool = False):
+    """Yield NDJSON lines: one per job as soon as it is enriched, then a summary"""
+    jobs_with_skills = []
+    try:
+        for job in job_store.enrich_as_completed(filtered_jobs):
+            jobs_with_skills.append(job)
+            yield json.dumps({"type": "job", "job": project_job(job, fields)}) + "\n"
+
+        summary = build_skills_summary(jobs_with_skills)
+        yield json.dumps({
+            "type": "summary",
+            "query": query,
+            "total_jobs": len(jobs_with_skills),
+            **summary,
+            "pagination": {
+                "limit": limit,
+                "offset": offset,
+                "has_more": has_more
+            }
+        }) + "\n"
+    except Exception as e:
+        # Headers are already sent, so report the failure in-band
+        logger.error(f"Error streaming job search results: {e}")
+        yield json.dumps({"type": "error", "detail": f"Failed to search jobs: {e}"}) + "\n"
+
 @router.get("/search")
 def search_jobs_with_skills(
     query: str = Query(..., min_length=2, description="Search query for jobs"),
     limit: int = Query(10, ge=1, le=20, description="Number of jobs to return"),
-    offset: int = Query(0, ge=0, description="Pagination offset")
+    offset: int = Query(0, ge=0, description="Pagination offset"),
+    stream: bool = Query(False, description="Stream results as NDJSON, one job per line followed by a summary"),
+    fields: Optional[str] = Query(None, description=FIELDS_DESCRIPTION)
 ):
     """
     Search for jobs and return results with extracted skills and learning resources.
     """
+    selected_fields = parse_fields(fields)
     try:
-        # Fetch jobs from external API
-        jobs = fetch_jobs(limit, offset)
+        request_metrics = metrics.track_request()
 
-        # Filter jobs based on search query
-        filtered_jobs = []
-        for job in jobs:
-            job_text = f"{job.get('title', '')} {job.get('description', '')} {job.get('companyName', '')}".lower()
-            if query.lower() in job_text:
-                filtered_jobs.append(job)
-
-        # Extract skills from each job
-        jobs_with_skills = []
-        all_skills = []
-
-        for job in filtered_jobs:
-            job_skills = extract_skills_from_job(job)
-            job_with_skills = {
-                **job,
-                "required_skills": job_skills
-            }
-            jobs_with_skills.append(job_with_skills)
-            all_skills.extend(job_skills)
+        if stream:
+            # Enrich while streaming so the first job is sent as soon as it is ready
+            jobs = fetch_jobs(limit, offset, enrich=False)
+            filtered_jobs = filter_jobs_by_query(jobs, query)
+            return StreamingResponse(
+                stream_search_results(query, limit, offset, filtered_jobs, selected_fields,
+                                      has_more=len(jobs) == limit),
+                media_type="application/x-ndjson"
+            )
 
-        # Analyze skill demand across all jobs
-        skill_demand = analyze_skills_demand(filtered_jobs)
+        # Fetch jobs from external API (enriched as they enter the job store)
+        jobs = fetch_jobs(limit, offset)
 
-        # Get top skills from search results
-        top_skills = list(skill_demand.keys())[:10]
+        # Filter jobs based on search query
+        filtered_jobs = filter_jobs_by_query(jobs, query)
 
-        # Fetch learning resources for top skills
-        resources_by_skill = {}
-        for skill in top_skills[:5]:  # Limit to top 5 skills to avoid too many API calls
-            try:
-                resources = fetch_resources(skill)
-                if resources:
-                    resources_by_skill[skill] = resources[:3]  # Limit to 3 resources per skill
-            except Exception as e:
-                logger.warning(f"Failed to fetch resources for skill {skill}: {e}")
-                resources_by_skill[skill] = []
+        # Skills are precomputed for each job, so the jobs can be summarized as they are
+        summary = build_skills_summary(filtered_jobs)
 
-        # Get skill recommendations
-        unique_skills = list(set(all_skills))
-        recommendations = get_skill_recommendations(unique_skills, skill_demand)
+        logger.info(
+            f"Job search '{query}': {len(filtered_jobs)} jobs, "
+            f"{int(request_metrics.get('skills.extract_calls', 0))} skill extraction calls"
+        )
 
         return {
             "query": query,
-            "total_jobs": len(jobs_with_skills),
-            "jobs": jobs_with_skills,
-            "skills_analysis": {
-                "top_skills": [{"skill": skill, "demand": count} for skill, count in list(skill_demand.items())[:10]],
-                "total_unique_skills": len(skill_demand),
-                "skill_recommendations": recommendations
-            },
-            "learning_resources": resources_by_skill,
+            "total_jobs": len(filtered_jobs),
+            "jobs": [project_job(job, selected_fields) for job in filtered_jobs],
+            **summary,
             "pagination": {
                 "limit": limit,
                 "offset": offset,
-                "has_more": len(filtered_jobs) == limit
+                # The query filters a page of fetched jobs; a full page means there may be more
+                "has_more": len(jobs) == limit
             }
         }
 
@@ -96,29 +206,124 @@ def search_jobs_with_skills(
         logger.error(f"Error in job search with skills: {e}")
         raise HTTPException(status_code=503, detail=f"Failed to search jobs: {e}")
 
+@router.get("/demand")
+def get_skill_demand(
+    limit: int = Query(20, ge=1, le=100, description="Number of skills to return"),
+    location: Optional[str] = Query(None, description="Only count jobs open to this location"),
+    category: Optional[str] = Query(None, description="Only count jobs in this category")
+):
+    """
+    Returns time-decayed skill demand across every job fetched so far,
+    or within one location or one category.
+    """
+    if location and category:
+        raise HTTPException(status_code=400, detail="Filter by location or by category, not both")
+    return {
+        "location": location,
+        "category": category,
+        "total_jobs": market_demand.total_jobs(),
+        "top_skills": market_demand.top_skills(limit, location, category)
+    }
+
+@router.get("/recommended")
+def get_recommended_jobs(
+    limit: int = Query(10, ge=1, le=50, description="Number of jobs to return"),
+    metric: str = Query("jaccard", description="Scoring: 'jaccard' similarity or 'overlap' count"),
+    fields: Optional[str] = Query(None, description=FIELDS_DESCRIPTION),
+    include_resume: bool = Query(False, description="Also count the skills of the user's stored resume"),
+    current_user: SessionUser = Depends(get_current_user)
+):
+    """
+    Rank the known jobs by how well their skills match the user's profile skills,
+    and optionally those found in their stored resume.
+    """
+    if metric not in ("jaccard", "overlap"):
+        raise HTTPException(status_code=400, detail="metric must be 'jaccard' or 'overlap'")
+    selected_fields = parse_fields(fields)
+
+    user = db_manager.get_user_by_id(current_user.id)
+    if not user:
+        raise HTTPException(status_code=404, detail="User not found")
+
+    user_skills = parse_skills(user.get('skills')) or []
+    user_bits = profile_skills_to_bitset(user_skills)
+    if include_resume:
+        resume = get_user_resume(current_user.id)
+        if resume:
+            user_bits |= skills_to_bitset(resume["skills"])
+    if not user_bits:
+        raise HTTPException(status_code=400, detail="Add some technical skills to your profile to get recommendations")
+
+    try:
+        if len(skill_index) == 0:
+            # Nothing fetched since startup; index the latest postings first
+            fetch_jobs(50, 0)
+
+        recommended = []
+        for job_id, score, job_bits in skill_index.rank(user_bits, limit, metric):
+            job = job_store.get(job_id)
+            if not job:
+                continue
+            recommended.append({
+                **project_job(job, selected_fields),
+                "match_score": round(score, 4),
+                "matched_skills": bitset_to_skills(job_bits & user_bits),
+                "missing_skills": bitset_to_skills(job_bits & ~user_bits)
+            })
+
+        return {
+            "skills": bitset_to_skills(user_bits),
+            "metric": metric,
+            "total_jobs_indexed": len(skill_index),
+            "jobs": recommended
+        }
+
+    except Exception as e:
+        logger.error(f"Error ranking recommended jobs: {e}")
+        raise HTTPException(status_code=503, detail=f"Failed to get recommended jobs: {e}")
+
+@router.get("/{job_id}")
+def get_job(job_id: str, fields: Optional[str] = Query(None, description=FIELDS_DESCRIPTION)):
+    """
+    Get one job by its stable id, including its full description.
+    """
+    selected_fields = parse_fields(fields, default=None)
+    try:
+        job = job_store.get(job_id)
+
+        if not job:
+            # The job may predate a restart; refresh the latest postings once
+            fetch_jobs(50, 0)
+            job = job_store.get(job_id)
+
+        if not job:
+            raise HTTPException(status_code=404, detail="Job not found")
+
+        return project_job(job, selected_fields)
+
+    except HTTPException:
+        raise
+    except Exception as e:
+        logger.error(f"Error getting job: {e}")
+        raise HTTPException(status_code=503, detail=f"Failed to get job: {e}")
+
 @router.get("/{job_id}/skills")
 def get_job_skills(job_id: str):
     """
-    Get skills for a specific job by fetching job details and extracting skills.
+    Get skills for a specific job by its stable id.
     """
     try:
-        # For this example, we'll fetch recent jobs and find the matching one
-        # In a real implementation, you'd have a proper job details endpoint
-        jobs = fetch_jobs(50, 0)  # Fetch more jobs to find the specific one
-
-        target_job = None
-        for job in jobs:
-            # Match by title or company name (since we don't have actual job IDs from the API)
-            if (job_id.lower() in job.get('title', '').lower() or
-                job_id.lower() in job.get('companyName', '').lower()):
-                target_job = job
-                break
+        target_job = job_store.get(job_id)
+
+        if not target_job:
+            # The job may predate a restart; refresh the latest postings once
+            fetch_jobs(50, 0)
+            target_job = job_store.get(job_id)
 
         if not target_job:
             raise HTTPException(status_code=404, detail="Job not found")
 
-        # Extract skills from the job
-        job_skills = extract_skills_from_job(target_job)
+        job_skills = job_store.enrich([target_job])[0]["required_skills"]
 
         # Fetch learning resources for each skill
         resources_by_skill = {}
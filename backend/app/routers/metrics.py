@@ -0,0 +1,11 @@
+from fastapi import APIRouter
+from app.services import metrics
+
+router = APIRouter()
+
+@router.get("/")
+def get_metrics():
+    """
+    Returns internal counters and gauges for monitoring.
+    """
+    return metrics.snapshot()
@@ -0,0 +1,39 @@
+from fastapi import APIRouter, Request, Query
+from fastapi.responses import JSONResponse, Response
+from app.services.skill_taxonomy import get_taxonomy
+from app.services.skill_cooccurrence import skill_cooccurrence
+
+router = APIRouter()
+
+@router.get("/taxonomy")
+def get_skill_taxonomy(request: Request):
+    """
+    Returns the skill taxonomy (skills, aliases, categories and related skills).
+    Clients revalidate with If-None-Match and get a 304 while it is unchanged.
+    """
+    taxonomy = get_taxonomy()
+    headers = {
+        "ETag": f'"{taxonomy.digest}"',
+        "Cache-Control": "no-cache"
+    }
+    if request.headers.get("if-none-match") == headers["ETag"]:
+        return Response(status_code=304, headers=headers)
+    return JSONResponse(taxonomy.document, headers=headers)
+
+@router.get("/related")
+def get_related_skills(
+    skills: str = Query(..., min_length=1, description="Comma-separated list of skills"),
+    limit: int = Query(5, ge=1, le=50, description="Number of related skills to return")
+):
+    """
+    Returns the skills most often required together with the given ones in job postings.
+    """
+    skill_list = [skill.strip().lower() for skill in skills.split(",") if skill.strip()]
+    return {
+        "skills": skill_list,
+        "total_jobs": skill_cooccurrence.total_jobs(),
+        "related": [
+            {"skill": skill, "score": score}
+            for skill, score in skill_cooccurrence.related(skill_list, limit)
+        ]
+    }
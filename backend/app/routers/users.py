@@ -1,9 +1,18 @@
-from fastapi import APIRouter, HTTPException, Depends, status
+import os
+from typing import Optional
+from fastapi import APIRouter, HTTPException, Depends, status, UploadFile, File, Query
 from app.models import (
     UserProfile, UserResponse, MessageResponse, SessionUser
 )
 from app.database import db_manager
 from app.auth import get_current_user, parse_skills, serialize_skills
+from app.routers.jobs import parse_fields, project_job, FIELDS_DESCRIPTION
+from app.services.cv_parser_pool import ResumeParserBusyError, ResumeParseTimeoutError
+from app.services.job_ranking import match_resume
+from app.services.uploads import spool_upload
+from app.services.user_resumes import (
+    get_user_resume, store_user_resume, resume_manager, UnsupportedResumeError
+)
 
 router = APIRouter()
 
@@ -64,3 +73,65 @@ async def get_user_profile(current_user: SessionUser = Depends(get_current_user)
 
     user['skills'] = parse_skills(user.get('skills'))
     return UserResponse(**user)
+
+@router.put("/resume")
+async def upload_user_resume(
+    file: UploadFile = File(...),
+    current_user: SessionUser = Depends(get_current_user)
+):
+    """
+    Store the user's latest resume: its text, sections and skills are kept so
+    that matching and skill gap features never need the document again.
+    Uploading the same document again does not re-parse it.
+    """
+    path, sha256 = await spool_upload(file)
+    try:
+        return await store_user_resume(current_user.id, path, sha256, file.filename)
+    except UnsupportedResumeError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except ResumeParserBusyError as e:
+        raise HTTPException(status_code=503, detail=str(e))
+    except ResumeParseTimeoutError as e:
+        raise HTTPException(status_code=422, detail=f"Failed to parse resume: {str(e)}")
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Failed to store resume: {str(e)}")
+    finally:
+        os.remove(path)
+
+@router.get("/resume")
+def get_stored_resume(
+    include_text: bool = Query(False, description="Include the resume's full text"),
+    current_user: SessionUser = Depends(get_current_user)
+):
+    """Get the user's stored resume: file name, sections and skills"""
+    resume = get_user_resume(current_user.id, include_text)
+    if not resume:
+        raise HTTPException(status_code=404, detail="No resume uploaded yet")
+    return resume
+
+@router.delete("/resume", response_model=MessageResponse)
+def delete_stored_resume(current_user: SessionUser = Depends(get_current_user)):
+    """Delete the user's stored resume"""
+    if not resume_manager.delete_resume(current_user.id):
+        raise HTTPException(status_code=404, detail="No resume uploaded yet")
+    return MessageResponse(message="Resume deleted")
+
+@router.get("/resume/matches")
+def match_stored_resume(
+    limit: int = Query(10, ge=1, le=50, description="Number of jobs to return"),
+    fields: Optional[str] = Query(None, description=FIELDS_DESCRIPTION),
+    current_user: SessionUser = Depends(get_current_user)
+):
+    """
+    Rank the jobs fetched so far by relevance to the user's stored resume,
+    like /api/cv-review/match without uploading it again.
+    """
+    selected_fields = parse_fields(fields)
+    resume = get_user_resume(current_user.id, include_text=True)
+    if not resume:
+        raise HTTPException(status_code=404, detail="No resume uploaded yet")
+
+    result = match_resume(resume["text"], limit, resume["skills"])
+    for match in result["matches"]:
+        match["job"] = project_job(match["job"], selected_fields)
+    return {"filename": resume["filename"], **result}
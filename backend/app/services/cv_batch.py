@@ -0,0 +1,181 @@
+import asyncio
+import json
+import logging
+import os
+import time
+import zipfile
+from typing import AsyncIterator, Dict, List, Optional, Tuple
+from fastapi import HTTPException, UploadFile
+from starlette.concurrency import run_in_threadpool
+from app.services.cv_parser_pool import resume_parser
+from app.services.cv_results import review_resume
+from app.services.uploads import spool_file, CV_MAX_UPLOAD_BYTES
+
+logger = logging.getLogger(__name__)
+
+# Most resumes reviewed in one batch, counting the files inside ZIP archives
+CV_BATCH_MAX_FILES = int(os.getenv("CV_BATCH_MAX_FILES", "100"))
+
+RESUME_EXTENSIONS = (".pdf", ".docx", ".txt")
+
+# A document ready for review: its name, and either its spooled path and
+# SHA-256, or the reason it can't be reviewed
+_Document = Tuple[str, Optional[str], Optional[str], Optional[str]]
+
+def _zip_entries(archive: zipfile.ZipFile) -> List[zipfile.ZipInfo]:
+    """Resume files in an archive, skipping folders and metadata such as __MACOSX/"""
+    entries = []
+    for info in archive.infolist():
+        name = info.filename
+        basename = os.path.basename(name)
+        if info.is_dir() or name.startswith("__MACOSX/") or basename.startswith("."):
+            continue
+        if name.lower().endswith(RESUME_EXTENSIONS):
+            entries.append(info)
+    return entries
+
+def _spool_zip_entry(archive: zipfile.ZipFile, info: zipfile.ZipInfo) -> Tuple[str, str]:
+    # The declared size can't be trusted, so spool_file counts what is actually inflated
+    with archive.open(info) as entry:
+        return spool_file(entry, info.filename, CV_MAX_UPLOAD_BYTES)
+
+async def _documents(files: List[UploadFile]) -> AsyncIterator[_Document]:
+    """
+    Spool the uploaded resumes one at a time, expanding ZIP archives.
+    Documents are only spooled when the caller asks for the next one, so at
+    any time only the uploads and the documents being reviewed are on disk.
+    """
+    limit_reached = f"Not reviewed: a batch is limited to {CV_BATCH_MAX_FILES} resumes"
+    count = 0
+    for upload in files:
+        filename = upload.filename or "upload"
+        if not filename.lower().endswith(".zip"):
+            count += 1
+            if count > CV_BATCH_MAX_FILES:
+                yield filename, None, None, limit_reached
+                return
+            try:
+                path, sha256 = await run_in_threadpool(spool_file, upload.file, filename, CV_MAX_UPLOAD_BYTES)
+                yield filename, path, sha256, None
+            except HTTPException as e:
+                yield filename, None, None, e.detail
+            continue
+
+        try:
+            archive = await run_in_threadpool(zipfile.ZipFile, upload.file)
+        except zipfile.BadZipFile:
+            yield filename, None, None, "Not a valid ZIP archive"
+            continue
+        with archive:
+            for info in _zip_entries(archive):
+                count += 1
+                if count > CV_BATCH_MAX_FILES:
+                    yield info.filename, None, None, limit_reached
+                    return
+                try:
+                    path, sha256 = await run_in_threadpool(_spool_zip_entry, archive, info)
+                    yield info.filename, path, sha256, None
+                except (HTTPException, zipfile.BadZipFile, RuntimeError) as e:
+                    yield info.filename, None, None, getattr(e, "detail", None) or str(e)
+
+async def _review(filename: str, path: str, sha256: str, structured_only: bool) -> dict:
+    try:
+        result = await review_resume(path, sha256, filename, structured_only)
+        return {"type": "resume", "filename": filename, "result": result}
+    except Exception as e:
+        return {"type": "resume", "filename": filename, "error": f"Failed to parse resume: {e}"}
+    finally:
+        _remove(path)
+
+def _remove(path: str) -> None:
+    try:
+        os.remove(path)
+    except FileNotFoundError:
+        pass
+
+class _BatchStats:
+    """Aggregate statistics of a batch, kept as counters so memory doesn't grow with it"""
+
+    def __init__(self):
+        self.started = time.perf_counter()
+        self.total_files = 0
+        self.succeeded = 0
+        self.failed = 0
+        self.cache_hits = 0
+        self.total_words = 0
+        self.sections_missing: Dict[str, int] = {}
+
+    def add(self, item: dict) -> None:
+        self.total_files += 1
+        result = item.get("result") or {}
+        if "word_count" not in result:
+            self.failed += 1
+            return
+        self.succeeded += 1
+        self.cache_hits += result.get("cache_hit", False)
+        self.total_words += result["word_count"]
+        for section in result["sections_missing"]:
+            self.sections_missing[section] = self.sections_missing.get(section, 0) + 1
+
+    def summary(self) -> dict:
+        return {
+            "type": "summary",
+            "total_files": self.total_files,
+            "succeeded": self.succeeded,
+            "failed": self.failed,
+            "cache_hits": self.cache_hits,
+            "average_word_count": round(self.total_words / self.succeeded) if self.succeeded else 0,
+            "sections_missing": dict(sorted(self.sections_missing.items(), key=lambda x: x[1], reverse=True)),
+            "elapsed_seconds": round(time.perf_counter() - self.started, 3)
+        }
+
+async def stream_batch_review(files: List[UploadFile], structured_only: bool = False) -> AsyncIterator[str]:
+    """
+    Review many resumes in parallel and yield NDJSON lines: one per document as
+    soon as its review finishes, then a summary of the whole batch.
+    With structured_only, results leave out the formatted analysis text.
+    At most one document per parser worker is in flight, so the batch never
+    crowds out single uploads, and only those documents are held for review
+    however many the batch contains.
+    """
+    stats = _BatchStats()
+    documents = _documents(files)
+    in_flight: Dict[asyncio.Task, str] = {}
+    exhausted = False
+    try:
+        while True:
+            while not exhausted and len(in_flight) < resume_parser.workers:
+                try:
+                    filename, path, sha256, error = await documents.__anext__()
+                except StopAsyncIteration:
+                    exhausted = True
+                    break
+                if error is not None:
+                    item = {"type": "resume", "filename": filename, "error": error}
+                    stats.add(item)
+                    yield json.dumps(item) + "\n"
+                    continue
+                in_flight[asyncio.ensure_future(_review(filename, path, sha256, structured_only))] = path
+
+            if not in_flight:
+                break
+            done, _ = await asyncio.wait(in_flight, return_when=asyncio.FIRST_COMPLETED)
+            for task in done:
+                del in_flight[task]
+                item = task.result()
+                stats.add(item)
+                yield json.dumps(item) + "\n"
+
+        yield json.dumps(stats.summary()) + "\n"
+    except Exception as e:
+        # Headers are already sent, so report the failure in-band
+        logger.error(f"Error streaming batch resume review: {e}")
+        yield json.dumps({"type": "error", "detail": f"Failed to review resumes: {e}"}) + "\n"
+    finally:
+        # The client may have gone away mid-batch: stop, and let the reviews clean up their files
+        for task in in_flight:
+            task.cancel()
+        await asyncio.gather(*in_flight, return_exceptions=True)
+        for path in in_flight.values():
+            _remove(path)
+        await documents.aclose()
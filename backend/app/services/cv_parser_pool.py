@@ -0,0 +1,162 @@
+import asyncio
+import itertools
+import logging
+import multiprocessing
+import os
+import signal
+from functools import partial
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from typing import Any, Callable, Dict, Optional
+from app.services import metrics
+from app.services import cv_service
+
+logger = logging.getLogger(__name__)
+
+# Resume parsing (PDF and DOCX text extraction) is CPU bound, so it runs in
+# worker processes instead of on the event loop. At most CV_PARSE_WORKERS
+# documents are parsed at once and CV_PARSE_MAX_PENDING wait for a worker;
+# uploads beyond that are turned away rather than queued without bound
+CV_PARSE_WORKERS = int(os.getenv("CV_PARSE_WORKERS", str(min(4, os.cpu_count() or 1))))
+CV_PARSE_MAX_PENDING = int(os.getenv("CV_PARSE_MAX_PENDING", str(CV_PARSE_WORKERS * 4)))
+# Seconds a worker may spend on one document before it is killed and replaced
+CV_PARSE_TIMEOUT = float(os.getenv("CV_PARSE_TIMEOUT", "30"))
+# Address space limit of each worker process, in MB (0 for no limit)
+CV_WORKER_MEMORY_MB = int(os.getenv("CV_WORKER_MEMORY_MB", "1024"))
+
+class ResumeParserBusyError(RuntimeError):
+    """Raised when too many resumes are already waiting to be parsed"""
+
+class ResumeParseTimeoutError(RuntimeError):
+    """Raised when a resume took longer than CV_PARSE_TIMEOUT to parse"""
+
+# In a worker process: the queue on which each task reports the process running it
+_task_pids = None
+
+def _init_worker(memory_limit_bytes: int, task_pids) -> None:
+    global _task_pids
+    _task_pids = task_pids
+    cv_service.init_worker(memory_limit_bytes)
+
+def _run_task(task_id: int, fn: Callable[[str, str], Any], path: str, filename: str) -> Any:
+    _task_pids.put((task_id, os.getpid()))
+    return fn(path, filename)
+
+class ResumeParserPool:
+    """
+    Bounded pool of resume parser processes.
+
+    Documents are only handed to the pool when a worker is free, so the
+    timeout covers parsing alone, not time spent waiting in line. A worker
+    that hangs is killed, which like a worker that crashes (e.g. killed for
+    running out of memory) breaks the pool: it is replaced, and the other
+    documents it was parsing are retried on the new one.
+    """
+
+    def __init__(self, workers: int = CV_PARSE_WORKERS, max_pending: int = CV_PARSE_MAX_PENDING,
+                 timeout: float = CV_PARSE_TIMEOUT, memory_limit_mb: int = CV_WORKER_MEMORY_MB):
+        self.workers = workers
+        self.max_pending = max_pending
+        self.timeout = timeout
+        self.memory_limit_mb = memory_limit_mb
+        self._executor: Optional[ProcessPoolExecutor] = None
+        self._slots: Optional[asyncio.Semaphore] = None
+        self._waiting = 0
+        # Workers report the pid running each task, so that a hung one can be killed
+        self._task_pids = None
+        self._task_ids = itertools.count()
+        self._running: Dict[int, int] = {}
+
+    def _get_executor(self) -> ProcessPoolExecutor:
+        if self._executor is None:
+            context = multiprocessing.get_context("spawn")
+            if self._task_pids is None:
+                self._task_pids = context.SimpleQueue()
+            # Spawned workers only import the resume parser, not the app
+            self._executor = ProcessPoolExecutor(
+                max_workers=self.workers,
+                mp_context=context,
+                initializer=_init_worker,
+                initargs=(self.memory_limit_mb * 1024 * 1024, self._task_pids)
+            )
+        return self._executor
+
+    def _collect_task_pids(self) -> None:
+        """Read the pids reported by tasks that have started"""
+        while self._task_pids is not None and not self._task_pids.empty():
+            task_id, pid = self._task_pids.get()
+            self._running[task_id] = pid
+
+    def _kill_task(self, task_id: int) -> None:
+        """Kill the worker running a task. Its pool breaks, and stops its other workers itself"""
+        self._collect_task_pids()
+        pid = self._running.pop(task_id, None)
+        if pid is not None:
+            try:
+                os.kill(pid, signal.SIGKILL)
+            except ProcessLookupError:
+                pass
+
+    def _replace(self, executor: ProcessPoolExecutor) -> None:
+        """Stop using a pool that hung or crashed; the next parse starts a new pool"""
+        if self._executor is not executor:
+            # Already replaced by another request that saw the same failure
+            return
+        self._executor = None
+        executor.shutdown(wait=False, cancel_futures=True)
+        metrics.increment("cv.pool_restarts")
+
+    async def parse(self, path: str, filename: str, structured_only: bool = False) -> dict:
+        """
+        Parse a resume file in a worker process (see cv_service.parse_resume).
+        Workers read the file themselves, so its content never has to be
+        copied between processes.
+        """
+        return await self._run(partial(cv_service.parse_resume, structured_only=structured_only), path, filename)
+
+    async def extract_text(self, path: str, filename: str) -> Optional[str]:
+        """Extract the text of a resume file in a worker process (see cv_service.extract_resume_text)"""
+        return await self._run(cv_service.extract_resume_text, path, filename)
+
+    async def _run(self, fn: Callable[[str, str], Any], path: str, filename: str) -> Any:
+        if self._slots is None:
+            self._slots = asyncio.Semaphore(self.workers)
+        if self._slots.locked() and self._waiting >= self.max_pending:
+            metrics.increment("cv.parse_rejected")
+            raise ResumeParserBusyError("Too many resumes are being processed, please try again shortly")
+
+        self._waiting += 1
+        try:
+            await self._slots.acquire()
+        finally:
+            self._waiting -= 1
+
+        try:
+            # A pool can break because a neighbouring document crashed or hung its
+            # worker; this document is then retried once on the new pool
+            for attempt in range(2):
+                executor = self._get_executor()
+                task_id = next(self._task_ids)
+                try:
+                    future = executor.submit(_run_task, task_id, fn, path, filename)
+                    return await asyncio.wait_for(asyncio.wrap_future(future), self.timeout)
+                except asyncio.TimeoutError:
+                    logger.warning(f"Parsing {filename} took over {self.timeout}s, killing its worker")
+                    metrics.increment("cv.parse_timeouts")
+                    self._kill_task(task_id)
+                    self._replace(executor)
+                    raise ResumeParseTimeoutError(f"Resume took longer than {self.timeout:g} seconds to parse")
+                except BrokenProcessPool as e:
+                    logger.warning(f"Resume parser worker died while parsing {filename}: {e}")
+                    metrics.increment("cv.worker_crashes")
+                    self._replace(executor)
+                    if attempt:
+                        raise RuntimeError("Resume parser worker crashed")
+                finally:
+                    self._collect_task_pids()
+                    self._running.pop(task_id, None)
+        finally:
+            self._slots.release()
+
+# Shared by all resume uploads
+resume_parser = ResumeParserPool()
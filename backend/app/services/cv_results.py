@@ -0,0 +1,102 @@
+import os
+import shutil
+import threading
+from collections import OrderedDict
+from typing import Awaitable, BinaryIO, Hashable, Optional
+from starlette.concurrency import run_in_threadpool
+from app.services import metrics
+from app.services.cv_service import ANALYZER_VERSION, with_filename
+from app.services.cv_parser_pool import resume_parser
+from app.services.resilience import AsyncSingleFlight
+from app.services.skill_taxonomy import get_taxonomy
+
+# Analysis results of recently reviewed resumes, most recently used last.
+# Results are a few KB each
+CV_CACHE_MAX_ENTRIES = int(os.getenv("CV_CACHE_MAX_ENTRIES", "1000"))
+
+class ResumeResultCache:
+    """Bounded LRU cache of resume analysis results keyed by document content"""
+
+    def __init__(self, max_entries: int = CV_CACHE_MAX_ENTRIES):
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[Hashable, dict]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: Hashable) -> Optional[dict]:
+        with self._lock:
+            result = self._entries.get(key)
+            if result is not None:
+                self._entries.move_to_end(key)
+        metrics.increment("cv.cache_hits" if result is not None else "cv.cache_misses")
+        return result
+
+    def put(self, key: Hashable, result: dict) -> None:
+        with self._lock:
+            self._entries[key] = result
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+            metrics.set_gauge("cv.cache_entries", len(self._entries))
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+resume_results = ResumeResultCache()
+_parse_flight = AsyncSingleFlight("resume_parse")
+
+def _copy(source: BinaryIO, path: str) -> None:
+    """Copy an open file to path, and close it"""
+    try:
+        with source, open(path, "wb") as target:
+            shutil.copyfileobj(source, target)
+    except BaseException:
+        if os.path.exists(path):
+            os.remove(path)
+        raise
+
+async def _parse(path: str, source: Optional[BinaryIO], filename: str, structured_only: bool, key: tuple) -> dict:
+    if source is not None:
+        await run_in_threadpool(_copy, source, path)
+    try:
+        result = await resume_parser.parse(path, filename, structured_only)
+    finally:
+        os.remove(path)
+    # Failed parses are not cached, so a retry gets another chance
+    if "word_count" in result:
+        resume_results.put(key, result)
+    return result
+
+def result_key(sha256: str, filename: str, structured_only: bool = False) -> tuple:
+    """
+    Cache key of a document: its content hash, the analyzer version, the skill
+    taxonomy its skills were found with, and its file type, since the same
+    bytes are read differently as PDF, DOCX or text.
+    """
+    return (sha256, ANALYZER_VERSION, get_taxonomy().digest, os.path.splitext(filename.lower())[1], structured_only)
+
+async def review_resume(path: str, sha256: str, filename: str, structured_only: bool = False) -> dict:
+    """
+    Analyze a spooled resume, reusing the result of an earlier upload of the
+    same document. Identical uploads arriving together are parsed once.
+    The result's cache_hit tells whether it came from the cache.
+    """
+    key = result_key(sha256, filename, structured_only)
+    cached = resume_results.get(key)
+    if cached is not None:
+        return dict(with_filename(cached, filename), cache_hit=True)
+
+    def parse() -> Awaitable[dict]:
+        # Called only for the first of identical requests. The shared parse can
+        # outlive that request, which removes its upload when it ends, so the
+        # parse works on a link to the file that it removes itself. Without hard
+        # links, the upload is opened right away and copied off the event loop
+        own_path = path + ".parse"
+        try:
+            os.link(path, own_path)
+            source = None
+        except OSError:
+            source = open(path, "rb")
+        return _parse(own_path, source, filename, structured_only, key)
+
+    result = await _parse_flight.do(key, parse)
+    return dict(with_filename(result, filename), cache_hit=False)
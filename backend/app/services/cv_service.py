@@ -1,155 +1,229 @@
 import io
-import re
+import logging
+import os
+from typing import BinaryIO, Optional, Union
 from docx import Document
 import PyPDF2
-def check_sections(text: str, required_sections: list) -> dict:
+from app.services.skill_taxonomy import get_taxonomy
+from app.services.text_analyzer import SECTION_HEADINGS
+
+logger = logging.getLogger(__name__)
+
+# Only the first pages of a PDF are analyzed; a resume never needs more, and a
+# huge document would tie up a parser worker for no benefit
+CV_MAX_PAGES = int(os.getenv("CV_MAX_PAGES", "20"))
+# Text extraction stops once this many characters have been read
+CV_MAX_TEXT_CHARS = int(os.getenv("CV_MAX_TEXT_CHARS", "50000"))
+
+UNSUPPORTED_FILE_MESSAGE = "Unsupported file type. Please upload a .pdf, .docx, or .txt file."
+
+# Version of the resume analysis. Bump it whenever parse_resume's output
+# changes, so previously cached results are not served anymore
+ANALYZER_VERSION = 2
+
+def init_worker(memory_limit_bytes: int) -> None:
     """
-    Check if required CV sections are present in the parsed text.
-    Returns dict with sections found/missing lists.
+    Set up a resume parser worker process: cap its address space so a
+    malicious or broken document fails with MemoryError instead of exhausting
+    the host. Limits are only available on Unix.
     """
-    text_lower = text.lower()
-    found = []
-    missing = []
-    for section in required_sections:
-        # Use simple case-insensitive search with word boundary for accuracy
-        if re.search(r"\b" + re.escape(section.lower()) + r"\b", text_lower):
-            found.append(section)
-        else:
-            missing.append(section)
-    return {"found_sections": found, "missing_sections": missing}
-def parse_resume(file_content: bytes, filename: str) -> dict:
+    try:
+        import resource
+    except ImportError:
+        return
+    if memory_limit_bytes > 0:
+        resource.setrlimit(resource.RLIMIT_AS, (memory_limit_bytes, memory_limit_bytes))
+
+def with_filename(result: dict, filename: str) -> dict:
+    """A copy of an analysis result for the same document uploaded under another name"""
+    renamed = dict(result, filename=filename)
+    if "analysis" in result:
+        renamed["analysis"] = result["analysis"].replace(
+            f"Resume Analysis for: {result['filename']}", f"Resume Analysis for: {filename}", 1
+        )
+    return renamed
+
+def _read_pdf(file: BinaryIO, filename: str, max_pages: int, max_chars: int) -> str:
+    """Extract PDF text page by page, stopping once there is enough to analyze"""
+    reader = PyPDF2.PdfReader(file)
+    pages = []
+    length = 0
+    for page_number, page in enumerate(reader.pages):
+        if page_number >= max_pages or length >= max_chars:
+            logger.info(f"Only the first {page_number} pages of {filename} were analyzed")
+            break
+        page_text = page.extract_text()
+        if page_text:
+            pages.append(page_text + "\n")
+            length += len(page_text) + 1
+    return "".join(pages)[:max_chars]
+
+def _read_docx(file: BinaryIO, max_chars: int) -> str:
+    """Extract DOCX paragraphs, stopping once there is enough to analyze"""
+    paragraphs = []
+    length = 0
+    for para in Document(file).paragraphs:
+        if length >= max_chars:
+            break
+        paragraphs.append(para.text)
+        length += len(para.text) + 1
+    return "\n".join(paragraphs)[:max_chars]
+
+def extract_resume_text(source: Union[str, bytes, BinaryIO], filename: str, max_pages: int = CV_MAX_PAGES,
+                        max_chars: int = CV_MAX_TEXT_CHARS) -> Optional[str]:
     """
-    Parses the resume content based on file extension.
-    Supports .pdf, .docx, and plain text files.
-    Checks for required CV sections.
-    Returns extracted info and summary.
+    Text of a resume, or None if its file type is not supported.
+    source is a file path, a binary file object or the file content.
+    Only the first max_pages of a PDF and the first max_chars of text are read.
     """
-    text = ""
+    if isinstance(source, str):
+        with open(source, "rb") as file:
+            return extract_resume_text(file, filename, max_pages, max_chars)
+    file = io.BytesIO(source) if isinstance(source, (bytes, bytearray)) else source
+
     lower_fname = filename.lower()
+    if lower_fname.endswith(".docx"):
+        return _read_docx(file, max_chars)
+    if lower_fname.endswith(".pdf"):
+        return _read_pdf(file, filename, max_pages, max_chars)
+    if lower_fname.endswith(".txt"):
+        return file.read(max_chars * 4).decode("utf-8", errors="ignore")[:max_chars]
+    return None
+
+def _suggestions(analysis: dict, missing_sections: list) -> list:
+    """Recommendations and corrections for a resume, from its text analysis"""
+    word_count = analysis["word_count"]
+    suggestions = []
+
+    if len(missing_sections) == 0:
+        suggestions.append("✅ Excellent! Your resume contains all key sections.")
+    elif len(missing_sections) <= 2:
+        suggestions.append("📝 Good foundation! Consider adding the missing sections above.")
+    else:
+        suggestions.append("📋 Consider adding more key sections to strengthen your resume.")
+
+    if word_count < 200:
+        suggestions.append("📏 Your resume might benefit from more detailed descriptions.")
+        suggestions.append("   → Try expanding each role with 2-3 bullet points of achievements")
+        suggestions.append("   → Add quantifiable results (e.g., 'Increased sales by 25%')")
+    elif word_count > 800:
+        suggestions.append("✂️ Consider condensing content for better readability.")
+        suggestions.append("   → Aim for 1-2 pages maximum")
+        suggestions.append("   → Remove older or less relevant experiences")
+    else:
+        suggestions.append("📏 Word count looks good for a professional resume.")
+
+    # Add specific content suggestions based on missing sections
+    if "Contact Information" in missing_sections:
+        suggestions.append("📞 Missing Contact Info - Add: Phone, Email, LinkedIn, Location")
+
+    if "Summary" in missing_sections:
+        suggestions.append("📝 Add Professional Summary - 2-3 sentences highlighting your key strengths")
+
+    if "Work Experience" in missing_sections:
+        suggestions.append("💼 Missing Work Experience - Include job titles, companies, dates, and achievements")
+
+    if "Skills" in missing_sections:
+        suggestions.append("🛠️ Add Skills Section - List technical and soft skills relevant to your target role")
+
+    if "Education" in missing_sections:
+        suggestions.append("🎓 Include Education - Add degrees, institutions, and graduation years")
+
+    # Format improvement suggestions
+    if not analysis["action_verbs"]:
+        suggestions.append("💪 Use stronger action verbs (achieved, increased, improved, managed, led)")
+
+    if not analysis["quantified"]:
+        suggestions.append("📊 Add quantifiable achievements with numbers, percentages, or dollar amounts")
+
+    if analysis["line_count"] < 5:
+        suggestions.append("📋 Consider better formatting with clear sections and bullet points")
+
+    return suggestions
+
+def _format_analysis(filename: str, word_count: int, found_sections: list, missing_sections: list,
+                     suggestions: list) -> str:
+    """The user-friendly analysis summary shown in the UI"""
+    analysis_summary = []
+    analysis_summary.append(f"📄 Resume Analysis for: {filename}")
+    analysis_summary.append(f"📊 Total words: {word_count}")
+    analysis_summary.append("")
+
+    if found_sections:
+        analysis_summary.append("✅ SECTIONS FOUND:")
+        for section in found_sections:
+            analysis_summary.append(f"   • {section}")
+        analysis_summary.append("")
+
+    if missing_sections:
+        analysis_summary.append("❌ MISSING SECTIONS (Consider Adding):")
+        for section in missing_sections:
+            analysis_summary.append(f"   • {section}")
+        analysis_summary.append("")
+
+    # Add recommendations and specific corrections
+    analysis_summary.append("💡 RECOMMENDATIONS & CORRECTIONS:")
+    for suggestion in suggestions:
+        analysis_summary.append(f"   • {suggestion}")
+
+    analysis_summary.append("")
+    analysis_summary.append("🎯 NEXT STEPS:")
+    if missing_sections:
+        analysis_summary.append(f"   1. Add the {len(missing_sections)} missing section(s) listed above")
+    analysis_summary.append("   2. Review each section for completeness and relevance")
+    analysis_summary.append("   3. Proofread for grammar and spelling errors")
+    analysis_summary.append("   4. Ensure consistent formatting throughout")
+
+    return "\n".join(analysis_summary)
+
+def parse_resume(source: Union[str, bytes, BinaryIO], filename: str, max_pages: int = CV_MAX_PAGES,
+                 max_chars: int = CV_MAX_TEXT_CHARS, structured_only: bool = False) -> dict:
+    """
+    Parses the resume content based on file extension.
+    Supports .pdf, .docx, and plain text files (see extract_resume_text).
+    Checks for required CV sections, action verbs, quantified achievements and skills.
+    Returns extracted info and summary; with structured_only, the formatted
+    analysis summary is left out.
+    """
     try:
-        if lower_fname.endswith(".docx"):
-            doc = Document(io.BytesIO(file_content))
-            text = "\n".join([para.text for para in doc.paragraphs])
-        elif lower_fname.endswith(".pdf"):
-            reader = PyPDF2.PdfReader(io.BytesIO(file_content))
-            for page in reader.pages:
-                page_text = page.extract_text()
-                if page_text:
-                    text += page_text + "\n"
-        elif lower_fname.endswith(".txt"):
-            text = file_content.decode("utf-8")
-        else:
+        text = extract_resume_text(source, filename, max_pages, max_chars)
+        if text is None:
             return {
                 "filename": filename,
-                "message": "Unsupported file type. Please upload a .pdf, .docx, or .txt file."
+                "message": UNSUPPORTED_FILE_MESSAGE
             }
-        word_count = len(text.split())
-        preview = text[:500]
-        # Customize list based on CV expectations
-        required_sections = [
-            "Contact Information",
-            "Summary",
-            "Work Experience",
-            "Education",
-            "Skills",
-            "Certifications",
-            "Projects"
-        ]
-
-        sections_check = check_sections(text, required_sections)
-
-        # Create user-friendly analysis summary
-        analysis_summary = []
-        analysis_summary.append(f"📄 Resume Analysis for: {filename}")
-        analysis_summary.append(f"📊 Total words: {word_count}")
-        analysis_summary.append("")
-
-        if sections_check["found_sections"]:
-            analysis_summary.append("✅ SECTIONS FOUND:")
-            for section in sections_check["found_sections"]:
-                analysis_summary.append(f"   • {section}")
-            analysis_summary.append("")
-
-        if sections_check["missing_sections"]:
-            analysis_summary.append("❌ MISSING SECTIONS (Consider Adding):")
-            for section in sections_check["missing_sections"]:
-                analysis_summary.append(f"   • {section}")
-            analysis_summary.append("")
-
-        # Add recommendations and specific corrections
-        analysis_summary.append("💡 RECOMMENDATIONS & CORRECTIONS:")
-        suggestions = []
-
-        if len(sections_check["missing_sections"]) == 0:
-            suggestions.append("✅ Excellent! Your resume contains all key sections.")
-        elif len(sections_check["missing_sections"]) <= 2:
-            suggestions.append("📝 Good foundation! Consider adding the missing sections above.")
-        else:
-            suggestions.append("📋 Consider adding more key sections to strengthen your resume.")
-
-        if word_count < 200:
-            suggestions.append("📏 Your resume might benefit from more detailed descriptions.")
-            suggestions.append("   → Try expanding each role with 2-3 bullet points of achievements")
-            suggestions.append("   → Add quantifiable results (e.g., 'Increased sales by 25%')")
-        elif word_count > 800:
-            suggestions.append("✂️ Consider condensing content for better readability.")
-            suggestions.append("   → Aim for 1-2 pages maximum")
-            suggestions.append("   → Remove older or less relevant experiences")
-        else:
-            suggestions.append("📏 Word count looks good for a professional resume.")
-
-        # Add specific content suggestions based on missing sections
-        if "Contact Information" in sections_check["missing_sections"]:
-            suggestions.append("📞 Missing Contact Info - Add: Phone, Email, LinkedIn, Location")
-
-        if "Summary" in sections_check["missing_sections"]:
-            suggestions.append("📝 Add Professional Summary - 2-3 sentences highlighting your key strengths")
-
-        if "Work Experience" in sections_check["missing_sections"]:
-            suggestions.append("💼 Missing Work Experience - Include job titles, companies, dates, and achievements")
-
-        if "Skills" in sections_check["missing_sections"]:
-            suggestions.append("🛠️ Add Skills Section - List technical and soft skills relevant to your target role")
-
-        if "Education" in sections_check["missing_sections"]:
-            suggestions.append("🎓 Include Education - Add degrees, institutions, and graduation years")
-
-        # Format improvement suggestions
-        text_lower = text.lower()
-        if not re.search(r'\b(achieved|increased|improved|managed|led|developed|created)\b', text_lower):
-            suggestions.append("💪 Use stronger action verbs (achieved, increased, improved, managed, led)")
-
-        if not re.search(r'\d+%|\$\d+|\d+,\d+|\d+ years?', text):
-            suggestions.append("📊 Add quantifiable achievements with numbers, percentages, or dollar amounts")
-
-        if len(text.split('\n')) < 5:
-            suggestions.append("📋 Consider better formatting with clear sections and bullet points")
-
-        for suggestion in suggestions:
-            analysis_summary.append(f"   • {suggestion}")
-
-        analysis_summary.append("")
-        analysis_summary.append("🎯 NEXT STEPS:")
-        if sections_check["missing_sections"]:
-            analysis_summary.append(f"   1. Add the {len(sections_check['missing_sections'])} missing section(s) listed above")
-        analysis_summary.append("   2. Review each section for completeness and relevance")
-        analysis_summary.append("   3. Proofread for grammar and spelling errors")
-        analysis_summary.append("   4. Ensure consistent formatting throughout")
 
-        user_friendly_output = "\n".join(analysis_summary)
+        # A single pass over the text finds everything the review is based on
+        analysis = get_taxonomy().analyzer.analyze(text)
+        word_count = analysis["word_count"]
+        found_sections = list(analysis["sections"])
+        missing_sections = [section for section in SECTION_HEADINGS if section not in analysis["sections"]]
+        suggestions = _suggestions(analysis, missing_sections)
 
-        return {
+        result = {
             "filename": filename,
             "word_count": word_count,
-            "preview": preview,
-            "sections_found": sections_check["found_sections"],
-            "sections_missing": sections_check["missing_sections"],
-            "analysis": user_friendly_output,
+            "preview": text[:500],
+            "sections_found": found_sections,
+            "sections_missing": missing_sections
+        }
+        if not structured_only:
+            result["analysis"] = _format_analysis(filename, word_count, found_sections, missing_sections, suggestions)
+        result.update({
+            "skills_found": analysis["skills"],
+            "text_analysis": analysis,
             "suggestions_count": len(suggestions),
-            "has_corrections": len(sections_check["missing_sections"]) > 0 or word_count < 200 or word_count > 800,
+            "has_corrections": len(missing_sections) > 0 or word_count < 200 or word_count > 800,
             "message": "Resume analysis completed successfully!"
-        }
+        })
+        return result
 
+    except MemoryError:
+        # Raised when a parser worker reaches its memory limit
+        return {
+            "filename": filename,
+            "message": "Error parsing resume: the document is too large to analyze"
+        }
     except Exception as e:
         return {
             "filename": filename,
@@ -1,20 +1,130 @@
+import bisect
+import hashlib
+import os
+import re
+import threading
+from collections import OrderedDict
+from typing import Dict, Hashable, List, Optional, Tuple
 import requests
+from app.services.resilience import CircuitBreaker, SingleFlight
+from app.services import metrics
+from app.services import upstream
 
-def check_grammar(text: str) -> dict:
+LANGUAGETOOL_ENDPOINT = "https://api.languagetool.org/v2/check"
+
+# LanguageTool matches of recently checked paragraphs, most recently used last
+GRAMMAR_CACHE_MAX_ENTRIES = int(os.getenv("GRAMMAR_CACHE_MAX_ENTRIES", "5000"))
+
+# LanguageTool treats every line as a paragraph
+_PARAGRAPH = re.compile(r'[^\n]+')
+
+# Identical concurrent checks share one upstream call; a failing upstream is failed fast
+_languagetool_breaker = CircuitBreaker("languagetool", failure_threshold=5, reset_timeout=30, latency_budget=5)
+_languagetool_flight = SingleFlight("languagetool")
+
+class ParagraphCheckCache:
+    """Bounded LRU cache of the LanguageTool matches of single paragraphs, keyed by content"""
+
+    def __init__(self, max_entries: int = GRAMMAR_CACHE_MAX_ENTRIES):
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[Hashable, List[dict]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: Hashable) -> Optional[List[dict]]:
+        with self._lock:
+            matches = self._entries.get(key)
+            if matches is not None:
+                self._entries.move_to_end(key)
+        metrics.increment("grammar.cache_hits" if matches is not None else "grammar.cache_misses")
+        return matches
+
+    def put(self, key: Hashable, matches: List[dict]) -> None:
+        with self._lock:
+            self._entries[key] = matches
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+            metrics.set_gauge("grammar.cache_entries", len(self._entries))
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+paragraph_checks = ParagraphCheckCache()
+
+def paragraph_key(language: str, paragraph: str) -> Tuple[str, str]:
+    return (language, hashlib.blake2b(paragraph.encode('utf-8', 'surrogatepass'), digest_size=16).hexdigest())
+
+def _request_check(endpoint: str, params: dict) -> dict:
+    """Perform the LanguageTool API request"""
+    response = upstream.post(endpoint, data=params, timeout=10)
+    response.raise_for_status()
+    return response.json()
+
+def _check_paragraphs(paragraphs: List[str], language: str) -> List[List[dict]]:
     """
-    Calls the free LanguageTool API to check grammar and formats the response
-    with user-friendly corrections.
+    Check paragraphs with a single LanguageTool request. Returns the matches
+    of each paragraph, with offsets relative to the paragraph.
     """
-    endpoint = "https://api.languagetool.org/v2/check"
+    text = "\n".join(paragraphs)
     params = {
         "text": text,
-        "language": "en-US",
+        "language": language,
     }
-    
+    metrics.increment("grammar.upstream_chars", len(text))
+    raw_result = _languagetool_flight.do(
+        (language, text),
+        lambda: _languagetool_breaker.call(_request_check, LANGUAGETOOL_ENDPOINT, params)
+    )
+
+    starts = []
+    position = 0
+    for paragraph in paragraphs:
+        starts.append(position)
+        position += len(paragraph) + 1
+
+    checked: List[List[dict]] = [[] for _ in paragraphs]
+    for match in raw_result.get("matches", []):
+        index = bisect.bisect_right(starts, match.get("offset", 0)) - 1
+        checked[index].append(dict(match, offset=match.get("offset", 0) - starts[index]))
+    return checked
+
+def check_grammar(text: str) -> dict:
+    """
+    Calls the free LanguageTool API to check grammar and formats the response
+    with user-friendly corrections.
+
+    Text is checked paragraph by paragraph, and the matches of every paragraph
+    are cached by its content, so rechecking an edited text only sends the
+    paragraphs that changed. Those are checked together in one request.
+    """
+    language = "en-US"
+    paragraphs = [(match.start(), paragraph_key(language, match.group()), match.group())
+                  for match in _PARAGRAPH.finditer(text) if not match.group().isspace()]
+
+    found: Dict[Tuple[str, str], List[dict]] = {}
+    unchecked: Dict[Tuple[str, str], str] = {}
+    for _, key, paragraph in paragraphs:
+        if key in found or key in unchecked:
+            continue
+        matches = paragraph_checks.get(key)
+        if matches is None:
+            unchecked[key] = paragraph
+        else:
+            found[key] = matches
+
     try:
-        response = requests.post(endpoint, data=params, timeout=10)
-        response.raise_for_status()
-        raw_result = response.json()
+        if unchecked:
+            checked = _check_paragraphs(list(unchecked.values()), language)
+            for key, matches in zip(unchecked, checked):
+                paragraph_checks.put(key, matches)
+                found[key] = matches
+
+        # Back to offsets in the whole text, which the suggestions refer to
+        raw_result = {"matches": [
+            dict(match, offset=start + match.get("offset", 0))
+            for start, key, _ in paragraphs
+            for match in found[key]
+        ]}
 
         # Format the response to include user-friendly corrections
         formatted_result = format_grammar_suggestions(text, raw_result)
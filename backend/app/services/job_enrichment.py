@@ -0,0 +1,124 @@
+import html
+import re
+import logging
+import contextvars
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from typing import List, Dict, Any, Iterator, Optional
+from app.services.skill_service import extract_skills_from_job, extract_skills_batch, job_skill_text
+from app.services import metrics
+
+logger = logging.getLogger(__name__)
+
+# Scrapes are network bound, so enrich a page of jobs concurrently
+ENRICHMENT_WORKERS = 8
+
+_enrichment_pool = ThreadPoolExecutor(max_workers=ENRICHMENT_WORKERS, thread_name_prefix="job-enrichment")
+
+def clean_description(description: Optional[str]) -> str:
+    """Strip HTML markup and collapse whitespace in a job description"""
+    if not description:
+        return ""
+    text = re.sub(r'<[^>]+>', ' ', description)
+    text = html.unescape(text)
+    return re.sub(r'\s+', ' ', text).strip()
+
+# Location of jobs without location restrictions
+WORLDWIDE = "Worldwide"
+
+def location_names(job: Dict[str, Any]) -> List[str]:
+    """The distinct names of a job's upstream location restrictions, or [WORLDWIDE]"""
+    restrictions = job.get('locationRestrictions') or []
+    if isinstance(restrictions, str):
+        restrictions = [restrictions]
+
+    locations = []
+    for restriction in restrictions:
+        name = restriction.get('name') if isinstance(restriction, dict) else restriction
+        if name and str(name).strip() and str(name).strip() not in locations:
+            locations.append(str(name).strip())
+    return locations or [WORLDWIDE]
+
+def normalize_location(job: Dict[str, Any]) -> str:
+    """Turn the upstream location restrictions into a single display string"""
+    return ", ".join(location_names(job))
+
+def _format_amount(amount: Any) -> str:
+    """Format a salary amount with thousands separators when it is numeric"""
+    return f"{amount:,}" if isinstance(amount, (int, float)) else str(amount)
+
+def normalize_salary(job: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+    """Collect the upstream salary fields into one structure"""
+    min_salary = job.get('minSalary')
+    max_salary = job.get('maxSalary')
+    if not min_salary and not max_salary:
+        return None
+
+    currency = job.get('currency') or 'USD'
+    if min_salary and max_salary and min_salary != max_salary:
+        display = f"{currency} {_format_amount(min_salary)} - {_format_amount(max_salary)}"
+    else:
+        display = f"{currency} {_format_amount(min_salary or max_salary)}"
+
+    return {
+        "min": min_salary,
+        "max": max_salary,
+        "currency": currency,
+        "display": display
+    }
+
+def is_enriched(job: Dict[str, Any]) -> bool:
+    """Check whether a job already went through the enrichment stage"""
+    return job.get('required_skills') is not None
+
+def enrich_job(job: Dict[str, Any], text_skills: Optional[List[str]] = None) -> Dict[str, Any]:
+    """
+    Attach skills, normalized location and salary, and a cleaned description to a job.
+    Jobs that are already enriched are returned unchanged.
+    """
+    if is_enriched(job):
+        return job
+
+    metrics.increment("jobs.enriched")
+    try:
+        job['clean_description'] = clean_description(job.get('description'))
+        job['location'] = normalize_location(job)
+        job['salary'] = normalize_salary(job)
+        job['required_skills'] = extract_skills_from_job(job, text_skills)
+    except Exception as e:
+        logger.warning(f"Failed to enrich job {job.get('id')}: {e}")
+        job.setdefault('required_skills', [])
+
+    return job
+
+def enrich_jobs(jobs: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """Enrich every job that has not been enriched yet, in parallel"""
+    pending = [job for job in jobs if not is_enriched(job)]
+    if len(pending) == 1:
+        enrich_job(pending[0])
+    elif pending:
+        # Match the posting texts as one batch; the threads only do the scrape fallbacks
+        text_skills = extract_skills_batch([job_skill_text(job) for job in pending])
+        # Run each job in a copy of the caller's context so per-request metrics are kept
+        futures = [
+            _enrichment_pool.submit(contextvars.copy_context().run, enrich_job, job, skills)
+            for job, skills in zip(pending, text_skills)
+        ]
+        for future in futures:
+            future.result()
+    return jobs
+
+def enrich_jobs_as_completed(jobs: List[Dict[str, Any]]) -> Iterator[Dict[str, Any]]:
+    """Yield each job as soon as it is enriched, already-enriched jobs first"""
+    pending = []
+    for job in jobs:
+        if is_enriched(job):
+            yield job
+        else:
+            pending.append(job)
+
+    futures = [
+        _enrichment_pool.submit(contextvars.copy_context().run, enrich_job, job)
+        for job in pending
+    ]
+    for future in as_completed(futures):
+        yield future.result()
@@ -0,0 +1,58 @@
+import hashlib
+import re
+from typing import Dict, Any, List, Tuple
+from app.services.job_enrichment import clean_description, normalize_location
+
+SIMHASH_BITS = 64
+# Descriptions whose simhashes differ in at most this many bits are near-duplicates
+SIMHASH_MAX_DISTANCE = 3
+# Split the simhash into more bands than the allowed distance, so any near-duplicate
+# shares at least one band exactly and can be found with dictionary lookups
+SIMHASH_BANDS = SIMHASH_MAX_DISTANCE + 1
+_BAND_BITS = SIMHASH_BITS // SIMHASH_BANDS
+_BAND_MASK = (1 << _BAND_BITS) - 1
+# Reposts differ in details, not in their opening; hashing the start keeps this cheap
+SIMHASH_MAX_WORDS = 400
+
+def _normalize(value: Any) -> str:
+    """Lowercase and strip punctuation so cosmetic differences don't matter"""
+    text = re.sub(r'[^a-z0-9]+', ' ', str(value or '').lower())
+    return text.strip()
+
+def normalized_company(job: Dict[str, Any]) -> str:
+    return _normalize(job.get('companyName') or job.get('company'))
+
+def exact_fingerprint(job: Dict[str, Any]) -> str:
+    """Hash of the normalized company, title and location of a posting"""
+    key = "|".join([
+        normalized_company(job),
+        _normalize(job.get('title')),
+        _normalize(normalize_location(job))
+    ])
+    return hashlib.sha1(key.encode('utf-8')).hexdigest()
+
+def description_simhash(job: Dict[str, Any]) -> int:
+    """64-bit simhash over word trigrams of the cleaned description (0 if there is none)"""
+    words = _normalize(clean_description(job.get('description'))).split()[:SIMHASH_MAX_WORDS]
+    if len(words) < 3:
+        return 0
+
+    weights = [0] * SIMHASH_BITS
+    for i in range(len(words) - 2):
+        shingle = " ".join(words[i:i + 3])
+        value = int.from_bytes(hashlib.blake2b(shingle.encode('utf-8'), digest_size=8).digest(), 'big')
+        for bit in range(SIMHASH_BITS):
+            weights[bit] += 1 if value >> bit & 1 else -1
+
+    simhash = 0
+    for bit, weight in enumerate(weights):
+        if weight > 0:
+            simhash |= 1 << bit
+    return simhash
+
+def simhash_bands(simhash: int) -> List[Tuple[int, int]]:
+    """Split a simhash into (band index, band value) keys"""
+    return [(band, (simhash >> (band * _BAND_BITS)) & _BAND_MASK) for band in range(SIMHASH_BANDS)]
+
+def hamming_distance(a: int, b: int) -> int:
+    return (a ^ b).bit_count()
@@ -0,0 +1,172 @@
+import heapq
+import math
+import re
+import threading
+from array import array
+from collections import Counter
+from typing import Any, Dict, List, Optional, Tuple
+from app.services.job_enrichment import clean_description
+from app.services.skill_service import extract_skills_from_text
+from app.services.job_store import job_store
+
+_TOKEN = re.compile(r"[a-z0-9][a-z0-9+#]*")
+
+# Words too common in any text to say anything about a job
+STOP_WORDS = frozenset("""
+a about above after all also an and any are as at be been being both but by can could did do does
+for from had has have having he her here him his how i if in into is it its just may me more most
+my no not of on or other our out over own same she should so some such than that the their them
+then there these they this those through to too under up very was we were what when where which
+while who whom why will with would you your
+""".split())
+
+# Terms found in more than this share of jobs carry little information about
+# fit, and their long posting lists would dominate scoring time
+RANKING_MAX_DF = 0.5
+# Only this many of a resume's highest weighted terms are used for scoring
+RANKING_MAX_QUERY_TERMS = 200
+# Compact the index once this share of its postings belong to removed jobs
+RANKING_MAX_DEAD_POSTINGS = 0.25
+
+def tokenize(text: str) -> List[str]:
+    """Lowercase word tokens of a text, without stop words and single characters"""
+    return [token for token in _TOKEN.findall(text.lower()) if len(token) > 1 and token not in STOP_WORDS]
+
+def job_text(job: Dict[str, Any]) -> str:
+    """The text a job is ranked by: title, description and categories"""
+    description = job.get('clean_description')
+    if description is None:
+        description = clean_description(job.get('description'))
+    parts = [job.get('title'), description] + list(job.get('categories') or [])
+    return "\n".join(str(part) for part in parts if part)
+
+def _document_vector(text: str) -> Dict[str, float]:
+    """Log-scaled term frequencies normalized to unit length"""
+    weights = {term: 1 + math.log(count) for term, count in Counter(tokenize(text)).items()}
+    norm = math.sqrt(sum(weight * weight for weight in weights.values()))
+    return {term: weight / norm for term, weight in weights.items()} if norm else {}
+
+class JobRelevanceIndex:
+    """
+    TF-IDF index of the jobs in the job store, for ranking jobs against a resume.
+
+    The job-term matrix is kept as an inverted index: for each term, parallel
+    arrays of job slots and weights. Jobs are weighted by log term frequency
+    without idf, so adding a job never changes the weights of the others; idf
+    is applied to the resume instead (the lnc.ltc scheme). Ranking multiplies
+    the matrix with the resume vector, visiting only the postings of its terms.
+
+    Removing a job only frees its slot; its postings are skipped until enough
+    of them pile up and the index is compacted, which also renumbers the slots.
+    """
+
+    def __init__(self):
+        self._postings: Dict[str, Tuple[array, array]] = {}
+        self._slots: Dict[str, int] = {}
+        self._jobs: Dict[int, Tuple[Dict[str, Any], int]] = {}
+        self._next_slot = 0
+        self._postings_count = 0
+        self._dead_postings = 0
+        self._lock = threading.Lock()
+
+    def job_added(self, job: Dict[str, Any]) -> None:
+        vector = _document_vector(job_text(job))
+        with self._lock:
+            self._remove(job['id'])
+            slot = self._next_slot
+            self._next_slot += 1
+            self._slots[job['id']] = slot
+            self._jobs[slot] = (job, len(vector))
+            for term, weight in vector.items():
+                postings = self._postings.get(term)
+                if postings is None:
+                    postings = self._postings[term] = (array('i'), array('f'))
+                postings[0].append(slot)
+                postings[1].append(weight)
+            self._postings_count += len(vector)
+
+    def job_removed(self, job: Dict[str, Any]) -> None:
+        with self._lock:
+            self._remove(job['id'])
+
+    def _remove(self, job_id: str) -> None:
+        slot = self._slots.pop(job_id, None)
+        if slot is None:
+            return
+        _, term_count = self._jobs.pop(slot)
+        self._dead_postings += term_count
+        if self._dead_postings > RANKING_MAX_DEAD_POSTINGS * self._postings_count:
+            self._compact()
+
+    def _compact(self) -> None:
+        """Drop the postings of removed jobs and renumber the remaining slots"""
+        renumbered = {slot: new_slot for new_slot, slot in enumerate(sorted(self._jobs))}
+        for term in list(self._postings):
+            slots, weights = self._postings[term]
+            kept = [(renumbered[slot], weight) for slot, weight in zip(slots, weights) if slot in renumbered]
+            if kept:
+                self._postings[term] = (array('i', [slot for slot, _ in kept]), array('f', [weight for _, weight in kept]))
+            else:
+                del self._postings[term]
+        self._jobs = {renumbered[slot]: entry for slot, entry in self._jobs.items()}
+        self._slots = {job_id: renumbered[slot] for job_id, slot in self._slots.items()}
+        self._next_slot = len(renumbered)
+        self._postings_count -= self._dead_postings
+        self._dead_postings = 0
+
+    def rank(self, text: str, limit: int = 10) -> List[Tuple[Dict[str, Any], float]]:
+        """
+        The jobs most relevant to a text (e.g. a resume), as (job, score) pairs,
+        best first. Scores are cosine similarities between 0 and 1.
+        """
+        counts = Counter(tokenize(text))
+        with self._lock:
+            total_jobs = len(self._jobs)
+            max_df = max(1.0, RANKING_MAX_DF * total_jobs)
+
+            # Document frequencies include not yet compacted postings of removed jobs
+            query = {}
+            for term, count in counts.items():
+                postings = self._postings.get(term)
+                if postings and len(postings[0]) <= max_df:
+                    query[term] = (1 + math.log(count)) * math.log(max(total_jobs, 1) / len(postings[0]))
+            norm = math.sqrt(sum(weight * weight for weight in query.values()))
+            if not norm:
+                return []
+
+            scores = [0.0] * self._next_slot
+            for term, weight in heapq.nlargest(RANKING_MAX_QUERY_TERMS, query.items(), key=lambda item: item[1]):
+                weight /= norm
+                slots, weights = self._postings[term]
+                for slot, job_weight in zip(slots, weights):
+                    scores[slot] += weight * job_weight
+
+            jobs = self._jobs
+            best = heapq.nlargest(limit, ((score, slot) for slot, score in enumerate(scores)
+                                          if score > 0 and slot in jobs))
+            return [(jobs[slot][0], round(min(score, 1.0), 4)) for score, slot in best]
+
+    def total_jobs(self) -> int:
+        return len(self._jobs)
+
+# Global relevance index, kept in sync with the job store
+job_relevance = JobRelevanceIndex()
+job_store.subscribe(job_relevance)
+
+def match_resume(text: str, limit: int = 10, resume_skills: Optional[List[str]] = None) -> Dict[str, Any]:
+    """
+    The stored jobs that best match a resume, each with the skills it requires
+    that the resume mentions and those it is missing. resume_skills are
+    extracted from text unless they are already known.
+    """
+    resume_skills = set(extract_skills_from_text(text) if resume_skills is None else resume_skills)
+    matches = []
+    for job, score in job_relevance.rank(text, limit):
+        required_skills = job.get('required_skills') or []
+        matches.append({
+            "job": job,
+            "score": score,
+            "matching_skills": sorted(skill for skill in required_skills if skill in resume_skills),
+            "missing_skills": sorted(skill for skill in required_skills if skill not in resume_skills)
+        })
+    return {"resume_skills": sorted(resume_skills), "total_jobs": job_relevance.total_jobs(), "matches": matches}
@@ -1,19 +1,19 @@
-import requests
 import logging
+from app.services.job_store import job_store
+from app.services.job_sources import job_aggregator
 
 logger = logging.getLogger(__name__)
 
-def fetch_jobs(limit: int, offset: int):
+def fetch_jobs(limit: int, offset: int, enrich: bool = True):
     """
-    Calls the external Himalayas jobs API to fetch job listings with error handling and timeout.
+    Fetches job listings from every registered job source (Himalayas first) in parallel.
+    Fetched jobs are given stable ids and indexed in the job store; pass enrich=False
+    to get them back before enrichment.
     """
-    url = f"https://himalayas.app/jobs/api/?limit={limit}&offset={offset}"
     try:
-        response = requests.get(url, timeout=10)
-        response.raise_for_status()
-        data = response.json()
-        return data.get("jobs", [])
-    except requests.exceptions.RequestException as e:
-        # Raise a RuntimeError with details for the caller to catch and log
-        logger.error(f"Himalayas job API request failed: {e}")
-        raise RuntimeError(f"Himalayas job API request failed: {e}")
+        jobs = job_aggregator.fetch(limit, offset)
+    except RuntimeError as e:
+        # Every source failed; the RuntimeError carries the details for the caller to log
+        logger.error(f"Job API request failed: {e}")
+        raise
+    return job_store.add_jobs(jobs, enrich=enrich)
@@ -0,0 +1,150 @@
+import logging
+import time
+import contextvars
+from abc import ABC, abstractmethod
+from concurrent.futures import ThreadPoolExecutor, wait
+from typing import List, Dict, Any, Optional
+from app.services.resilience import CircuitBreaker, SingleFlight
+from app.services import metrics, upstream
+
+logger = logging.getLogger(__name__)
+
+# Every source is queried concurrently; sources that miss the deadline are left out
+AGGREGATOR_DEADLINE = 8.0
+AGGREGATOR_WORKERS = 8
+
+# Fields of the common job schema (the Himalayas field names, which the frontend uses)
+JOB_FIELDS = (
+    'guid', 'title', 'companyName', 'companyLogo', 'excerpt', 'description',
+    'applicationLink', 'pubDate', 'expiryDate', 'employmentType', 'seniority',
+    'locationRestrictions', 'timezoneRestrictions', 'categories',
+    'minSalary', 'maxSalary', 'currency'
+)
+
+class JobSource(ABC):
+    """
+    Base class for a remote job feed.
+    Adapters implement fetch_raw() and, if their payload differs from the common
+    schema, normalize(). The guid of a normalized job must be unique across sources.
+    """
+
+    name = "source"
+
+    @abstractmethod
+    def fetch_raw(self, limit: int, offset: int) -> List[Dict[str, Any]]:
+        """One page of jobs in the source's own format"""
+
+    def normalize(self, raw_job: Dict[str, Any]) -> Dict[str, Any]:
+        return {field: raw_job.get(field) for field in JOB_FIELDS}
+
+    def fetch(self, limit: int, offset: int) -> List[Dict[str, Any]]:
+        """Fetch one page of jobs in the common schema, tagged with this source"""
+        jobs = []
+        for raw_job in self.fetch_raw(limit, offset):
+            job = self.normalize(raw_job)
+            job['source'] = self.name
+            jobs.append(job)
+        return jobs
+
+class HimalayasSource(JobSource):
+    """Adapter for the Himalayas remote jobs API"""
+
+    name = "himalayas"
+
+    def __init__(self):
+        # Identical concurrent page requests share one upstream call, and a struggling
+        # upstream is failed fast instead of tying up every worker for the full timeout
+        self.breaker = CircuitBreaker("himalayas", failure_threshold=5, reset_timeout=30, latency_budget=5)
+        self.flight = SingleFlight("himalayas")
+
+    def _request_jobs(self, url: str) -> dict:
+        """Perform the Himalayas API request"""
+        response = upstream.get(url, timeout=10)
+        response.raise_for_status()
+        return response.json()
+
+    def fetch_raw(self, limit: int, offset: int) -> List[Dict[str, Any]]:
+        url = f"https://himalayas.app/jobs/api/?limit={limit}&offset={offset}"
+        data = self.flight.do(url, lambda: self.breaker.call(self._request_jobs, url))
+        return data.get("jobs", [])
+
+    def normalize(self, raw_job: Dict[str, Any]) -> Dict[str, Any]:
+        # Already in the common schema; keep any extra upstream fields too
+        return dict(raw_job)
+
+class JobAggregator:
+    """Fan a page request out to every registered source and merge the results"""
+
+    def __init__(self, sources: List[JobSource], deadline: float = AGGREGATOR_DEADLINE,
+                 max_workers: int = AGGREGATOR_WORKERS):
+        self.sources = list(sources)
+        self.deadline = deadline
+        self._pool = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="job-source")
+
+    def register_source(self, source: JobSource) -> None:
+        self.sources.append(source)
+
+    def _timed_fetch(self, source: JobSource, limit: int, offset: int) -> List[Dict[str, Any]]:
+        started = time.monotonic()
+        try:
+            return source.fetch(limit, offset)
+        finally:
+            # A running sum and count, so the mean latency over any interval can be derived
+            metrics.increment(f"jobsource.{source.name}.latency_ms_sum", (time.monotonic() - started) * 1000)
+            metrics.increment(f"jobsource.{source.name}.latency_count")
+
+    def fetch(self, limit: int, offset: int, deadline: Optional[float] = None) -> List[Dict[str, Any]]:
+        """
+        Query all sources concurrently and return up to `limit` jobs, interleaved
+        so every source is represented near the top. limit and offset apply to
+        the interleaved list: with n sources, each source is asked for a full
+        page starting at offset // n, so the page is filled even when some
+        sources fail or run out. Consecutive pages line up exactly while every
+        source has jobs left.
+        Sources that fail or miss the shared deadline are skipped; a RuntimeError
+        is raised only if no source produced a result.
+        """
+        deadline = self.deadline if deadline is None else deadline
+        # Position offset of the interleaved list is the (offset % n)-th job at
+        # position offset // n of the sources
+        skip = offset % len(self.sources)
+        source_offset = offset // len(self.sources)
+        source_limit = skip + limit
+        futures = {
+            self._pool.submit(contextvars.copy_context().run, self._timed_fetch, source,
+                              source_limit, source_offset): source
+            for source in self.sources
+        }
+        done, not_done = wait(futures, timeout=deadline)
+
+        results = []
+        errors = []
+        for future, source in futures.items():
+            metrics.increment(f"jobsource.{source.name}.requests")
+            if future in not_done:
+                metrics.increment(f"jobsource.{source.name}.timeouts")
+                errors.append(f"{source.name}: no response within {deadline}s")
+                logger.warning(f"Job source {source.name} missed the {deadline}s deadline")
+                continue
+            try:
+                jobs = future.result()
+            except Exception as e:
+                metrics.increment(f"jobsource.{source.name}.errors")
+                errors.append(f"{source.name}: {e}")
+                logger.warning(f"Job source {source.name} failed: {e}")
+                continue
+            metrics.increment(f"jobsource.{source.name}.jobs", len(jobs))
+            results.append(jobs)
+
+        if not results:
+            raise RuntimeError("All job sources failed: " + "; ".join(errors))
+
+        merged = []
+        for position in range(max(len(jobs) for jobs in results)):
+            for jobs in results:
+                if position < len(jobs):
+                    merged.append(jobs[position])
+        return merged[skip:skip + limit]
+
+# Global aggregator instance
+job_aggregator = JobAggregator([HimalayasSource()])
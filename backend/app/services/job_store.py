@@ -0,0 +1,220 @@
+import hashlib
+import threading
+import time
+from collections import OrderedDict
+from typing import List, Dict, Any, Iterator, Optional, Set, Tuple
+from app.services.job_enrichment import enrich_jobs, enrich_jobs_as_completed, is_enriched
+from app.services.job_fingerprint import (
+    exact_fingerprint, description_simhash, simhash_bands, hamming_distance,
+    normalized_company, SIMHASH_MAX_DISTANCE
+)
+from app.services import metrics
+
+# How long a fetched job stays addressable by id
+JOB_TTL = 6 * 60 * 60
+MAX_STORED_JOBS = 5000
+
+def make_job_id(job: Dict[str, Any]) -> str:
+    """
+    Build a deterministic id for a job posting.
+    Uses the upstream guid when present, otherwise a hash of the identifying fields.
+    """
+    if job.get('guid'):
+        key = str(job['guid'])
+    else:
+        key = "|".join(str(job.get(field) or '') for field in
+                       ('title', 'companyName', 'applicationLink', 'pubDate'))
+    return hashlib.sha1(key.encode('utf-8')).hexdigest()[:16]
+
+def _same_posting(stored: Dict[str, Any], job: Dict[str, Any]) -> bool:
+    """Check whether an upstream job matches the stored copy field for field"""
+    return all(stored.get(key) == value for key, value in job.items())
+
+class JobStore:
+    """In-memory store of fetched jobs indexed by their stable id"""
+
+    def __init__(self, ttl: int = JOB_TTL, max_jobs: int = MAX_STORED_JOBS):
+        self.ttl = ttl
+        self.max_jobs = max_jobs
+        self._jobs: "OrderedDict[str, Dict[str, Any]]" = OrderedDict()
+        self._stored_at: Dict[str, float] = {}
+        self._lock = threading.Lock()
+
+        # Duplicate detection indexes: exact fingerprint -> job id, simhash band -> job ids,
+        # and ids of collapsed duplicates -> the id of the job kept in their place
+        self._fingerprints: Dict[str, str] = {}
+        self._simhashes: Dict[str, Tuple[int, str]] = {}
+        self._bands: Dict[Tuple[int, int], Set[str]] = {}
+        self._aliases: Dict[str, str] = {}
+        self._aliases_by_job: Dict[str, Set[str]] = {}
+
+        # Indexes derived from enriched jobs subscribe to be told when jobs come and go
+        self._listeners: List[Any] = []
+        self._announced: Set[str] = set()
+
+    def add_jobs(self, jobs: List[Dict[str, Any]], enrich: bool = True) -> List[Dict[str, Any]]:
+        """
+        Assign ids to upstream jobs, index them and return the stored copies.
+        New or changed jobs are enriched once, on their way into the store,
+        unless the caller asks to enrich them itself (e.g. to stream them).
+        """
+        now = time.time()
+        stored = []
+        seen = set()
+        with self._lock:
+            for job in jobs:
+                job_id = make_job_id(job)
+                existing = self._jobs.get(job_id)
+                if job_id in self._aliases:
+                    # Known repost: no need to fingerprint or enrich it again
+                    metrics.increment("jobs.duplicates_collapsed")
+                    job_id = self._aliases[job_id]
+                    record = self._jobs[job_id]
+                elif existing is not None and _same_posting(existing, job):
+                    # Unchanged posting: keep the enriched copy we already have
+                    record = existing
+                else:
+                    if existing is not None:
+                        self._remove(job_id)
+                    duplicate_of = self._find_duplicate(job)
+                    if duplicate_of is not None:
+                        # Repost of a job we already hold: serve that one instead
+                        self._aliases[job_id] = duplicate_of
+                        self._aliases_by_job.setdefault(duplicate_of, set()).add(job_id)
+                        metrics.increment("jobs.duplicates_collapsed")
+                        job_id = duplicate_of
+                        record = self._jobs[job_id]
+                    else:
+                        record = {**job, "id": job_id}
+                        self._index(job_id, record)
+                self._jobs[job_id] = record
+                self._jobs.move_to_end(job_id)
+                self._stored_at[job_id] = now
+                if job_id not in seen:
+                    seen.add(job_id)
+                    stored.append(record)
+
+            self._evict(now)
+            metrics.set_gauge("jobs.stored", len(self._jobs))
+            metrics.set_gauge("jobs.aliases", len(self._aliases))
+
+        # Enrichment may scrape, so it runs outside the lock
+        if enrich:
+            self.enrich(stored)
+        return stored
+
+    def subscribe(self, listener: Any) -> None:
+        """
+        Register a listener with job_added(job) and job_removed(job) methods.
+        It is called for every enriched job in the store, including current ones.
+        """
+        with self._lock:
+            self._listeners.append(listener)
+            for job_id in self._announced:
+                listener.job_added(self._jobs[job_id])
+
+    def enrich(self, jobs: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """Enrich stored jobs that are not enriched yet and announce them to listeners"""
+        enrich_jobs(jobs)
+        self._announce(jobs)
+        return jobs
+
+    def enrich_as_completed(self, jobs: List[Dict[str, Any]]) -> Iterator[Dict[str, Any]]:
+        """Like enrich(), but yield each job as soon as it is ready"""
+        for job in enrich_jobs_as_completed(jobs):
+            self._announce([job])
+            yield job
+
+    def _announce(self, jobs: List[Dict[str, Any]]) -> None:
+        """Tell listeners about newly enriched jobs that are still stored"""
+        with self._lock:
+            for job in jobs:
+                job_id = job.get("id")
+                if (job_id in self._announced or not is_enriched(job)
+                        or self._jobs.get(job_id) is not job):
+                    continue
+                self._announced.add(job_id)
+                for listener in self._listeners:
+                    listener.job_added(job)
+
+    def get(self, job_id: str) -> Optional[Dict[str, Any]]:
+        """Look up a stored job by id (ids of collapsed duplicates resolve to the kept job)"""
+        with self._lock:
+            job_id = self._aliases.get(job_id, job_id)
+            job = self._jobs.get(job_id)
+            if job is None:
+                return None
+            if time.time() - self._stored_at[job_id] > self.ttl:
+                self._remove(job_id)
+                return None
+            return job
+
+    def _find_duplicate(self, job: Dict[str, Any]) -> Optional[str]:
+        """
+        Return the id of a stored job this one duplicates: same company, title and
+        location, or same company with a near-identical description.
+        """
+        duplicate_of = self._fingerprints.get(exact_fingerprint(job))
+        if duplicate_of is not None:
+            return duplicate_of
+
+        simhash = description_simhash(job)
+        if not simhash:
+            return None
+        company = normalized_company(job)
+        for band in simhash_bands(simhash):
+            for candidate_id in self._bands.get(band, ()):
+                candidate_hash, candidate_company = self._simhashes[candidate_id]
+                if (candidate_company == company and
+                        hamming_distance(simhash, candidate_hash) <= SIMHASH_MAX_DISTANCE):
+                    return candidate_id
+        return None
+
+    def _index(self, job_id: str, job: Dict[str, Any]) -> None:
+        """Register a newly stored job in the duplicate detection indexes"""
+        self._fingerprints[exact_fingerprint(job)] = job_id
+        simhash = description_simhash(job)
+        if simhash:
+            self._simhashes[job_id] = (simhash, normalized_company(job))
+            for band in simhash_bands(simhash):
+                self._bands.setdefault(band, set()).add(job_id)
+
+    def _remove(self, job_id: str) -> None:
+        """Drop a job together with its index entries and aliases"""
+        job = self._jobs.pop(job_id)
+        del self._stored_at[job_id]
+
+        if job_id in self._announced:
+            self._announced.discard(job_id)
+            for listener in self._listeners:
+                listener.job_removed(job)
+
+        fingerprint = exact_fingerprint(job)
+        if self._fingerprints.get(fingerprint) == job_id:
+            del self._fingerprints[fingerprint]
+
+        if job_id in self._simhashes:
+            simhash, _ = self._simhashes.pop(job_id)
+            for band in simhash_bands(simhash):
+                band_ids = self._bands.get(band)
+                if band_ids is not None:
+                    band_ids.discard(job_id)
+                    if not band_ids:
+                        del self._bands[band]
+
+        for alias in self._aliases_by_job.pop(job_id, ()):
+            self._aliases.pop(alias, None)
+
+    def _evict(self, now: float) -> None:
+        """Drop expired jobs and trim the store to its maximum size"""
+        while self._jobs:
+            oldest_id = next(iter(self._jobs))
+            if len(self._jobs) <= self.max_jobs and now - self._stored_at[oldest_id] <= self.ttl:
+                break
+            self._remove(oldest_id)
+
+    def __len__(self) -> int:
+        return len(self._jobs)
+
+# Global job store instance
+job_store = JobStore()
@@ -0,0 +1,38 @@
+import threading
+from collections import defaultdict
+from contextvars import ContextVar
+from typing import Dict, Optional
+
+_lock = threading.Lock()
+_counters: Dict[str, float] = defaultdict(float)
+_gauges: Dict[str, float] = {}
+
+# Counters for the request currently being handled, if it is being tracked
+_request_counters: ContextVar[Optional[Dict[str, float]]] = ContextVar("request_counters", default=None)
+
+def increment(name: str, value: float = 1) -> None:
+    """Increment a process-wide counter (and the current request's, if tracked)"""
+    with _lock:
+        _counters[name] += value
+    request_counters = _request_counters.get()
+    if request_counters is not None:
+        request_counters[name] = request_counters.get(name, 0) + value
+
+def set_gauge(name: str, value: float) -> None:
+    """Record the current value of a gauge"""
+    with _lock:
+        _gauges[name] = value
+
+def track_request() -> Dict[str, float]:
+    """
+    Start collecting the counters incremented while handling the current request.
+    Each request runs in its own context, so the returned dict only sees its own work.
+    """
+    counters: Dict[str, float] = {}
+    _request_counters.set(counters)
+    return counters
+
+def snapshot() -> Dict[str, Dict[str, float]]:
+    """Return a copy of all counters and gauges"""
+    with _lock:
+        return {"counters": dict(_counters), "gauges": dict(_gauges)}
@@ -0,0 +1,191 @@
+import asyncio
+import threading
+import time
+import logging
+from typing import Any, Awaitable, Callable, Dict, Hashable
+import requests
+from app.services import metrics
+
+logger = logging.getLogger(__name__)
+
+class CircuitOpenError(RuntimeError):
+    """Raised when a call is rejected because its circuit breaker is open"""
+
+class _Call:
+    """An in-flight call whose outcome is shared by every waiter"""
+
+    def __init__(self):
+        self.done = threading.Event()
+        self.result: Any = None
+        self.error: BaseException = None
+
+class SingleFlight:
+    """
+    Coalesce identical concurrent calls: while a call for a key is in flight,
+    other callers with the same key wait for it and share its result.
+    """
+
+    def __init__(self, name: str):
+        self.name = name
+        self._calls: Dict[Hashable, _Call] = {}
+        self._lock = threading.Lock()
+
+    def do(self, key: Hashable, fn: Callable[[], Any]) -> Any:
+        """Run fn for key, or wait for the identical call already running"""
+        with self._lock:
+            call = self._calls.get(key)
+            leader = call is None
+            if leader:
+                call = _Call()
+                self._calls[key] = call
+
+        if not leader:
+            metrics.increment(f"singleflight.{self.name}.coalesced")
+            call.done.wait()
+        else:
+            try:
+                call.result = fn()
+            except BaseException as e:
+                call.error = e
+            finally:
+                with self._lock:
+                    del self._calls[key]
+                call.done.set()
+
+        if call.error is not None:
+            raise call.error
+        return call.result
+
+class AsyncSingleFlight:
+    """
+    SingleFlight for coroutines on one event loop. The shared call runs as its
+    own task, so it finishes for the remaining waiters even if the caller that
+    started it goes away.
+    """
+
+    def __init__(self, name: str):
+        self.name = name
+        self._calls: Dict[Hashable, asyncio.Task] = {}
+
+    async def do(self, key: Hashable, fn: Callable[[], Awaitable[Any]]) -> Any:
+        """
+        Await fn() for key, or the identical call already running. fn is
+        called right away, and only by the first caller; the awaitable it
+        returns runs as the shared task.
+        """
+        call = self._calls.get(key)
+        if call is not None:
+            metrics.increment(f"singleflight.{self.name}.coalesced")
+        else:
+            call = asyncio.ensure_future(fn())
+            self._calls[key] = call
+            call.add_done_callback(lambda _: self._calls.pop(key, None))
+        return await asyncio.shield(call)
+
+def is_upstream_failure(error: Exception) -> bool:
+    """
+    Whether an error says the upstream itself is in trouble: a 5xx response,
+    a timeout or a connection error. Other errors, such as a 4xx response to
+    an invalid request, are the caller's problem and the upstream is healthy.
+    """
+    if isinstance(error, requests.exceptions.HTTPError):
+        return error.response is None or error.response.status_code >= 500
+    return isinstance(error, (requests.exceptions.Timeout, requests.exceptions.ConnectionError))
+
+class CircuitBreaker:
+    """
+    Per-upstream circuit breaker.
+    Opens after consecutive failures (slow calls count as failures), fails fast
+    while open, and lets a single probe call through once the reset timeout passes.
+    Only errors for which is_failure returns True count as failures; any other
+    error means the upstream answered, and counts as a success.
+    """
+
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half_open"
+
+    _STATE_VALUES = {CLOSED: 0, HALF_OPEN: 1, OPEN: 2}
+
+    def __init__(self, name: str, failure_threshold: int = 5, reset_timeout: float = 30.0,
+                 latency_budget: float = 5.0, is_failure: Callable[[Exception], bool] = is_upstream_failure):
+        self.name = name
+        self.is_failure = is_failure
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.latency_budget = latency_budget
+        self.state = self.CLOSED
+        self.consecutive_failures = 0
+        self.opened_at = 0.0
+        self._probe_in_flight = False
+        self._lock = threading.Lock()
+        self._publish_state()
+
+    def call(self, fn: Callable[..., Any], *args, **kwargs) -> Any:
+        """Call fn through the breaker"""
+        self._before_call()
+
+        started = time.monotonic()
+        try:
+            result = fn(*args, **kwargs)
+        except Exception as e:
+            if self.is_failure(e):
+                self._record_failure()
+            else:
+                self._record_success()
+            raise
+
+        elapsed = time.monotonic() - started
+        if elapsed > self.latency_budget:
+            logger.warning(f"{self.name} call took {elapsed:.2f}s (budget {self.latency_budget:.2f}s)")
+            self._record_failure()
+        else:
+            self._record_success()
+        return result
+
+    def _before_call(self) -> None:
+        """Reject the call if the circuit is open, or admit it as the half-open probe"""
+        with self._lock:
+            if self.state == self.OPEN:
+                if time.monotonic() - self.opened_at < self.reset_timeout:
+                    metrics.increment(f"circuit.{self.name}.rejected")
+                    raise CircuitOpenError(f"{self.name} is unavailable (circuit open)")
+                self._set_state(self.HALF_OPEN)
+
+            if self.state == self.HALF_OPEN:
+                if self._probe_in_flight:
+                    metrics.increment(f"circuit.{self.name}.rejected")
+                    raise CircuitOpenError(f"{self.name} is unavailable (circuit half-open)")
+                self._probe_in_flight = True
+
+    def _record_success(self) -> None:
+        with self._lock:
+            self.consecutive_failures = 0
+            self._probe_in_flight = False
+            if self.state != self.CLOSED:
+                self._set_state(self.CLOSED)
+            self._publish_state()
+        metrics.increment(f"circuit.{self.name}.successes")
+
+    def _record_failure(self) -> None:
+        with self._lock:
+            self.consecutive_failures += 1
+            was_probe = self._probe_in_flight
+            self._probe_in_flight = False
+            if was_probe or self.consecutive_failures >= self.failure_threshold:
+                if self.state != self.OPEN:
+                    metrics.increment(f"circuit.{self.name}.opened")
+                self.opened_at = time.monotonic()
+                self._set_state(self.OPEN)
+            self._publish_state()
+        metrics.increment(f"circuit.{self.name}.failures")
+
+    def _set_state(self, state: str) -> None:
+        if state != self.state:
+            logger.info(f"Circuit {self.name}: {self.state} -> {state}")
+        self.state = state
+        self._publish_state()
+
+    def _publish_state(self) -> None:
+        metrics.set_gauge(f"circuit.{self.name}.state", self._STATE_VALUES[self.state])
+        metrics.set_gauge(f"circuit.{self.name}.consecutive_failures", self.consecutive_failures)
@@ -0,0 +1,170 @@
+import re
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+from lxml import etree
+
+# Where job pages usually keep the description, best first. The first element
+# matching a selector is used; the page body is the fallback
+DESCRIPTION_SELECTORS: List[Tuple[str, str]] = [
+    ('class', 'job-description'),
+    ('class', 'description'),
+    ('class', 'job-content'),
+    ('class', 'content'),
+    ('data-testid', 'job-description'),
+    ('class', 'job-detail'),
+    ('class', 'posting-content'),
+]
+_BODY = len(DESCRIPTION_SELECTORS)
+
+# Elements whose content is never visible text
+SKIPPED_TAGS = {'script', 'style', 'noscript', 'template', 'svg'}
+
+_META_CHARSET = re.compile(rb'<meta[^>]+charset=["\']?([\w-]+)', re.IGNORECASE)
+
+# How much of the page to look through for a <meta> charset before parsing starts
+SNIFF_BYTES = 2048
+
+def sniff_encoding(head: bytes) -> Optional[str]:
+    """Encoding declared by a <meta> tag near the start of a page, if any"""
+    match = _META_CHARSET.search(head[:SNIFF_BYTES])
+    return match.group(1).decode('ascii') if match else None
+
+class _DescriptionCollector:
+    """
+    lxml parser target that collects the text of the description candidates
+    while the page is still being parsed: the first element matching each
+    selector, and the body. Each candidate stops growing at max_chars.
+    """
+
+    def __init__(self, max_chars: int):
+        self.max_chars = max_chars
+        self.pieces: Dict[int, List[str]] = {}
+        self.lengths: Dict[int, int] = {}
+        self.active: Set[int] = set()
+        self.complete: Set[int] = set()
+        self.closed: Set[int] = set()
+        self.has_text: Set[int] = set()
+        self._opened: List[List[int]] = []
+        self._skip_depth = 0
+
+    def _matches(self, tag: str, attrib) -> List[int]:
+        candidates = []
+        classes = None
+        for priority, (attribute, value) in enumerate(DESCRIPTION_SELECTORS):
+            if priority in self.pieces:
+                continue
+            if attribute == 'class':
+                if classes is None:
+                    classes = (attrib.get('class') or '').split()
+                if value in classes:
+                    candidates.append(priority)
+            elif attrib.get(attribute) == value:
+                candidates.append(priority)
+        if tag == 'body' and _BODY not in self.pieces:
+            candidates.append(_BODY)
+        return candidates
+
+    def start(self, tag, attrib) -> None:
+        if self._skip_depth or tag in SKIPPED_TAGS:
+            self._skip_depth += 1
+            self._opened.append([])
+            return
+        opened = self._matches(tag, attrib)
+        for priority in opened:
+            self.pieces[priority] = []
+            self.lengths[priority] = 0
+            self.active.add(priority)
+        self._opened.append(opened)
+
+    def end(self, tag) -> None:
+        if self._skip_depth:
+            self._skip_depth -= 1
+        if self._opened:
+            for priority in self._opened.pop():
+                self.active.discard(priority)
+                self.complete.add(priority)
+                self.closed.add(priority)
+
+    def data(self, text: str) -> None:
+        if self._skip_depth or not self.active:
+            return
+        text = re.sub(r'\s+', ' ', text)
+        if text != ' ':
+            self.has_text.update(self.active)
+        for priority in list(self.active):
+            self.pieces[priority].append(text)
+            self.lengths[priority] += len(text)
+            if self.lengths[priority] > self.max_chars:
+                # Enough text: the rest of this element can be ignored
+                self.active.discard(priority)
+                self.complete.add(priority)
+
+    def close(self) -> None:
+        pass
+
+    def has_best(self) -> bool:
+        """Whether the best possible candidate has all the text it needs"""
+        return 0 in self.complete and 0 in self.has_text
+
+    def best_closed(self) -> Optional[int]:
+        """
+        Highest priority candidate whose element has ended, if any.
+        A candidate that merely filled up may be a wrapper of the whole page.
+        """
+        return min((self.closed & self.has_text) - {_BODY}, default=None)
+
+    def text(self) -> str:
+        """Text of the best candidate found, falling back to the body"""
+        for priority in sorted(self.pieces):
+            text = re.sub(r'\s+', ' ', "".join(self.pieces[priority])).strip()
+            if text:
+                return text[:self.max_chars]
+        return ""
+
+def read_job_description(chunks: Iterable[bytes], encoding: Optional[str] = None,
+                         max_bytes: int = 1024 * 1024, max_chars: int = 2000,
+                         lookahead_bytes: int = 64 * 1024) -> Tuple[str, int]:
+    """
+    Extract the job description from an HTML page as it is downloaded.
+
+    Reading stops after max_bytes, as soon as the best selector's element has
+    enough text, or lookahead_bytes after any other selector's element has
+    ended (in case a better one follows). Returns the text and the number of bytes read.
+    Without an encoding, the page's <meta> declaration or else UTF-8 is used.
+    """
+    collector = _DescriptionCollector(max_chars)
+    parser = None
+    head = b''
+    bytes_read = 0
+    found_at = None
+
+    for chunk in chunks:
+        if not chunk:
+            continue
+        chunk = chunk[:max_bytes - bytes_read]
+        bytes_read += len(chunk)
+        if parser is None:
+            # Hold back the start of the page until the encoding can be sniffed
+            head += chunk
+            if len(head) < SNIFF_BYTES and bytes_read < max_bytes:
+                continue
+            parser = etree.HTMLParser(target=collector, encoding=encoding or sniff_encoding(head) or 'utf-8')
+            chunk, head = head, b''
+        parser.feed(chunk)
+
+        if collector.has_best() or bytes_read >= max_bytes:
+            break
+        if collector.best_closed() is not None:
+            found_at = bytes_read if found_at is None else found_at
+            if bytes_read - found_at >= lookahead_bytes:
+                break
+
+    if parser is None and head:
+        parser = etree.HTMLParser(target=collector, encoding=encoding or sniff_encoding(head) or 'utf-8')
+        parser.feed(head)
+    if parser is not None:
+        try:
+            parser.close()
+        except etree.XMLSyntaxError:
+            # Nothing parseable was received; the collector simply stays empty
+            pass
+    return collector.text(), bytes_read
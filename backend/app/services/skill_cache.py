@@ -0,0 +1,133 @@
+import hashlib
+import logging
+import os
+import threading
+from collections import OrderedDict
+from typing import Dict, List, Optional
+from app.database import SkillCacheManager
+from app.services import metrics
+
+logger = logging.getLogger(__name__)
+
+# In-memory skill extraction results, most recently used last
+SKILL_CACHE_MAX_ENTRIES = int(os.getenv("SKILL_CACHE_MAX_ENTRIES", "20000"))
+
+# Optional disk tier: entries evicted from memory spill to SQLite and are
+# promoted back on their next hit. Off unless SKILL_CACHE_DISK=1
+SKILL_CACHE_DISK = os.getenv("SKILL_CACHE_DISK", "0") == "1"
+SKILL_CACHE_DISK_MAX_ENTRIES = int(os.getenv("SKILL_CACHE_DISK_MAX_ENTRIES", "200000"))
+# Spilled entries are written in batches of this size
+SKILL_CACHE_SPILL_BATCH = 256
+
+def text_key(text: str) -> str:
+    """
+    Cache key of an input text. Extraction lowercases text before matching,
+    so texts differing only in case share a key.
+    """
+    return hashlib.blake2b(text.lower().encode('utf-8', 'surrogatepass'), digest_size=16).hexdigest()
+
+class SkillExtractionCache:
+    """
+    Bounded LRU cache of extracted skills keyed by input text hash.
+    Entries belong to one skill taxonomy; when the taxonomy changes, the cache
+    starts over so results never mix vocabularies.
+    """
+
+    def __init__(self, max_entries: int = SKILL_CACHE_MAX_ENTRIES,
+                 disk: Optional[SkillCacheManager] = None,
+                 disk_max_entries: int = SKILL_CACHE_DISK_MAX_ENTRIES):
+        self.max_entries = max_entries
+        self.disk = disk
+        self.disk_max_entries = disk_max_entries
+        self._entries: "OrderedDict[str, List[str]]" = OrderedDict()
+        # Entries evicted from memory and waiting to be written to disk in the next batch
+        self._spilled: Dict[str, List[str]] = {}
+        self._digest: Optional[str] = None
+        self._hits = 0
+        self._lookups = 0
+        self._lock = threading.Lock()
+
+    def _check_taxonomy(self, digest: str) -> None:
+        """Start over when the taxonomy changed since the entries were stored"""
+        if digest == self._digest:
+            return
+        if self._digest is not None:
+            metrics.increment("skills.cache_invalidations")
+        self._entries.clear()
+        self._spilled.clear()
+        self._digest = digest
+        if self.disk:
+            try:
+                self.disk.delete_other_taxonomies(digest)
+            except Exception as e:
+                logger.warning(f"Failed to clear stale skill cache entries: {e}")
+
+    def _record(self, hit: bool) -> None:
+        self._lookups += 1
+        self._hits += hit
+        metrics.increment("skills.cache_hits" if hit else "skills.cache_misses")
+        metrics.set_gauge("skills.cache_hit_ratio", round(self._hits / self._lookups, 4))
+
+    def get(self, key: str, digest: str) -> Optional[List[str]]:
+        """Cached skills for a text key, or None"""
+        with self._lock:
+            self._check_taxonomy(digest)
+            skills = self._entries.get(key)
+            if skills is not None:
+                self._entries.move_to_end(key)
+                self._record(True)
+                return list(skills)
+            # Evicted but not written to disk yet: bring it back into memory
+            skills = self._spilled.pop(key, None)
+            if skills is not None:
+                self._record(True)
+
+        if skills is not None:
+            self.put(key, digest, skills)
+            return list(skills)
+
+        if self.disk:
+            try:
+                skills = self.disk.get_skills(key, digest)
+            except Exception as e:
+                logger.warning(f"Skill cache disk lookup failed: {e}")
+                skills = None
+            if skills is not None:
+                metrics.increment("skills.cache_disk_hits")
+                with self._lock:
+                    self._record(True)
+                self.put(key, digest, skills)
+                return list(skills)
+
+        with self._lock:
+            self._record(False)
+        return None
+
+    def put(self, key: str, digest: str, skills: List[str]) -> None:
+        """Remember the skills of a text, evicting the least recently used entries"""
+        spill = None
+        with self._lock:
+            self._check_taxonomy(digest)
+            self._entries[key] = list(skills)
+            self._entries.move_to_end(key)
+            self._spilled.pop(key, None)
+            while len(self._entries) > self.max_entries:
+                evicted_key, evicted_skills = self._entries.popitem(last=False)
+                if self.disk:
+                    self._spilled[evicted_key] = evicted_skills
+            if len(self._spilled) >= SKILL_CACHE_SPILL_BATCH:
+                spill, self._spilled = list(self._spilled.items()), {}
+            metrics.set_gauge("skills.cache_entries", len(self._entries))
+
+        if spill:
+            try:
+                self.disk.store_skills(spill, digest)
+                self.disk.evict(self.disk_max_entries)
+            except Exception as e:
+                logger.warning(f"Failed to spill skill cache entries to disk: {e}")
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+# Shared by every skill extraction in the process
+skill_cache = SkillExtractionCache(disk=SkillCacheManager() if SKILL_CACHE_DISK else None)
@@ -0,0 +1,94 @@
+import math
+import threading
+from typing import List, Dict, Any, Iterable, Tuple
+from app.services.job_store import job_store
+
+# Pairs seen together in fewer jobs than this are treated as noise
+MIN_COOCCURRENCE = 2
+
+class SkillCooccurrence:
+    """
+    How often skills are required together, over every job in the job store.
+
+    Counts are kept as a sparse symmetric matrix (skill -> skill -> jobs with
+    both) and updated as jobs are added or expire. Related skills are scored
+    with positive pointwise mutual information, log2(P(a, b) / (P(a) P(b))):
+    how much more often two skills appear together than chance predicts.
+    """
+
+    def __init__(self, min_cooccurrence: int = MIN_COOCCURRENCE):
+        self.min_cooccurrence = min_cooccurrence
+        self._jobs: Dict[str, Tuple[str, ...]] = {}
+        self._skill_counts: Dict[str, int] = {}
+        self._pairs: Dict[str, Dict[str, int]] = {}
+        self._lock = threading.Lock()
+
+    def job_added(self, job: Dict[str, Any]) -> None:
+        skills = tuple(sorted(set(job.get('required_skills') or [])))
+        with self._lock:
+            self._remove(job['id'])
+            self._jobs[job['id']] = skills
+            self._update(skills, 1)
+
+    def job_removed(self, job: Dict[str, Any]) -> None:
+        with self._lock:
+            self._remove(job['id'])
+
+    def _remove(self, job_id: str) -> None:
+        skills = self._jobs.pop(job_id, None)
+        if skills is not None:
+            self._update(skills, -1)
+
+    def _update(self, skills: Tuple[str, ...], delta: int) -> None:
+        for skill in skills:
+            count = self._skill_counts.get(skill, 0) + delta
+            if count:
+                self._skill_counts[skill] = count
+            else:
+                del self._skill_counts[skill]
+
+            row = self._pairs.setdefault(skill, {})
+            for other in skills:
+                if other == skill:
+                    continue
+                pair_count = row.get(other, 0) + delta
+                if pair_count:
+                    row[other] = pair_count
+                else:
+                    del row[other]
+            if not row:
+                del self._pairs[skill]
+
+    def related(self, skills: Iterable[str], limit: int = 5) -> List[Tuple[str, float]]:
+        """
+        Skills most associated with a set of skills, as (skill, score) pairs,
+        best first; ties are broken by name so the result is deterministic.
+
+        The score of a candidate is the sum of its PMI with each given skill:
+        a product of the PMI matrix with the indicator vector of the skill set,
+        computed over the non-zero entries only.
+        """
+        given = {skill.lower() for skill in skills}
+        with self._lock:
+            total_jobs = len(self._jobs)
+            scores: Dict[str, float] = {}
+            for skill in given:
+                skill_count = self._skill_counts.get(skill)
+                if not skill_count:
+                    continue
+                for other, pair_count in self._pairs.get(skill, {}).items():
+                    if other in given or pair_count < self.min_cooccurrence:
+                        continue
+                    pmi = math.log2(pair_count * total_jobs / (skill_count * self._skill_counts[other]))
+                    if pmi > 0:
+                        scores[other] = scores.get(other, 0.0) + pmi
+
+        ranked = sorted(scores.items(), key=lambda item: (-item[1], item[0]))[:limit]
+        return [(skill, round(score, 4)) for skill, score in ranked]
+
+    def total_jobs(self) -> int:
+        return len(self._jobs)
+
+# Global co-occurrence counts, kept in sync with the job store
+skill_cooccurrence = SkillCooccurrence()
+job_store.subscribe(skill_cooccurrence)
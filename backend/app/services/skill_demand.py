@@ -0,0 +1,165 @@
+import heapq
+import math
+import threading
+import time
+from datetime import datetime
+from typing import List, Dict, Any, Optional, Tuple
+from app.services.job_enrichment import location_names
+from app.services.job_store import job_store
+
+# A posting's weight halves every week, so demand reflects the current market
+DEMAND_HALF_LIFE = 7 * 24 * 60 * 60
+
+# Postings older than this many half-lives count as if they were that old: their
+# weight is already negligible, and it keeps every exponent small
+DEMAND_MAX_AGE_HALF_LIVES = 20
+
+# Rebase stored weights before the exponent gets large enough to lose precision
+_MAX_EXPONENT = 30
+
+Bucket = Tuple[str, str]
+ALL_JOBS: Bucket = ("all", "")
+
+def job_timestamp(job: Dict[str, Any]) -> float:
+    """When a job was posted, falling back to now if the upstream date is unusable"""
+    published = job.get('pubDate')
+    try:
+        if isinstance(published, str) and not published.strip().isdigit():
+            return datetime.fromisoformat(published.replace('Z', '+00:00')).timestamp()
+        if published is not None:
+            timestamp = float(published)
+            if math.isfinite(timestamp):
+                # Some feeds use milliseconds
+                return timestamp / 1000 if timestamp > 1e12 else timestamp
+    except (TypeError, ValueError):
+        pass
+    return time.time()
+
+def job_buckets(job: Dict[str, Any]) -> List[Bucket]:
+    """The breakdowns a job counts towards: overall, each location and each category"""
+    buckets = [ALL_JOBS]
+    # From the structured restrictions: the display string can't be split, names may contain commas
+    for location in location_names(job):
+        buckets.append(("location", location.lower()))
+    for category in job.get('categories') or []:
+        if category:
+            buckets.append(("category", str(category).lower()))
+    return buckets
+
+class SkillDemandAggregates:
+    """
+    Skill demand over every job in the job store, updated as jobs are added or
+    expire instead of being recounted per request.
+
+    Each job contributes 2 ** ((posted - origin) / half_life) to its skills, so
+    decay never has to be applied to stored sums: scaling by
+    2 ** (-(now - origin) / half_life) at read time gives the decayed demand.
+    """
+
+    def __init__(self, half_life: float = DEMAND_HALF_LIFE):
+        self.half_life = half_life
+        self._origin = time.time()
+        self._weights: Dict[Bucket, Dict[str, float]] = {}
+        self._counts: Dict[Bucket, Dict[str, int]] = {}
+        self._contributions: Dict[str, Tuple[float, List[Bucket], List[str]]] = {}
+        self._lock = threading.Lock()
+
+    def _scaled_weight(self, posted: float) -> float:
+        return 2 ** ((posted - self._origin) / self.half_life)
+
+    def _clamp(self, posted: float, now: float) -> float:
+        """Bring a posting date into [now - max age, now], ignoring bad upstream dates"""
+        return min(max(posted, now - DEMAND_MAX_AGE_HALF_LIVES * self.half_life), now)
+
+    def _rebase(self, new_origin: float) -> None:
+        """Move the time origin, rescaling every stored weight to match"""
+        factor = 2 ** ((self._origin - new_origin) / self.half_life)
+        for weights in self._weights.values():
+            for skill in weights:
+                weights[skill] *= factor
+        self._origin = new_origin
+
+    def job_added(self, job: Dict[str, Any]) -> None:
+        skills = job.get('required_skills') or []
+        now = time.time()
+        posted = self._clamp(job_timestamp(job), now)
+        buckets = job_buckets(job)
+        with self._lock:
+            self._remove(job['id'])
+            # Postings are clamped to now, so only the passing of time calls for a rebase
+            if (now - self._origin) / self.half_life > _MAX_EXPONENT:
+                self._rebase(now)
+
+            weight = self._scaled_weight(posted)
+            for bucket in buckets:
+                weights = self._weights.setdefault(bucket, {})
+                counts = self._counts.setdefault(bucket, {})
+                for skill in skills:
+                    weights[skill] = weights.get(skill, 0.0) + weight
+                    counts[skill] = counts.get(skill, 0) + 1
+            self._contributions[job['id']] = (posted, buckets, skills)
+
+    def job_removed(self, job: Dict[str, Any]) -> None:
+        with self._lock:
+            self._remove(job['id'])
+
+    def _remove(self, job_id: str) -> None:
+        contribution = self._contributions.pop(job_id, None)
+        if contribution is None:
+            return
+        posted, buckets, skills = contribution
+        weight = self._scaled_weight(posted)
+        for bucket in buckets:
+            weights = self._weights[bucket]
+            counts = self._counts[bucket]
+            for skill in skills:
+                counts[skill] -= 1
+                if counts[skill] <= 0:
+                    # Drop the entry rather than keep floating point residue
+                    del counts[skill]
+                    del weights[skill]
+                else:
+                    weights[skill] -= weight
+            if not counts:
+                del self._counts[bucket]
+                del self._weights[bucket]
+
+    def top_skills(self, limit: int = 10, location: Optional[str] = None,
+                   category: Optional[str] = None) -> List[Dict[str, Any]]:
+        """
+        Most in-demand skills overall, or within one location or category.
+        Each entry has the decayed demand and the raw number of jobs.
+        Raises ValueError if both a location and a category are given, since
+        demand is only aggregated per location and per category.
+        """
+        if location and category:
+            raise ValueError("Skill demand can be filtered by location or by category, not both")
+        if location:
+            bucket = ("location", location.lower())
+        elif category:
+            bucket = ("category", category.lower())
+        else:
+            bucket = ALL_JOBS
+
+        with self._lock:
+            weights = self._weights.get(bucket, {})
+            counts = self._counts.get(bucket, {})
+            decay = 2 ** (-(time.time() - self._origin) / self.half_life)
+            top = heapq.nlargest(limit, weights.items(), key=lambda item: (item[1], item[0]))
+            return [
+                {"skill": skill, "demand": round(weight * decay, 2), "jobs": counts[skill]}
+                for skill, weight in top
+            ]
+
+    def job_counts(self, limit: int = 50, location: Optional[str] = None,
+                   category: Optional[str] = None) -> Dict[str, int]:
+        """Top skills as a skill -> number of jobs dict, most demanded first"""
+        return {entry["skill"]: entry["jobs"]
+                for entry in self.top_skills(limit, location, category)}
+
+    def total_jobs(self) -> int:
+        return len(self._contributions)
+
+# Global market demand aggregates, kept in sync with the job store
+market_demand = SkillDemandAggregates()
+job_store.subscribe(market_demand)
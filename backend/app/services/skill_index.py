@@ -0,0 +1,187 @@
+import threading
+from typing import List, Dict, Any, Iterable, Iterator, Optional, Tuple
+from app.services.skill_service import extract_skills_from_text
+from app.services.skill_taxonomy import get_taxonomy
+from app.services.job_store import job_store
+
+# Bit position of every skill. Positions are handed out as skills first appear and
+# never change, so bitsets stay valid when the skill taxonomy is reloaded
+SKILL_BITS: Dict[str, int] = {}
+SKILL_NAMES: List[str] = []
+_skill_bits_lock = threading.Lock()
+
+def _skill_position(skill: str) -> Optional[int]:
+    """Bit position of a skill, or None if it is not a taxonomy skill"""
+    position = SKILL_BITS.get(skill)
+    if position is not None or skill not in get_taxonomy().skills:
+        return position
+    with _skill_bits_lock:
+        if skill not in SKILL_BITS:
+            SKILL_BITS[skill] = len(SKILL_NAMES)
+            SKILL_NAMES.append(skill)
+        return SKILL_BITS[skill]
+
+def skills_to_bitset(skills: Iterable[str]) -> int:
+    """Encode skill names as a Python int with one bit per taxonomy skill"""
+    bits = 0
+    for skill in skills:
+        position = _skill_position(skill.lower())
+        if position is not None:
+            bits |= 1 << position
+    return bits
+
+def bitset_to_skills(bits: int) -> List[str]:
+    """Decode a skill bitset back into sorted skill names"""
+    skills = []
+    while bits:
+        lowest = bits & -bits
+        skills.append(SKILL_NAMES[lowest.bit_length() - 1])
+        bits ^= lowest
+    return sorted(skills)
+
+def profile_skills_to_bitset(profile_skills: List[str]) -> int:
+    """
+    Encode the free-form skills of a user profile.
+    Entries are matched directly and also run through the extractor, so
+    aliases such as "k8s" or "Node.js" map onto taxonomy skills.
+    """
+    if not profile_skills:
+        return 0
+    extracted = extract_skills_from_text(", ".join(profile_skills))
+    return skills_to_bitset(list(profile_skills) + extracted)
+
+def _iter_set_bits(mask: int) -> Iterator[int]:
+    """Yield the positions of the set bits of mask, lowest first"""
+    while mask:
+        lowest = mask & -mask
+        yield lowest.bit_length() - 1
+        mask ^= lowest
+
+class SkillBitsetIndex:
+    """
+    Skill bitsets of every enriched job in the job store, stored column-wise:
+    each job gets a slot, and each skill has one Python int with a bit set for
+    every slot whose job needs that skill. Ranking then works on whole columns
+    with a handful of big-int operations instead of a loop over jobs.
+    """
+
+    def __init__(self):
+        self._columns: Dict[int, int] = {}  # skill bit position -> slots with that skill
+        self._size_masks: Dict[int, int] = {}  # number of skills -> slots with that many
+        self._occupied = 0
+        self._slot_of: Dict[str, int] = {}
+        self._job_at: List[Optional[str]] = []
+        self._bits_at: List[int] = []
+        self._free_slots: List[int] = []
+        self._lock = threading.Lock()
+
+    def job_added(self, job: Dict[str, Any]) -> None:
+        bits = skills_to_bitset(job.get('required_skills') or [])
+        with self._lock:
+            self._remove(job['id'])
+            if self._free_slots:
+                slot = self._free_slots.pop()
+                self._job_at[slot] = job['id']
+                self._bits_at[slot] = bits
+            else:
+                slot = len(self._job_at)
+                self._job_at.append(job['id'])
+                self._bits_at.append(bits)
+            self._slot_of[job['id']] = slot
+
+            slot_bit = 1 << slot
+            for position in _iter_set_bits(bits):
+                self._columns[position] = self._columns.get(position, 0) | slot_bit
+            size = bits.bit_count()
+            self._size_masks[size] = self._size_masks.get(size, 0) | slot_bit
+            self._occupied |= slot_bit
+
+    def job_removed(self, job: Dict[str, Any]) -> None:
+        with self._lock:
+            self._remove(job['id'])
+
+    def _remove(self, job_id: str) -> None:
+        slot = self._slot_of.pop(job_id, None)
+        if slot is None:
+            return
+        bits = self._bits_at[slot]
+        keep = ~(1 << slot)
+        for position in _iter_set_bits(bits):
+            self._columns[position] &= keep
+        size = bits.bit_count()
+        self._size_masks[size] &= keep
+        self._occupied &= keep
+        self._job_at[slot] = None
+        self._bits_at[slot] = 0
+        self._free_slots.append(slot)
+
+    def _overlap_masks(self, user_bits: int) -> Dict[int, int]:
+        """
+        Count, for every slot at once, how many of the user's skills its job shares.
+        The counts are kept as binary planes (a bit-sliced counter) and returned as
+        overlap -> mask of slots with exactly that overlap.
+        """
+        planes: List[int] = []
+        user_positions = list(_iter_set_bits(user_bits))
+        for position in user_positions:
+            carry = self._columns.get(position, 0)
+            for i in range(len(planes)):
+                if not carry:
+                    break
+                planes[i], carry = planes[i] ^ carry, planes[i] & carry
+            if carry:
+                planes.append(carry)
+
+        masks = {}
+        for overlap in range(1, len(user_positions) + 1):
+            mask = self._occupied
+            for i, plane in enumerate(planes):
+                mask &= plane if overlap >> i & 1 else ~plane
+                if not mask:
+                    break
+            if overlap >> len(planes):
+                mask = 0
+            if mask:
+                masks[overlap] = mask
+        return masks
+
+    def rank(self, user_bits: int, limit: int = 10, metric: str = "jaccard") -> List[Tuple[str, float, int]]:
+        """
+        Rank jobs against a user's skill bitset.
+        Returns (job_id, score, job_bits) tuples, best first. Score is the Jaccard
+        similarity or, with metric="overlap", the number of shared skills.
+        """
+        if not user_bits:
+            return []
+
+        with self._lock:
+            overlap_masks = self._overlap_masks(user_bits)
+
+            # Every (overlap, job size) pair has a fixed score, so visit the pairs
+            # best-first and take the matching slots until enough jobs are found
+            user_size = user_bits.bit_count()
+            candidates = []
+            for overlap, mask in overlap_masks.items():
+                if metric == "overlap":
+                    candidates.append((float(overlap), overlap, 0, mask))
+                    continue
+                for size, size_mask in self._size_masks.items():
+                    if size >= overlap:
+                        score = overlap / (size + user_size - overlap)
+                        candidates.append((score, overlap, -size, mask & size_mask))
+            candidates.sort(key=lambda candidate: candidate[:3], reverse=True)
+
+            results = []
+            for score, _, _, mask in candidates:
+                for slot in _iter_set_bits(mask):
+                    results.append((self._job_at[slot], score, self._bits_at[slot]))
+                    if len(results) == limit:
+                        return results
+            return results
+
+    def __len__(self) -> int:
+        return len(self._slot_of)
+
+# Global skill index, kept in sync with the job store
+skill_index = SkillBitsetIndex()
+job_store.subscribe(skill_index)
@@ -0,0 +1,108 @@
+import re
+from typing import Any, Dict, List, Set
+
+# Characters that extend a skill token. '+' and '#' are included so that "c" never
+# matches inside "c++" and "c++" never matches inside "c+++" (\b cannot express either)
+_TOKEN_CHARS = r'[\w+#]'
+_LEFT_BOUNDARY = rf'(?<!{_TOKEN_CHARS})'
+
+# Bump when the matching rules change, so cached matcher artifacts are rebuilt
+MATCHER_FORMAT = 2
+
+def term_end(term: str) -> str:
+    """The token boundary required after a term"""
+    if re.match(r'\w', term[-1]):
+        return rf'(?!{_TOKEN_CHARS})'
+    # Terms ending in punctuation may be followed by a version ("c++17", "c#10")
+    return r'(?![+#])'
+
+def _term_pattern(term: str) -> str:
+    """Regex for one term, requiring a token boundary after it"""
+    return re.escape(term) + term_end(term)
+
+def term_trie(endings: Dict[str, str]) -> str:
+    """
+    Regex matching any of the given terms, each followed by its regex in
+    endings. The terms are laid out as a prefix tree, so the regex engine only
+    tries the terms that continue the text at hand instead of every term in
+    turn. Longer terms are tried first, so the longest matching term wins.
+    """
+    tree: Dict[str, Any] = {}
+    for term, ending in endings.items():
+        node = tree
+        for char in term:
+            node = node.setdefault(char, {})
+        node[""] = ending
+
+    def branch(node: Dict[str, Any]) -> str:
+        alternatives = [re.escape(char) + branch(child) for char, child in sorted(node.items()) if char]
+        if "" in node:
+            alternatives.append(node[""])
+        return alternatives[0] if len(alternatives) == 1 else "(?:" + "|".join(alternatives) + ")"
+
+    return branch(tree)
+
+class SkillMatcher:
+    """
+    Finds every skill mentioned in a text in a single pass.
+
+    All search terms (skill names and their abbreviations) are compiled once
+    into one prefix tree regex with custom token boundaries. The longest
+    matching term wins, and each term also reports the shorter terms it contains
+    ("sql server" implies "sql"), so the result is the same as searching for
+    every term separately.
+    """
+
+    def __init__(self, terms: Dict[str, str]):
+        """terms maps each lowercase search term to the skill it stands for"""
+        self.terms = dict(terms)
+        self.pattern = re.compile(
+            _LEFT_BOUNDARY + '(' + term_trie({term: term_end(term) for term in self.terms}) + ')'
+        )
+
+        term_patterns = {
+            term: re.compile(_LEFT_BOUNDARY + _term_pattern(term))
+            for term in self.terms
+        }
+        self._skills_for: Dict[str, Set[str]] = {
+            term: {skill for inner, skill in self.terms.items() if term_patterns[inner].search(term)}
+            for term in self.terms
+        }
+
+    def to_artifact(self) -> Dict[str, Any]:
+        """Everything needed to rebuild this matcher without recomputing it, as plain JSON data"""
+        return {
+            "format": MATCHER_FORMAT,
+            "terms": self.terms,
+            "pattern": self.pattern.pattern,
+            "skills_for": {term: sorted(skills) for term, skills in self._skills_for.items()}
+        }
+
+    @classmethod
+    def from_artifact(cls, artifact: Dict[str, Any]) -> "SkillMatcher":
+        """Rebuild a matcher saved with to_artifact()"""
+        if artifact.get("format") != MATCHER_FORMAT:
+            raise ValueError(f"Unsupported skill matcher format: {artifact.get('format')}")
+        matcher = cls.__new__(cls)
+        matcher.terms = dict(artifact["terms"])
+        matcher.pattern = re.compile(artifact["pattern"])
+        matcher._skills_for = {term: set(skills) for term, skills in artifact["skills_for"].items()}
+        return matcher
+
+    def skills_for(self, term: str) -> Set[str]:
+        """Skills a matched (lowercase) term stands for"""
+        return self._skills_for[term]
+
+    def find(self, text: str) -> Set[str]:
+        """Skills mentioned in text, which must already be lowercase"""
+        found = set()
+        for term in set(self.pattern.findall(text)):
+            found |= self._skills_for[term]
+        return found
+
+    def extract(self, text: str) -> List[str]:
+        """Sorted skills mentioned in a raw text that may contain HTML"""
+        if not text:
+            return []
+        # Lowercase and remove HTML tags before matching
+        return sorted(self.find(re.sub(r'<[^>]+>', ' ', text.lower())))
@@ -1,218 +1,299 @@
 import re
-import requests
-from typing import List, Set, Dict, Any
+import os
+import threading
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from typing import List, Set, Dict, Any, Iterable, Optional
 import logging
-from bs4 import BeautifulSoup
 import time
+from app.database import ScrapeCacheManager
+from app.services import metrics, upstream
+from app.services import text_analyzer
+from app.services.skill_taxonomy import SkillTaxonomy, get_taxonomy
+from app.services.skill_cache import skill_cache, text_key
+from app.services.scrape_parser import read_job_description
 
 logger = logging.getLogger(__name__)
 
-# Common programming languages, frameworks, and tools
-TECH_SKILLS = {
-    # Programming Languages
-    'python', 'javascript', 'java', 'typescript', 'go', 'rust', 'c++', 'c#', 'php', 'ruby', 'swift', 'kotlin',
-    'scala', 'clojure', 'haskell', 'erlang', 'elixir', 'dart', 'r', 'matlab', 'sql',
+# Batch extraction settings: batches up to SKILL_BATCH_INLINE_MAX texts are matched in
+# the calling thread, where a process pool round trip would cost more than it saves
+SKILL_BATCH_INLINE_MAX = 64
+SKILL_BATCH_CHUNK_SIZE = 256
+SKILL_BATCH_WORKERS = os.cpu_count() or 1
 
-    # Frontend Technologies
-    'react', 'vue', 'angular', 'svelte', 'jquery', 'bootstrap', 'tailwind', 'sass', 'less',
-    'html', 'css', 'webpack', 'vite', 'parcel', 'rollup',
-
-    # Backend Technologies
-    'node.js', 'express', 'fastapi', 'django', 'flask', 'spring', 'laravel', 'rails',
-    'gin', 'echo', 'fiber', 'nest.js', 'koa', 'hapi',
-
-    # Databases
-    'postgresql', 'mysql', 'mongodb', 'redis', 'elasticsearch', 'cassandra', 'dynamodb',
-    'sqlite', 'mariadb', 'oracle', 'sql server', 'neo4j', 'influxdb',
-
-    # Cloud & DevOps
-    'aws', 'azure', 'gcp', 'docker', 'kubernetes', 'terraform', 'ansible', 'jenkins',
-    'gitlab', 'github', 'circleci', 'travis', 'helm', 'istio', 'prometheus', 'grafana',
-
-    # Data & ML
-    'pandas', 'numpy', 'scikit-learn', 'tensorflow', 'pytorch', 'keras', 'spark',
-    'hadoop', 'kafka', 'airflow', 'dbt', 'snowflake', 'databricks',
-
-    # Testing
-    'jest', 'pytest', 'junit', 'cypress', 'selenium', 'mocha', 'chai', 'testing-library',
-
-    # Others
-    'git', 'linux', 'bash', 'vim', 'vscode', 'intellij', 'figma', 'sketch', 'photoshop'
-}
+_skill_pool: Optional[ProcessPoolExecutor] = None
+_skill_pool_digest: Optional[str] = None
+_skill_pool_lock = threading.Lock()
 
 def extract_skills_from_text(text: str) -> List[str]:
     """Extract technical skills from job description text"""
     if not text:
         return []
 
-    # Convert to lowercase for matching
-    text_lower = text.lower()
-
-    # Remove HTML tags if any
-    text_clean = re.sub(r'<[^>]+>', ' ', text_lower)
-
-    # Find skills mentioned in the text
-    found_skills = set()
-
-    for skill in TECH_SKILLS:
-        # Create regex pattern for the skill
-        # Look for whole word matches with word boundaries
-        pattern = r'\b' + re.escape(skill.lower()) + r'\b'
-
-        if re.search(pattern, text_clean):
-            found_skills.add(skill)
-
-    # Also look for common variations and abbreviations
-    skill_variations = {
-        'js': 'javascript',
-        'ts': 'typescript',
-        'py': 'python',
-        'k8s': 'kubernetes',
-        'tf': 'terraform',
-        'ml': 'machine learning',
-        'ai': 'artificial intelligence',
-        'ci/cd': 'continuous integration',
-        'devops': 'devops',
-        'microservices': 'microservices',
-        'api': 'api development',
-        'rest': 'rest api',
-        'graphql': 'graphql',
-        'nosql': 'nosql',
-        'full-stack': 'full-stack development',
-        'frontend': 'frontend development',
-        'backend': 'backend development',
-        'mobile': 'mobile development',
-        'ios': 'ios development',
-        'android': 'android development'
-    }
-
-    for abbrev, full_skill in skill_variations.items():
-        pattern = r'\b' + re.escape(abbrev.lower()) + r'\b'
-        if re.search(pattern, text_clean):
-            found_skills.add(full_skill)
-
-    return sorted(list(found_skills))
+    metrics.increment("skills.extract_calls")
+
+    # The same titles and descriptions come up again and again, so reuse earlier results
+    taxonomy = get_taxonomy()
+    key = text_key(text)
+    skills = skill_cache.get(key, taxonomy.digest)
+    if skills is None:
+        # Find all skills and their aliases in a single pass over the text
+        skills = taxonomy.analyzer.extract_skills(text)
+        skill_cache.put(key, taxonomy.digest, skills)
+    return skills
+
+def _get_skill_pool(taxonomy: SkillTaxonomy) -> ProcessPoolExecutor:
+    """
+    Start the skill extraction worker processes on first use, and restart
+    them when the taxonomy changes so they never match with a stale one.
+    """
+    global _skill_pool, _skill_pool_digest
+    with _skill_pool_lock:
+        if _skill_pool is not None and _skill_pool_digest != taxonomy.digest:
+            _skill_pool.shutdown(wait=False)
+            _skill_pool = None
+        if _skill_pool is None:
+            # Spawned workers only import the analyzer and matcher modules, not
+            # the app, and don't inherit the threads of the server process
+            _skill_pool = ProcessPoolExecutor(
+                max_workers=SKILL_BATCH_WORKERS,
+                mp_context=multiprocessing.get_context("spawn"),
+                initializer=text_analyzer.init_worker,
+                initargs=(taxonomy.matcher.to_artifact(),)
+            )
+            _skill_pool_digest = taxonomy.digest
+        return _skill_pool
+
+def _reset_skill_pool(pool: ProcessPoolExecutor) -> None:
+    global _skill_pool
+    with _skill_pool_lock:
+        if _skill_pool is pool:
+            _skill_pool = None
+    pool.shutdown(wait=False, cancel_futures=True)
+
+def extract_skills_batch(texts: Iterable[str]) -> List[List[str]]:
+    """
+    Extract the skills of many texts at once, returning one sorted list per text
+    in input order. Cached results are reused; the remaining texts are split into
+    chunks matched in parallel across worker processes, or matched inline if
+    there are only a few of them.
+    """
+    texts = [text or '' for text in texts]
+    if len(texts) <= SKILL_BATCH_INLINE_MAX or SKILL_BATCH_WORKERS < 2:
+        return [extract_skills_from_text(text) for text in texts]
+
+    metrics.increment("skills.extract_calls", sum(1 for text in texts if text))
+    taxonomy = get_taxonomy()
+    keys = [text_key(text) for text in texts]
+    results = [skill_cache.get(key, taxonomy.digest) if text else [] for text, key in zip(texts, keys)]
+    missing = [i for i, skills in enumerate(results) if skills is None]
+    missing_texts = [texts[i] for i in missing]
+
+    if len(missing_texts) <= SKILL_BATCH_INLINE_MAX:
+        extracted = [taxonomy.analyzer.extract_skills(text) for text in missing_texts]
+    else:
+        extracted = _extract_in_pool(taxonomy, missing_texts)
+
+    for i, skills in zip(missing, extracted):
+        results[i] = skills
+        skill_cache.put(keys[i], taxonomy.digest, skills)
+    return results
+
+def _extract_in_pool(taxonomy: SkillTaxonomy, texts: List[str]) -> List[List[str]]:
+    """Match texts in chunks across the worker processes, keeping their order"""
+    chunks = [texts[i:i + SKILL_BATCH_CHUNK_SIZE] for i in range(0, len(texts), SKILL_BATCH_CHUNK_SIZE)]
+    pool = _get_skill_pool(taxonomy)
+    try:
+        results = []
+        for chunk_skills in pool.map(text_analyzer.extract_chunk, chunks):
+            results.extend(chunk_skills)
+        return results
+    except BrokenProcessPool as e:
+        logger.warning(f"Skill extraction pool failed, extracting inline: {e}")
+        _reset_skill_pool(pool)
+        return [taxonomy.analyzer.extract_skills(text) for text in texts]
+
+# Scraped description cache settings
+SCRAPE_CACHE_TTL = 24 * 60 * 60  # Revalidate cached pages after a day
+SCRAPE_NEGATIVE_TTL = 10 * 60  # Retry failed scrapes after 10 minutes
+SCRAPE_CACHE_MAX_BYTES = 20 * 1024 * 1024
+
+# Job pages are streamed and parsed as they arrive; reading stops once the
+# description is found, and never goes past SCRAPE_MAX_BYTES
+SCRAPE_MAX_BYTES = 1024 * 1024
+SCRAPE_CHUNK_SIZE = 16 * 1024
+SCRAPE_DESCRIPTION_CHARS = 2000
+
+_scrape_cache = ScrapeCacheManager()
+
+SCRAPE_HEADERS = {
+    'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36'
+}
 
-def scrape_job_description(job_url: str) -> str:
-    """Scrape full job description from job URL"""
+def _read_job_description(response) -> str:
+    """Stream a job page and extract its description, reading no more than needed"""
+    content_type = response.headers.get('Content-Type') or ''
+    charset = re.search(r'charset=["\']?([\w-]+)', content_type, re.IGNORECASE)
+    description, bytes_read = read_job_description(
+        response.iter_content(chunk_size=SCRAPE_CHUNK_SIZE),
+        encoding=charset.group(1) if charset else None,
+        max_bytes=SCRAPE_MAX_BYTES,
+        max_chars=SCRAPE_DESCRIPTION_CHARS
+    )
+    metrics.increment("scrape.bytes_read", bytes_read)
+    return description
+
+def _cached_details(cached: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Details of a cached page. Its stored skills are used if they were extracted
+    with the current skill taxonomy; otherwise they are extracted again and stored.
+    """
+    digest = get_taxonomy().digest
+    skills = cached['skills']
+    if cached['skills_digest'] != digest:
+        skills = extract_skills_from_text(cached['description'])
+        _scrape_cache.store_skills(cached['url'], skills, digest)
+    return {"description": cached['description'], "skills": skills}
+
+def scrape_job_details(job_url: str) -> Dict[str, Any]:
+    """
+    Scrape a job page, returning its description and extracted skills.
+    Results are cached on disk and revalidated with conditional GETs once stale.
+    """
     if not job_url:
-        return ""
+        return {"description": "", "skills": []}
 
-    try:
-        headers = {
-            'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36'
-        }
-
-        response = requests.get(job_url, headers=headers, timeout=10)
-        response.raise_for_status()
-
-        soup = BeautifulSoup(response.content, 'html.parser')
-
-        # Try to find job description in common selectors
-        description_selectors = [
-            '.job-description',
-            '.description',
-            '.job-content',
-            '.content',
-            '[data-testid="job-description"]',
-            '.job-detail',
-            '.posting-content'
-        ]
-
-        description_text = ""
-        for selector in description_selectors:
-            element = soup.select_one(selector)
-            if element:
-                description_text = element.get_text()
-                break
-
-        # If no specific selector found, try to get text from body
-        if not description_text:
-            body = soup.find('body')
-            if body:
-                description_text = body.get_text()
-
-        return description_text[:2000]  # Limit to first 2000 characters
+    now = time.time()
+    cached = _scrape_cache.get_entry(job_url)
 
-    except Exception as e:
-        logger.warning(f"Failed to scrape job description from {job_url}: {e}")
-        return ""
+    if cached:
+        age = now - cached['fetched_at']
+        if cached['is_negative'] and age < SCRAPE_NEGATIVE_TTL:
+            return {"description": "", "skills": []}
+        if not cached['is_negative'] and age < SCRAPE_CACHE_TTL:
+            return _cached_details(cached)
 
-def extract_skills_from_job(job: Dict[str, Any]) -> List[str]:
-    """Extract skills from a job posting"""
-    skills = set()
+    headers = dict(SCRAPE_HEADERS)
+    if cached and not cached['is_negative']:
+        if cached['etag']:
+            headers['If-None-Match'] = cached['etag']
+        if cached['last_modified']:
+            headers['If-Modified-Since'] = cached['last_modified']
 
-    # Extract from title
-    if job.get('title'):
-        title_skills = extract_skills_from_text(job['title'])
-        skills.update(title_skills)
+    try:
+        # Add a small delay to be respectful
+        time.sleep(0.5)
+        response = upstream.get(job_url, headers=headers, timeout=10, stream=True)
 
-    # Extract from description
-    if job.get('description'):
-        desc_skills = extract_skills_from_text(job['description'])
-        skills.update(desc_skills)
+        try:
+            if response.status_code == 304 and cached and not cached['is_negative']:
+                _scrape_cache.mark_revalidated(job_url)
+                return _cached_details(cached)
+
+            response.raise_for_status()
+
+            description = _read_job_description(response)
+        finally:
+            response.close()
+
+        skills = extract_skills_from_text(description)
+        _scrape_cache.store_entry(
+            job_url,
+            description,
+            skills,
+            skills_digest=get_taxonomy().digest,
+            etag=response.headers.get('ETag'),
+            last_modified=response.headers.get('Last-Modified')
+        )
+        _scrape_cache.evict(SCRAPE_CACHE_MAX_BYTES)
+        return {"description": description, "skills": skills}
 
-    # Extract from categories if available
-    if job.get('categories'):
-        for category in job['categories']:
-            cat_skills = extract_skills_from_text(category)
-            skills.update(cat_skills)
+    except Exception as e:
+        logger.warning(f"Failed to scrape job description from {job_url}: {e}")
+        if cached and not cached['is_negative']:
+            # Serve the stale copy rather than losing a page we already know
+            return _cached_details(cached)
+        _scrape_cache.store_negative(job_url)
+        return {"description": "", "skills": []}
+
+def scrape_job_description(job_url: str) -> str:
+    """Scrape full job description from job URL"""
+    return scrape_job_details(job_url)["description"]
+
+def job_skill_text(job: Dict[str, Any]) -> str:
+    """The text skills are extracted from: title, description and categories"""
+    parts = [job.get('title'), job.get('description')] + list(job.get('categories') or [])
+    return "\n".join(str(part) for part in parts if part)
+
+def extract_skills_from_job(job: Dict[str, Any], text_skills: Optional[List[str]] = None) -> List[str]:
+    """
+    Extract skills from a job posting.
+    Pass text_skills when the posting text was already matched (e.g. in a batch).
+    """
+    if text_skills is None:
+        text_skills = extract_skills_from_text(job_skill_text(job))
+    skills = set(text_skills)
 
     # If we have an application link, try to scrape more details
     if job.get('applicationLink') and len(skills) < 5:
         try:
-            # Add a small delay to be respectful
-            time.sleep(0.5)
-            scraped_description = scrape_job_description(job['applicationLink'])
-            if scraped_description:
-                scraped_skills = extract_skills_from_text(scraped_description)
-                skills.update(scraped_skills)
+            scraped = scrape_job_details(job['applicationLink'])
+            skills.update(scraped["skills"])
         except Exception as e:
             logger.warning(f"Failed to scrape additional skills: {e}")
 
     return sorted(list(skills))
 
 def analyze_skills_demand(jobs: List[Dict[str, Any]]) -> Dict[str, int]:
-    """Analyze skill demand across multiple jobs"""
+    """
+    Analyze skill demand across multiple jobs.
+    Uses the skills precomputed by the enrichment stage when a job has them.
+    """
     skill_count = {}
 
     for job in jobs:
-        job_skills = extract_skills_from_job(job)
+        job_skills = job.get('required_skills')
+        if job_skills is None:
+            job_skills = extract_skills_from_job(job)
         for skill in job_skills:
             skill_count[skill] = skill_count.get(skill, 0) + 1
 
     # Sort by frequency
     return dict(sorted(skill_count.items(), key=lambda x: x[1], reverse=True))
 
-def get_skill_recommendations(job_skills: List[str], market_skills: Dict[str, int]) -> List[str]:
-    """Get skill recommendations based on job requirements and market demand"""
+def get_skill_recommendations(job_skills: List[str], market_skills: Dict[str, int],
+                              related_skills: Optional[List[str]] = None, limit: int = 5) -> List[str]:
+    """
+    Get skill recommendations based on job requirements and market demand.
+    market_skills maps the most demanded skills, first to last, to the number of jobs asking for them.
+    related_skills (e.g. learned from co-occurrence in job postings) come first,
+    then the curated related skills of the taxonomy, then high-demand skills.
+    The result is deterministic for the same inputs.
+    """
     recommendations = []
 
     # Skills that appear in job but user might want to learn more about
     job_skill_set = set(skill.lower() for skill in job_skills)
 
-    # Related skills mapping
-    skill_relationships = {
-        'python': ['django', 'flask', 'fastapi', 'pandas', 'numpy'],
-        'javascript': ['react', 'vue', 'angular', 'node.js', 'typescript'],
-        'react': ['redux', 'next.js', 'typescript', 'testing-library'],
-        'aws': ['docker', 'kubernetes', 'terraform', 'lambda'],
-        'docker': ['kubernetes', 'jenkins', 'terraform'],
-        'sql': ['postgresql', 'mysql', 'database design'],
-        'machine learning': ['python', 'tensorflow', 'pytorch', 'pandas']
-    }
+    for skill in related_skills or []:
+        if skill not in job_skill_set:
+            recommendations.append(skill)
+
+    # Related skills mapping, from the skill taxonomy
+    skill_relationships = get_taxonomy().relationships
 
     # Find related skills
-    for skill in job_skills:
-        if skill.lower() in skill_relationships:
-            related = skill_relationships[skill.lower()]
-            for related_skill in related:
-                if related_skill not in job_skill_set and related_skill in market_skills:
-                    recommendations.append(related_skill)
+    for skill in sorted(job_skill_set):
+        for related_skill in skill_relationships.get(skill, []):
+            if related_skill not in job_skill_set and related_skill in market_skills:
+                recommendations.append(related_skill)
 
     # Add high-demand skills not in job requirements
+    # Skills asked for by a single job are not a trend yet
     for skill, count in list(market_skills.items())[:10]:
         if skill not in job_skill_set and count > 1:
             recommendations.append(skill)
 
-    return list(set(recommendations))[:5]  # Return top 5 unique recommendations
+    # Keep the first occurrence of each skill, in priority order
+    return list(dict.fromkeys(recommendations))[:limit]
@@ -0,0 +1,172 @@
+import hashlib
+import json
+import logging
+import os
+import threading
+import time
+from typing import Any, Dict, List, Optional
+from app.services import metrics
+from app.services.skill_matcher import SkillMatcher, MATCHER_FORMAT
+from app.services.text_analyzer import TextAnalyzer
+
+logger = logging.getLogger(__name__)
+
+# The skill taxonomy (skills, aliases, categories and related skills) lives in a
+# JSON file, so it can be edited without a deploy. The file is checked for
+# changes at most every SKILL_TAXONOMY_CHECK_INTERVAL seconds and reloaded
+SKILL_TAXONOMY_PATH = os.getenv(
+    "SKILL_TAXONOMY_PATH",
+    os.path.join(os.path.dirname(os.path.dirname(__file__)), "data", "skill_taxonomy.json")
+)
+SKILL_TAXONOMY_CHECK_INTERVAL = float(os.getenv("SKILL_TAXONOMY_CHECK_INTERVAL", "5"))
+
+# Compiled matchers are saved here, keyed by taxonomy hash, so a cold start
+# with an unchanged taxonomy loads the matcher instead of rebuilding it
+SKILL_MATCHER_CACHE_DIR = os.getenv("SKILL_MATCHER_CACHE_DIR", os.path.join(".cache", "skill_matchers"))
+
+class SkillTaxonomy:
+    """One loaded version of the skill taxonomy, with its compiled matcher"""
+
+    def __init__(self, document: Dict[str, Any], digest: str, matcher: Optional[SkillMatcher] = None):
+        self.document = document
+        self.digest = digest
+        self.version = document.get("version")
+        self.skills: Dict[str, Dict[str, Any]] = document["skills"]
+        self.relationships: Dict[str, List[str]] = document.get("relationships", {})
+
+        # Every search term (skill names and aliases) -> the skill it stands for
+        self.terms: Dict[str, str] = {}
+        for skill, details in self.skills.items():
+            self.terms[skill] = skill
+            for alias in details.get("aliases", []):
+                self.terms[alias.lower()] = skill
+        self.matcher = matcher or SkillMatcher(self.terms)
+        self._analyzer: Optional[TextAnalyzer] = None
+
+    @property
+    def analyzer(self) -> TextAnalyzer:
+        """Text analyzer matching this taxonomy's skills, built on first use"""
+        if self._analyzer is None:
+            self._analyzer = TextAnalyzer(self.matcher)
+        return self._analyzer
+
+    def category(self, skill: str) -> Optional[str]:
+        details = self.skills.get(skill)
+        return details.get("category") if details else None
+
+def _is_name(value: Any) -> bool:
+    return isinstance(value, str) and bool(value.strip())
+
+def _validate(document: Any) -> None:
+    """Reject taxonomy files that would break extraction"""
+    if not isinstance(document, dict) or not isinstance(document.get("skills"), dict):
+        raise ValueError("taxonomy must be an object with a 'skills' object")
+    for skill, details in document["skills"].items():
+        if skill != skill.lower() or not skill.strip():
+            raise ValueError(f"skill names must be lowercase and non-empty: {skill!r}")
+        if not isinstance(details, dict) or not isinstance(details.get("aliases", []), list):
+            raise ValueError(f"invalid entry for skill {skill!r}")
+        if not all(_is_name(alias) for alias in details.get("aliases", [])):
+            raise ValueError(f"aliases of skill {skill!r} must be non-empty strings")
+        if not isinstance(details.get("category", ""), str):
+            raise ValueError(f"category of skill {skill!r} must be a string")
+    relationships = document.get("relationships", {})
+    if not isinstance(relationships, dict):
+        raise ValueError("'relationships' must be an object")
+    for skill, related in relationships.items():
+        if not isinstance(related, list) or not all(_is_name(name) for name in related):
+            raise ValueError(f"relationships of {skill!r} must be a list of skill names")
+
+def _artifact_path(digest: str) -> str:
+    return os.path.join(SKILL_MATCHER_CACHE_DIR, f"{digest}-{MATCHER_FORMAT}.json")
+
+def _load_matcher(digest: str) -> Optional[SkillMatcher]:
+    """Load a previously compiled matcher for this taxonomy hash, if there is one"""
+    try:
+        with open(_artifact_path(digest)) as f:
+            matcher = SkillMatcher.from_artifact(json.load(f))
+        metrics.increment("skills.matcher_cache_hits")
+        return matcher
+    except FileNotFoundError:
+        return None
+    except (OSError, ValueError, KeyError) as e:
+        logger.warning(f"Ignoring unreadable skill matcher artifact for {digest}: {e}")
+        return None
+
+def _save_matcher(digest: str, matcher: SkillMatcher) -> None:
+    """Save a compiled matcher, writing to a temporary file first so readers never see half of it"""
+    path = _artifact_path(digest)
+    try:
+        os.makedirs(SKILL_MATCHER_CACHE_DIR, exist_ok=True)
+        temp_path = f"{path}.{os.getpid()}.tmp"
+        with open(temp_path, 'w') as f:
+            json.dump(matcher.to_artifact(), f)
+        os.replace(temp_path, path)
+    except OSError as e:
+        logger.warning(f"Failed to save skill matcher artifact: {e}")
+
+def load_taxonomy(path: str = SKILL_TAXONOMY_PATH) -> SkillTaxonomy:
+    """Read, validate and compile a taxonomy file"""
+    with open(path, 'rb') as f:
+        raw = f.read()
+    document = json.loads(raw)
+    _validate(document)
+
+    digest = hashlib.sha256(raw).hexdigest()
+    matcher = _load_matcher(digest)
+    taxonomy = SkillTaxonomy(document, digest, matcher)
+    if matcher is None:
+        _save_matcher(digest, taxonomy.matcher)
+    return taxonomy
+
+class _TaxonomyHolder:
+    """Keeps the current taxonomy, reloading it when the file changes"""
+
+    def __init__(self, path: str):
+        self.path = path
+        self._lock = threading.Lock()
+        self._mtime = os.path.getmtime(path)
+        self._checked_at = time.monotonic()
+        self.taxonomy = load_taxonomy(path)
+
+    def get(self) -> SkillTaxonomy:
+        now = time.monotonic()
+        if now - self._checked_at >= SKILL_TAXONOMY_CHECK_INTERVAL:
+            with self._lock:
+                if now - self._checked_at >= SKILL_TAXONOMY_CHECK_INTERVAL:
+                    self._checked_at = now
+                    try:
+                        mtime = os.path.getmtime(self.path)
+                    except OSError:
+                        mtime = self._mtime
+                    if mtime != self._mtime:
+                        self._mtime = mtime
+                        self._reload()
+        return self.taxonomy
+
+    def reload(self) -> SkillTaxonomy:
+        with self._lock:
+            self._reload()
+        return self.taxonomy
+
+    def _reload(self) -> None:
+        try:
+            taxonomy = load_taxonomy(self.path)
+        except (OSError, ValueError) as e:
+            # Keep serving the last good taxonomy rather than breaking extraction
+            logger.error(f"Failed to reload skill taxonomy from {self.path}: {e}")
+            return
+        if taxonomy.digest != self.taxonomy.digest:
+            logger.info(f"Loaded skill taxonomy version {taxonomy.version} ({len(taxonomy.skills)} skills)")
+            metrics.increment("skills.taxonomy_reloads")
+            self.taxonomy = taxonomy
+
+_holder = _TaxonomyHolder(SKILL_TAXONOMY_PATH)
+
+def get_taxonomy() -> SkillTaxonomy:
+    """The current skill taxonomy, picking up edits to the taxonomy file"""
+    return _holder.get()
+
+def reload_taxonomy() -> SkillTaxonomy:
+    """Reload the taxonomy file right away"""
+    return _holder.reload()
@@ -0,0 +1,123 @@
+import re
+from typing import Any, Dict, List, Optional, Set, Tuple
+from app.services.skill_matcher import SkillMatcher, term_end, term_trie
+
+# Sections a resume is expected to have, in the order they are reported
+SECTION_HEADINGS = (
+    "Contact Information",
+    "Summary",
+    "Work Experience",
+    "Education",
+    "Skills",
+    "Certifications",
+    "Projects"
+)
+
+ACTION_VERBS = ("achieved", "increased", "improved", "managed", "led", "developed", "created")
+
+# Numbers that quantify an achievement: percentages, amounts, thousands and
+# durations, matched case-sensitively anywhere in the original text. Finds
+# exactly what r'\d+%|\$\d+|\d+,\d+|\d+ years?' finds, but starts with a
+# character class, so the regex engine skips ahead to the next '$' or digit
+QUANTIFIED_PATTERN = r'[$\d](?:(?<=\$)\d+|(?<=\d)\d*(?:%|,\d+| years?))'
+_QUANTIFIED = re.compile(QUANTIFIED_PATTERN)
+
+_SECTION_NAMES = {heading.lower(): heading for heading in SECTION_HEADINGS}
+
+class TextAnalyzer:
+    """
+    Analyzes a text in one pass over its words: section headings, action verbs
+    and skill terms are all matched by a single regex over the text
+    lowercased once. Its words are laid out as one prefix tree (see
+    skill_matcher.term_trie), so each position of the text only tries the
+    words that can start there. Skill extraction runs the same scan.
+    Quantified achievements are found by a second, much cheaper scan with
+    QUANTIFIED_PATTERN.
+
+    Words only match at the start of a token. Where words overlap, the
+    longest one wins; a word that is both a heading or verb and a skill term
+    counts as both.
+    """
+
+    def __init__(self, matcher: SkillMatcher):
+        self.matcher = matcher
+        self._verbs = frozenset(ACTION_VERBS)
+
+        endings = {term: self._skill_end(term) for term in matcher.terms}
+        for word in list(_SECTION_NAMES) + list(ACTION_VERBS):
+            endings.setdefault(word, r'\b')
+        source = r'(?<!\w)(' + term_trie(endings) + ')'
+        self.pattern = re.compile(source)
+        # For the rare texts whose lowercase form has a different length, where
+        # offsets into the lowercased text would not match the original
+        self._ignorecase_pattern = re.compile(source, re.IGNORECASE)
+
+    @staticmethod
+    def _skill_end(term: str) -> str:
+        # Skill terms have stricter token boundaries than words: they must not
+        # follow a '+' or '#' either, which is checked once the term matched
+        return term_end(term) + rf'(?<![+#][\s\S]{{{len(term)}}})'
+
+    def _scan(self, text: str):
+        lowered = text.lower()
+        if len(lowered) == len(text):
+            return self.pattern.finditer(lowered)
+        return self._ignorecase_pattern.finditer(text)
+
+    def analyze(self, text: str) -> Dict[str, Any]:
+        """
+        Structured analysis of a plain text. Offsets are character positions
+        in text. Returns word and line counts, the offsets of every section
+        heading, action verb and quantified achievement found, and the skills
+        mentioned.
+        """
+        sections: Dict[str, List[int]] = {}
+        action_verbs: List[Tuple[str, int]] = []
+        terms: Set[str] = set()
+        skill_terms = self.matcher.terms
+
+        for match in self._scan(text):
+            word = match.group(1).lower()
+            if word in _SECTION_NAMES:
+                sections.setdefault(_SECTION_NAMES[word], []).append(match.start())
+            elif word in self._verbs:
+                action_verbs.append((word, match.start()))
+            if word in skill_terms:
+                terms.add(word)
+
+        return {
+            "word_count": len(text.split()),
+            "line_count": text.count("\n") + 1,
+            "sections": {heading: sections[heading] for heading in SECTION_HEADINGS if heading in sections},
+            "action_verbs": action_verbs,
+            "quantified": [(match.group(), match.start()) for match in _QUANTIFIED.finditer(text)],
+            "skills": self._skills(terms)
+        }
+
+    def extract_skills(self, text: str) -> List[str]:
+        """Sorted skills mentioned in a raw text that may contain HTML"""
+        if not text:
+            return []
+        # Remove HTML tags before matching
+        lowered = re.sub(r'<[^>]+>', ' ', text.lower())
+        skill_terms = self.matcher.terms
+        terms = {match.group(1) for match in self.pattern.finditer(lowered) if match.group(1) in skill_terms}
+        return self._skills(terms)
+
+    def _skills(self, terms: Set[str]) -> List[str]:
+        skills: Set[str] = set()
+        for term in terms:
+            skills |= self.matcher.skills_for(term)
+        return sorted(skills)
+
+# Analyzer of a batch worker process, built once per process by init_worker()
+_worker_analyzer: Optional[TextAnalyzer] = None
+
+def init_worker(artifact: Dict[str, Any]) -> None:
+    """Process pool initializer: build the parent's analyzer once per worker"""
+    global _worker_analyzer
+    _worker_analyzer = TextAnalyzer(SkillMatcher.from_artifact(artifact))
+
+def extract_chunk(texts: List[str]) -> List[List[str]]:
+    """Process pool task: extract the skills of a chunk of texts, in order"""
+    return [_worker_analyzer.extract_skills(text) for text in texts]
@@ -0,0 +1,132 @@
+import hashlib
+import json
+import os
+import tempfile
+from typing import BinaryIO, Dict, List, Tuple
+from fastapi import HTTPException, Request, UploadFile
+from starlette.concurrency import run_in_threadpool
+from starlette.datastructures import UploadFile as StarletteUploadFile
+from starlette.formparsers import MultiPartException, MultiPartParser
+
+# Largest resume upload accepted, in bytes
+CV_MAX_UPLOAD_BYTES = int(os.getenv("CV_MAX_UPLOAD_BYTES", str(10 * 1024 * 1024)))
+# Largest batch review upload (all files together) accepted, in bytes
+CV_BATCH_MAX_UPLOAD_BYTES = int(os.getenv("CV_BATCH_MAX_UPLOAD_BYTES", str(100 * 1024 * 1024)))
+UPLOAD_CHUNK_SIZE = 64 * 1024
+
+def _too_large(max_bytes: int) -> HTTPException:
+    return HTTPException(status_code=413, detail=f"Upload exceeds the {max_bytes / (1024 * 1024):.1f} MB limit")
+
+class UploadSizeLimitMiddleware:
+    """
+    Rejects request bodies over a size limit before they are parsed or spooled.
+    limits maps a path prefix to its maximum body size in bytes; the longest
+    matching prefix applies. Requests that
+    declare a larger Content-Length are refused right away; otherwise the body
+    is counted as it arrives and the request fails once it goes over.
+    """
+
+    def __init__(self, app, limits: Dict[str, int]):
+        self.app = app
+        self.limits = limits
+
+    def _limit(self, path: str):
+        matches = [prefix for prefix in self.limits if path.startswith(prefix)]
+        return self.limits[max(matches, key=len)] if matches else None
+
+    async def __call__(self, scope, receive, send):
+        max_bytes = self._limit(scope["path"]) if scope["type"] == "http" else None
+        if max_bytes is None:
+            await self.app(scope, receive, send)
+            return
+
+        content_length = dict(scope["headers"]).get(b"content-length")
+        if content_length and content_length.isdigit() and int(content_length) > max_bytes:
+            await self._reject(send, max_bytes)
+            return
+
+        received = 0
+
+        async def limited_receive():
+            nonlocal received
+            message = await receive()
+            if message["type"] == "http.request":
+                received += len(message.get("body", b""))
+                if received > max_bytes:
+                    # Raised inside body parsing; FastAPI turns it into the response
+                    raise _too_large(max_bytes)
+            return message
+
+        await self.app(scope, limited_receive, send)
+
+    async def _reject(self, send, max_bytes: int) -> None:
+        body = json.dumps({"detail": _too_large(max_bytes).detail}).encode()
+        await send({
+            "type": "http.response.start",
+            "status": 413,
+            "headers": [(b"content-type", b"application/json"), (b"content-length", str(len(body)).encode()),
+                        (b"connection", b"close")]
+        })
+        await send({"type": "http.response.body", "body": body})
+
+def spool_file(source: BinaryIO, filename: str, max_bytes: int = CV_MAX_UPLOAD_BYTES) -> Tuple[str, str]:
+    """
+    Copy a file object to a temporary file in chunks, without holding it in
+    memory. Returns its path and the SHA-256 of its content; the caller removes
+    the file when done. Raises HTTPException 413 once more than max_bytes have been copied.
+    """
+    suffix = os.path.splitext(filename or "")[1]
+    spooled = tempfile.NamedTemporaryFile(prefix="upload-", suffix=suffix, delete=False)
+    sha256 = hashlib.sha256()
+    size = 0
+    try:
+        with spooled:
+            while True:
+                chunk = source.read(UPLOAD_CHUNK_SIZE)
+                if not chunk:
+                    break
+                size += len(chunk)
+                if size > max_bytes:
+                    raise _too_large(max_bytes)
+                sha256.update(chunk)
+                spooled.write(chunk)
+    except BaseException:
+        os.unlink(spooled.name)
+        raise
+    return spooled.name, sha256.hexdigest()
+
+async def spool_upload(upload: UploadFile, max_bytes: int = CV_MAX_UPLOAD_BYTES) -> Tuple[str, str]:
+    """spool_file for an uploaded file, run off the event loop"""
+    await upload.seek(0)
+    return await run_in_threadpool(spool_file, upload.file, upload.filename, max_bytes)
+
+class _DiskSpooledMultiPartParser(MultiPartParser):
+    # Starlette keeps up to 1 MB of every uploaded file in memory; keep one chunk
+    # and write the rest to the file's temporary file
+    spool_max_size = UPLOAD_CHUNK_SIZE
+
+async def read_uploaded_files(request: Request, field: str, max_files: int) -> List[StarletteUploadFile]:
+    """
+    The files uploaded in a multipart field, parsed from the request stream as
+    it arrives. Only the first chunk of each file stays in memory, the rest is
+    written to its temporary file, so memory use doesn't grow with file size. Raises
+    HTTPException 400 as soon as the request contains more than max_files
+    files; the caller closes the returned files.
+    """
+    if not request.headers.get("content-type", "").startswith("multipart/form-data"):
+        raise HTTPException(status_code=400, detail="Expected a multipart/form-data upload")
+    parser = _DiskSpooledMultiPartParser(request.headers, request.stream(), max_files=max_files, max_fields=10)
+    try:
+        form = await parser.parse()
+    except MultiPartException as e:
+        raise HTTPException(status_code=400, detail=e.message)
+    files = []
+    for name, item in form.multi_items():
+        if isinstance(item, StarletteUploadFile):
+            if name == field:
+                files.append(item)
+            else:
+                await item.close()
+    if not files:
+        raise HTTPException(status_code=400, detail=f"No files uploaded in the '{field}' field")
+    return files
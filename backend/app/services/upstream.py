@@ -0,0 +1,110 @@
+import base64
+import hashlib
+import json
+import logging
+import os
+import random
+import time
+from typing import Any, Dict, Optional
+import requests
+from requests.structures import CaseInsensitiveDict
+from app.services import metrics
+
+logger = logging.getLogger(__name__)
+
+# Upstream HTTP mode:
+#   live   - talk to the real services (default)
+#   record - talk to the real services and save every response as a cassette
+#   replay - serve saved cassettes only, never touching the network
+UPSTREAM_MODE = os.getenv("UPSTREAM_MODE", "live").lower()
+UPSTREAM_CASSETTE_DIR = os.getenv("UPSTREAM_CASSETTE_DIR", "cassettes")
+
+# Replay tuning, so load tests can simulate slow or flaky upstreams
+UPSTREAM_REPLAY_LATENCY = float(os.getenv("UPSTREAM_REPLAY_LATENCY", "0"))  # seconds per call
+UPSTREAM_REPLAY_ERROR_RATE = float(os.getenv("UPSTREAM_REPLAY_ERROR_RATE", "0"))  # 0.0 - 1.0
+UPSTREAM_REPLAY_SEED = int(os.getenv("UPSTREAM_REPLAY_SEED", "0"))
+
+_replay_random = random.Random(UPSTREAM_REPLAY_SEED)
+
+def cassette_key(method: str, url: str, params: Optional[Dict[str, Any]] = None,
+                 data: Optional[Dict[str, Any]] = None) -> str:
+    """Identify a request by method, URL and body (headers are ignored)"""
+    parts = {
+        "method": method.upper(),
+        "url": url,
+        "params": params or {},
+        "data": data or {}
+    }
+    return hashlib.sha256(json.dumps(parts, sort_keys=True).encode('utf-8')).hexdigest()
+
+def _cassette_path(key: str) -> str:
+    return os.path.join(UPSTREAM_CASSETTE_DIR, f"{key}.json")
+
+def _save_cassette(key: str, method: str, url: str, response: requests.Response) -> None:
+    """Write a recorded response to the cassette directory"""
+    os.makedirs(UPSTREAM_CASSETTE_DIR, exist_ok=True)
+    cassette = {
+        "method": method.upper(),
+        "url": url,
+        "status_code": response.status_code,
+        "reason": response.reason,
+        "headers": dict(response.headers),
+        "body": base64.b64encode(response.content).decode('ascii')
+    }
+    with open(_cassette_path(key), 'w') as f:
+        json.dump(cassette, f)
+
+def _load_cassette(key: str, method: str, url: str) -> requests.Response:
+    """Build a response object from a recorded cassette"""
+    try:
+        with open(_cassette_path(key)) as f:
+            cassette = json.load(f)
+    except FileNotFoundError:
+        metrics.increment("upstream.replay_misses")
+        raise requests.exceptions.ConnectionError(f"No recorded response for {method.upper()} {url}")
+
+    response = requests.Response()
+    response.status_code = cassette["status_code"]
+    response.reason = cassette.get("reason")
+    response.headers = CaseInsensitiveDict(cassette.get("headers", {}))
+    response.url = url
+    response._content = base64.b64decode(cassette["body"])
+    response._content_consumed = True
+    response.encoding = requests.utils.get_encoding_from_headers(response.headers)
+    return response
+
+def request(method: str, url: str, **kwargs) -> requests.Response:
+    """
+    Perform an upstream HTTP request, honouring the record/replay mode.
+    Accepts the same arguments as requests.request.
+    """
+    if UPSTREAM_MODE == "live":
+        return requests.request(method, url, **kwargs)
+
+    key = cassette_key(method, url, kwargs.get("params"), kwargs.get("data"))
+
+    if UPSTREAM_MODE == "replay":
+        if UPSTREAM_REPLAY_LATENCY > 0:
+            time.sleep(UPSTREAM_REPLAY_LATENCY)
+        if UPSTREAM_REPLAY_ERROR_RATE > 0 and _replay_random.random() < UPSTREAM_REPLAY_ERROR_RATE:
+            metrics.increment("upstream.injected_errors")
+            raise requests.exceptions.ConnectionError(f"Injected upstream error for {method.upper()} {url}")
+        metrics.increment("upstream.replayed")
+        return _load_cassette(key, method, url)
+
+    # Record mode: read the whole body so it can be saved
+    response = requests.request(method, url, **kwargs)
+    try:
+        _save_cassette(key, method, url, response)
+        metrics.increment("upstream.recorded")
+    except OSError as e:
+        logger.warning(f"Failed to record upstream response for {url}: {e}")
+    return response
+
+def get(url: str, **kwargs) -> requests.Response:
+    """Upstream GET request"""
+    return request("GET", url, **kwargs)
+
+def post(url: str, **kwargs) -> requests.Response:
+    """Upstream POST request"""
+    return request("POST", url, **kwargs)
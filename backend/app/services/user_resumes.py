@@ -0,0 +1,77 @@
+import hashlib
+import logging
+from typing import Any, Dict, Optional
+from starlette.concurrency import run_in_threadpool
+from app.database import ResumeManager
+from app.services.cv_parser_pool import resume_parser
+from app.services.cv_service import ANALYZER_VERSION, UNSUPPORTED_FILE_MESSAGE
+from app.services.skill_taxonomy import get_taxonomy
+
+logger = logging.getLogger(__name__)
+
+resume_manager = ResumeManager()
+
+class UnsupportedResumeError(ValueError):
+    """The uploaded file is not a resume format that can be read"""
+
+def analysis_key() -> str:
+    """Identifies the analysis stored sections and skills come from; they are stale once it changes"""
+    return f"{ANALYZER_VERSION}-{get_taxonomy().digest}"
+
+def _analyze(text: str) -> Dict[str, Any]:
+    analysis = get_taxonomy().analyzer.analyze(text)
+    return {
+        "word_count": analysis["word_count"],
+        "sections": analysis["sections"],
+        "skills": analysis["skills"],
+        "analysis_key": analysis_key()
+    }
+
+def get_user_resume(user_id: int, include_text: bool = False) -> Optional[Dict[str, Any]]:
+    """
+    The latest resume a user uploaded, or None. Sections and skills analyzed
+    with an older analyzer or skill taxonomy are refreshed from the stored
+    text, so the document itself is never parsed again.
+    """
+    resume = resume_manager.get_resume(user_id, include_text)
+    if resume is None or resume["analysis_key"] == analysis_key():
+        return resume
+
+    if not include_text:
+        resume = resume_manager.get_resume(user_id)
+    analysis = _analyze(resume["text"])
+    resume_manager.update_analysis(user_id, analysis["word_count"], analysis["sections"], analysis["skills"],
+                                   analysis["analysis_key"])
+    resume.update(analysis)
+    if not include_text:
+        del resume["text"]
+    return resume
+
+async def store_user_resume(user_id: int, path: str, sha256: str, filename: str) -> Dict[str, Any]:
+    """
+    Make a spooled upload the user's resume and return it without its text.
+    Work is skipped where the stored version already covers it: the same file
+    uploaded again is not parsed at all, and a file whose text did not change
+    (e.g. the same resume exported again) is not re-analyzed or rewritten.
+    The result's status is "unchanged", "text_unchanged" or "updated".
+    """
+    stored = await run_in_threadpool(get_user_resume, user_id)
+    if stored is not None and stored["content_hash"] == sha256 and stored["filename"] == filename:
+        return dict(stored, status="unchanged")
+
+    text = await resume_parser.extract_text(path, filename)
+    if text is None:
+        raise UnsupportedResumeError(UNSUPPORTED_FILE_MESSAGE)
+    text_hash = hashlib.sha256(text.encode('utf-8', 'surrogatepass')).hexdigest()
+
+    if stored is not None and stored["text_hash"] == text_hash:
+        await run_in_threadpool(resume_manager.update_source, user_id, filename, sha256)
+        return dict(stored, filename=filename, content_hash=sha256, status="text_unchanged")
+
+    analysis = await run_in_threadpool(_analyze, text)
+    resume = {"filename": filename, "content_hash": sha256, "text_hash": text_hash, "text": text, **analysis}
+    await run_in_threadpool(resume_manager.store_resume, user_id, resume)
+    logger.info(f"Stored resume {filename} of user {user_id} ({analysis['word_count']} words)")
+
+    stored = await run_in_threadpool(get_user_resume, user_id)
+    return dict(stored, status="updated")
@@ -0,0 +1,84 @@
+"""
+Benchmark of resume parsing under concurrent uploads: parsed on the event
+loop, as before, against the worker process pool.
+
+Uploads a batch of distinct many-page PDFs to /api/cv-review/ at once, with
+the page and text caps lifted, while polling /api/metrics/ to see how long
+other requests wait. The inline baseline replaces the pool with a parser
+that calls parse_resume directly in the request. Run from the backend directory:
+
+    python benchmarks/cv_parse_pool.py [uploads] [pages]
+"""
+import asyncio
+import logging
+import os
+import sys
+import tempfile
+import time
+
+# Read every page, allow the whole batch to wait for a worker, and keep the app's tables out of job_tracker.db
+os.environ["CV_MAX_PAGES"] = "100000"
+os.environ["CV_MAX_TEXT_CHARS"] = str(10 ** 8)
+os.environ.setdefault("CV_PARSE_TIMEOUT", "600")
+os.environ["DATABASE_PATH"] = os.path.join(tempfile.mkdtemp(prefix="cv-parse-pool-"), "job_tracker.db")
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import httpx
+from app.main import app
+from app.services import cv_results, cv_service
+from app.services.cv_parser_pool import ResumeParserPool
+from benchmarks.upload_memory import make_pdf
+
+class InlineParser:
+    """The old review path: the resume is parsed in the request, on the event loop"""
+
+    async def parse(self, path: str, filename: str, structured_only: bool = False) -> dict:
+        return cv_service.parse_resume(path, filename, structured_only=structured_only)
+
+def percentile(values: list, fraction: float) -> float:
+    values = sorted(values)
+    return values[min(len(values) - 1, int(len(values) * fraction))]
+
+async def run(documents: list) -> tuple:
+    """Upload all documents at once; returns docs/s and the /api/metrics latencies in ms"""
+    latencies = []
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://testserver", timeout=None) as client:
+        done = asyncio.Event()
+
+        async def probe():
+            while not done.is_set():
+                start = time.perf_counter()
+                await client.get("/api/metrics/")
+                latencies.append((time.perf_counter() - start) * 1000)
+                await asyncio.sleep(0.02)
+
+        async def upload(i: int, pdf: bytes):
+            response = await client.post("/api/cv-review/", files={"file": (f"cv-{i}.pdf", pdf, "application/pdf")})
+            assert response.status_code == 200, response.text[:200]
+
+        probing = asyncio.create_task(probe())
+        start = time.perf_counter()
+        await asyncio.gather(*(upload(i, pdf) for i, pdf in enumerate(documents)))
+        elapsed = time.perf_counter() - start
+        done.set()
+        await probing
+    return len(documents) / elapsed, latencies
+
+def main(uploads: int, pages: int) -> None:
+    logging.getLogger("httpx").setLevel(logging.WARNING)
+    pool = ResumeParserPool(max_pending=uploads)
+    size = len(make_pdf(pages)) / 1024
+    print(f"{uploads} concurrent uploads of a {pages}-page PDF ({size:.0f} KB), "
+          f"{pool.workers} parser workers, {os.cpu_count()} CPUs:")
+    for name, parser in (("inline, on the event loop", InlineParser()), ("worker process pool", pool)):
+        cv_results.resume_parser = parser
+        cv_results.resume_results = cv_results.ResumeResultCache()
+        documents = [make_pdf(pages, tag=f"{name} {i}") for i in range(uploads)]
+        rate, latencies = asyncio.run(run(documents))
+        print(f"  {name:26} {rate:5.2f} docs/s; /api/metrics p99 {percentile(latencies, 0.99):7.0f} ms, "
+              f"max {max(latencies):7.0f} ms over {len(latencies)} requests")
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 8, int(sys.argv[2]) if len(sys.argv) > 2 else 200)
@@ -0,0 +1,125 @@
+"""
+Benchmark of the paragraph-cached grammar check against checking the whole text.
+
+A cover letter is checked once, then again after each of a series of edits
+to one sentence, as a user fixing their text would. LanguageTool is replaced
+by a local fake that flags a few misspellings and sleeps for a modelled
+round trip (150 ms plus 0.05 ms per character), so upstream time is modelled,
+not measured against the real service. Bytes are counted as the fake
+receives them. Run from the backend directory:
+
+    python benchmarks/grammar_check.py [edits]
+"""
+import json
+import os
+import re
+import sys
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.services import grammar_service
+from app.services.grammar_service import check_grammar, format_grammar_suggestions, _request_check
+
+ROUND_TRIP_SECONDS = 0.150
+SECONDS_PER_CHAR = 0.00005
+MISSPELLINGS = {"teh": "the", "recieve": "receive", "sucessful": "successful"}
+
+PARAGRAPHS = [
+    "Dear Hiring Manager,",
+    "I am writing to apply for the Senior Backend Engineer position at your company, which I found on your "
+    "careers page. With seven years of experience building reliable web services, I believe I would be a "
+    "strong addition to teh platform team.",
+    "In my current role at Acme, I lead a team of five engineers responsible for the payment APIs. Over the "
+    "last two years we moved the service from a monolith to a set of smaller services, cut the p99 latency "
+    "by 40% and brought the error rate below 0.1%.",
+    "Before that, I worked at a startup where I built the data pipeline that ingested events from our mobile "
+    "apps. It processed more than ten million events per day and was the basis of every report teh company "
+    "relied on.",
+    "I enjoy working closely with product managers and designers. I believe good software comes from "
+    "understanding the problem first, and I try to keep a short feedback loop with the people who use it.",
+    "I am also an active open source contributor. I maintain a small library for rate limiting in Python and "
+    "regularly send patches to the web framework we use at work.",
+    "Your focus on developer tooling is what attracted me most. I have followed your engineering blog for "
+    "years, and your posts on incremental builds changed how my team works.",
+    "I would recieve any feedback on my application gladly, and I am happy to share code samples or walk "
+    "you through past projects in more detail.",
+    "I am available for an interview at your convenience and could start within a month of an offer.",
+    "Thank you for considering my application. I look forward to hearing from you.",
+    "Best regards,\nJane Doe",
+]
+
+class FakeLanguageTool:
+    """Local stand-in for LanguageTool that records what it is sent"""
+
+    def __init__(self):
+        self.bytes_received = 0
+        self.requests = 0
+        fake = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_POST(self):
+                body = self.rfile.read(int(self.headers["Content-Length"]))
+                text = parse_qs(body.decode(), keep_blank_values=True)["text"][0]
+                fake.bytes_received += len(body)
+                fake.requests += 1
+                time.sleep(ROUND_TRIP_SECONDS + SECONDS_PER_CHAR * len(text))
+                response = json.dumps({"matches": [
+                    {"offset": match.start(), "length": len(match.group()), "message": "Possible spelling mistake",
+                     "replacements": [{"value": MISSPELLINGS[match.group()]}]}
+                    for match in re.finditer("|".join(MISSPELLINGS), text)
+                ]}).encode()
+                self.send_response(200)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(response)))
+                self.end_headers()
+                self.wfile.write(response)
+
+            def log_message(self, format, *args):
+                pass
+
+        self.server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        self.url = f"http://127.0.0.1:{self.server.server_port}/"
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+
+def whole_text_check(text: str) -> dict:
+    """The old check: the whole text in one request, every time"""
+    return format_grammar_suggestions(text, _request_check(grammar_service.LANGUAGETOOL_ENDPOINT,
+                                                           {"text": text, "language": "en-US"}))
+
+def versions(edits: int) -> list:
+    """The letter, then the letter after each edit of one sentence"""
+    texts = ["\n".join(PARAGRAPHS)]
+    for i in range(edits):
+        paragraphs = list(PARAGRAPHS)
+        paragraphs[4] = paragraphs[4].replace("short feedback loop", f"short feedback loop ({i + 1} days)")
+        texts.append("\n".join(paragraphs))
+    return texts
+
+def run(check, texts: list, fake: FakeLanguageTool) -> tuple:
+    fake.bytes_received = fake.requests = 0
+    start = time.perf_counter()
+    results = [check(text) for text in texts]
+    elapsed_ms = (time.perf_counter() - start) / len(texts) * 1000
+    return fake.bytes_received, fake.requests, elapsed_ms, results
+
+def main(edits: int) -> None:
+    fake = FakeLanguageTool()
+    grammar_service.LANGUAGETOOL_ENDPOINT = fake.url
+    texts = versions(edits)
+
+    old_bytes, old_requests, old_ms, old = run(whole_text_check, texts, fake)
+    new_bytes, new_requests, new_ms, new = run(check_grammar, texts, fake)
+
+    print(f"cover letter of {len(texts[0])} characters in {len(PARAGRAPHS)} paragraphs, "
+          f"checked {len(texts)} times ({edits} edits of one sentence)")
+    print(f"  whole text      {old_bytes:7} bytes sent, {old_requests:3} requests, {old_ms:6.0f} ms/check")
+    print(f"  by paragraph    {new_bytes:7} bytes sent, {new_requests:3} requests, {new_ms:6.0f} ms/check")
+    print(f"  bytes saved: {1 - new_bytes / old_bytes:.0%}, same suggestions: {old == new}")
+    fake.server.shutdown()
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 20)
@@ -0,0 +1,78 @@
+"""
+Benchmark of the job listing payload: every field against the compact view.
+
+Serves a page of synthetic Himalayas-shaped jobs, each with a long HTML
+description, through a replayed upstream cassette, and measures the size of
+/api/jobs for fields=*, the default compact view and a short field list,
+uncompressed and gzipped by the app. The synthetic descriptions compress
+better than real text would. Run from the backend directory:
+
+    python benchmarks/job_payload.py [jobs] [description KB]
+"""
+import base64
+import json
+import logging
+import os
+import random
+import sys
+import tempfile
+
+# Replay the upstream from a temporary cassette, and keep the app's tables out of job_tracker.db
+_workdir = tempfile.mkdtemp(prefix="job-payload-")
+os.environ["UPSTREAM_MODE"] = "replay"
+os.environ["UPSTREAM_CASSETTE_DIR"] = _workdir
+os.environ["DATABASE_PATH"] = os.path.join(_workdir, "job_tracker.db")
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from fastapi.testclient import TestClient
+from app.main import app
+from app.services import upstream
+
+SKILLS = ["Python", "Django", "PostgreSQL", "Docker", "Kubernetes", "AWS", "React", "TypeScript", "Redis", "Kafka"]
+WORDS = ("we build reliable services for customers around the world and care about quality "
+         "ownership testing mentoring and shipping small changes often").split()
+
+def make_job(rng: random.Random, i: int, description_kb: int) -> dict:
+    paragraphs = []
+    while sum(len(p) for p in paragraphs) < description_kb * 1024:
+        words = rng.choices(WORDS, k=40) + rng.sample(SKILLS, 3)
+        rng.shuffle(words)
+        paragraphs.append(f"<p>{' '.join(words)}.</p>")
+    return {
+        "guid": f"https://himalayas.app/jobs/{i}", "title": f"Senior Engineer {i}", "companyName": f"Company {i}",
+        "companyLogo": f"https://cdn.himalayas.app/logos/{i}.png", "excerpt": " ".join(rng.choices(WORDS, k=25)),
+        "description": "<div>" + "".join(paragraphs) + "</div>",
+        "applicationLink": f"https://himalayas.app/jobs/{i}/apply", "pubDate": 1760000000 + i,
+        "expiryDate": 1770000000, "employmentType": "Full Time", "seniority": ["Senior"],
+        "locationRestrictions": [{"name": "Germany"}, {"name": "France"}], "timezoneRestrictions": [1, 2],
+        "categories": ["Engineering", "Backend"], "minSalary": 90000, "maxSalary": 130000, "currency": "EUR"
+    }
+
+def record_page(jobs: list) -> None:
+    url = f"https://himalayas.app/jobs/api/?limit={len(jobs)}&offset=0"
+    cassette = {"method": "GET", "url": url, "status_code": 200, "reason": "OK",
+                "headers": {"Content-Type": "application/json"},
+                "body": base64.b64encode(json.dumps({"jobs": jobs}).encode()).decode()}
+    with open(os.path.join(_workdir, upstream.cassette_key("GET", url) + ".json"), "w") as f:
+        json.dump(cassette, f)
+
+def main(count: int, description_kb: int) -> None:
+    logging.getLogger("httpx").setLevel(logging.WARNING)
+    rng = random.Random(5)
+    record_page([make_job(rng, i, description_kb) for i in range(count)])
+
+    views = [("fields=*", "*"), ("default compact view", None),
+             ("fields=title,companyName,location,salary", "title,companyName,location,salary")]
+    print(f"/api/jobs?limit={count}, descriptions of about {description_kb} KB:")
+    with TestClient(app) as client:
+        for name, fields in views:
+            params = {"limit": count, **({"fields": fields} if fields else {})}
+            raw = client.get("/api/jobs/", params=params, headers={"Accept-Encoding": "identity"})
+            gzipped = client.get("/api/jobs/", params=params, headers={"Accept-Encoding": "gzip"})
+            assert raw.status_code == 200 and len(raw.json()["jobs"]) == count, raw.text[:200]
+            assert gzipped.headers.get("content-encoding") == "gzip"
+            print(f"  {name:42} {len(raw.content):9,} B raw {int(gzipped.headers['content-length']):9,} B gzip")
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 25, int(sys.argv[2]) if len(sys.argv) > 2 else 10)
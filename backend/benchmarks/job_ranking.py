@@ -0,0 +1,62 @@
+"""
+Benchmark of the TF-IDF job relevance index behind /api/cv-review/match.
+
+Adds synthetic jobs whose words follow a Zipf distribution to an empty
+index, then times ranking synthetic resumes against it. The index size
+counts the postings arrays and the term dictionary, not the jobs, which the
+job store holds anyway. Run from the backend directory:
+
+    python benchmarks/job_ranking.py [jobs ...]
+"""
+import itertools
+import os
+import random
+import statistics
+import sys
+import tempfile
+import time
+
+# Keep the tables created on import out of job_tracker.db
+os.environ["DATABASE_PATH"] = os.path.join(tempfile.mkdtemp(prefix="job-ranking-"), "job_tracker.db")
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.services.job_ranking import JobRelevanceIndex
+
+VOCABULARY = [f"term{i}" for i in range(50000)]
+# Cumulative Zipf weights (s = 1.1) over the vocabulary, most frequent first
+ZIPF = list(itertools.accumulate(1 / (rank ** 1.1) for rank in range(1, len(VOCABULARY) + 1)))
+
+def make_text(rng: random.Random, words: int) -> str:
+    return " ".join(rng.choices(VOCABULARY, cum_weights=ZIPF, k=words))
+
+def index_size(index: JobRelevanceIndex) -> int:
+    """Bytes held by the postings: arrays, their tuples, the term strings and the dictionary"""
+    size = sys.getsizeof(index._postings)
+    for term, (slots, weights) in index._postings.items():
+        size += sys.getsizeof(term) + sys.getsizeof((slots, weights)) + sys.getsizeof(slots) + sys.getsizeof(weights)
+    return size
+
+def main(sizes: list, queries: int = 50, seed: int = 13) -> None:
+    rng = random.Random(seed)
+    resumes = [make_text(rng, 400) for _ in range(queries)]
+    print(f"Zipf corpus over {len(VOCABULARY)} terms, jobs of about 300 words, resumes of 400 words:")
+    for size in sizes:
+        jobs = [{"id": f"job-{i}", "title": make_text(rng, 4), "clean_description": make_text(rng, 300),
+                 "categories": ["Engineering"]} for i in range(size)]
+        index = JobRelevanceIndex()
+        start = time.perf_counter()
+        for job in jobs:
+            index.job_added(job)
+        ingest_ms = (time.perf_counter() - start) * 1000 / size
+
+        times = []
+        for resume in resumes:
+            start = time.perf_counter()
+            index.rank(resume, limit=10)
+            times.append((time.perf_counter() - start) * 1000)
+        print(f"  {size:7,} jobs: ingest {ingest_ms:.2f} ms/job, index {index_size(index) / (1024 * 1024):5.1f} MB, "
+              f"rank p50 {statistics.median(times):6.1f} ms, max {max(times):6.1f} ms")
+
+if __name__ == "__main__":
+    main([int(arg) for arg in sys.argv[1:]] or [10000, 100000])
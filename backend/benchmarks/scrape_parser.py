@@ -0,0 +1,114 @@
+"""
+Benchmark of the streaming job page parser against the code it replaced.
+
+The old scraper downloaded the whole page, built a BeautifulSoup tree with
+html.parser and kept the first 2000 characters of the description; it is
+reproduced below as the baseline, and skipped when beautifulsoup4 (no longer
+a requirement) is not installed. The synthetic pages are about 1.2 MB, with
+a large inline script and stylesheet, a long nav and footers, and the
+description near the top, far down the page, far down after a lower-priority
+.content element, or past the 1 MB read cap. The last two show where the
+streaming parser gives a different text by design. Run from the backend directory:
+
+    python benchmarks/scrape_parser.py [repeats]
+"""
+import os
+import random
+import re
+import sys
+import tempfile
+import time
+import tracemalloc
+
+# Keep the scrape cache's tables out of job_tracker.db
+os.environ["DATABASE_PATH"] = os.path.join(tempfile.mkdtemp(prefix="scrape-parser-"), "job_tracker.db")
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.services.scrape_parser import read_job_description
+from app.services.skill_service import SCRAPE_CHUNK_SIZE, SCRAPE_DESCRIPTION_CHARS, SCRAPE_MAX_BYTES
+
+try:
+    from bs4 import BeautifulSoup
+except ImportError:
+    BeautifulSoup = None
+
+WORDS = ("we are hiring engineers to build python services on aws with docker and "
+         "kubernetes and to mentor the team and own delivery").split()
+
+def make_page(rng: random.Random, description_at: int, sidebar: bool = False) -> bytes:
+    """A page of about 1.2 MB with the description about description_at KB in, after a .content sidebar if asked"""
+    def text(words: int) -> str:
+        return " ".join(rng.choices(WORDS, k=words))
+
+    script = "<script>var data = [" + ",".join(str(rng.random()) for _ in range(8000)) + "];</script>"
+    style = "<style>" + "".join(f".c{i} {{ margin: {i % 17}px; color: #{i % 4096:03x}; }}\n" for i in range(3000)) + "</style>"
+    nav = "<nav>" + "".join(f'<a href="/jobs/{i}">{text(4)}</a>' for i in range(800)) + "</nav>"
+    description = '<div class="job-description">' + "".join(f"<p>{text(60)}</p>" for _ in range(10)) + "</div>"
+    footer = "<footer><ul>" + "".join(f"<li>{text(8)}</li>" for _ in range(200)) + "</ul></footer>"
+    page = f'<!DOCTYPE html><html><head><meta charset="utf-8"><title>Job</title>{style}{script}</head><body>{nav}'
+    if sidebar:
+        page += '<aside class="content">' + "".join(f"<p>{text(30)}</p>" for _ in range(20)) + "</aside>"
+    while len(page) < description_at * 1024:
+        page += footer
+    page += description
+    while len(page) < 1200 * 1024:
+        page += footer
+    return (page + "</body></html>").encode("utf-8")
+
+def old_parse(html: bytes) -> str:
+    """The BeautifulSoup extraction the streaming parser replaced"""
+    soup = BeautifulSoup(html, 'html.parser')
+    description_selectors = ['.job-description', '.description', '.job-content', '.content',
+                             '[data-testid="job-description"]', '.job-detail', '.posting-content']
+    description_text = ""
+    for selector in description_selectors:
+        element = soup.select_one(selector)
+        if element:
+            description_text = element.get_text()
+            break
+    if not description_text:
+        body = soup.find('body')
+        if body:
+            description_text = body.get_text()
+    description_text = re.sub(r'\s+', ' ', description_text).strip()
+    return description_text[:2000]
+
+def new_parse(html: bytes):
+    chunks = (html[i:i + SCRAPE_CHUNK_SIZE] for i in range(0, len(html), SCRAPE_CHUNK_SIZE))
+    return read_job_description(chunks, max_bytes=SCRAPE_MAX_BYTES, max_chars=SCRAPE_DESCRIPTION_CHARS)
+
+def measure(parse, html: bytes, repeats: int):
+    """Best time in ms, peak Python heap in KB and the result of parse(html)"""
+    times = []
+    for _ in range(repeats):
+        start = time.perf_counter()
+        result = parse(html)
+        times.append((time.perf_counter() - start) * 1000)
+    tracemalloc.start()
+    parse(html)
+    peak = tracemalloc.get_traced_memory()[1] / 1024
+    tracemalloc.stop()
+    return min(times), peak, result
+
+def main(repeats: int) -> None:
+    rng = random.Random(11)
+    if BeautifulSoup is None:
+        print("beautifulsoup4 is not installed; only the streaming parser is measured")
+    layouts = [("near the top", 0, False), ("at 900 KB", 900, False),
+               ("at 900 KB, after a .content sidebar", 900, True), ("past the 1 MB cap", 1150, False)]
+    for name, description_at, sidebar in layouts:
+        html = make_page(rng, description_at, sidebar)
+        new_ms, new_kb, (text, bytes_read) = measure(new_parse, html, repeats)
+        print(f"description {name}, {len(html) / 1024:.0f} KB page:")
+        if BeautifulSoup is not None:
+            old_ms, old_kb, old_text = measure(old_parse, html, repeats)
+            print(f"  old BeautifulSoup     {old_ms:7.1f} ms {old_kb:8.0f} KB heap {len(html) / 1024:6.0f} KB read")
+        print(f"  read_job_description  {new_ms:7.1f} ms {new_kb:8.0f} KB heap {bytes_read / 1024:6.0f} KB read")
+        if BeautifulSoup is not None:
+            print(f"  same text: {text == old_text}")
+    print("After a sidebar, the streaming parser keeps the .content text once 64 KB have passed without a better "
+          "match; past the cap, it falls back to the body text read so far. The old code read the whole page.")
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 5)
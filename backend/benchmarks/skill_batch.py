@@ -0,0 +1,55 @@
+"""
+Benchmark of batch skill extraction: inline against the process pool.
+
+Matches synthetic job descriptions in the calling process, then over a pool
+of spawned workers for each worker count, the way extract_skills_batch does
+(chunks of SKILL_BATCH_CHUNK_SIZE texts, text_analyzer.extract_chunk). The
+skill cache is bypassed so only matching is timed. Worker counts above the
+number of CPUs can't scale. Run from the backend directory:
+
+    python benchmarks/skill_batch.py [texts] [worker counts, e.g. 1,2,4]
+"""
+import multiprocessing
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.services import text_analyzer
+from app.services.skill_service import SKILL_BATCH_CHUNK_SIZE
+from app.services.skill_taxonomy import get_taxonomy
+from benchmarks.skill_matcher import make_texts
+
+def in_pool(taxonomy, texts: list, workers: int) -> tuple:
+    """Seconds to match texts over a fresh pool (startup excluded), and the results"""
+    pool = ProcessPoolExecutor(max_workers=workers, mp_context=multiprocessing.get_context("spawn"),
+                               initializer=text_analyzer.init_worker,
+                               initargs=(taxonomy.matcher.to_artifact(),))
+    with pool:
+        # Start every worker before timing
+        list(pool.map(text_analyzer.extract_chunk, [texts[:1]] * workers))
+        chunks = [texts[i:i + SKILL_BATCH_CHUNK_SIZE] for i in range(0, len(texts), SKILL_BATCH_CHUNK_SIZE)]
+        start = time.perf_counter()
+        results = [skills for chunk in pool.map(text_analyzer.extract_chunk, chunks) for skills in chunk]
+        return time.perf_counter() - start, results
+
+def main(count: int, worker_counts: list) -> None:
+    taxonomy = get_taxonomy()
+    texts = make_texts(sorted(taxonomy.matcher.terms), count)
+
+    start = time.perf_counter()
+    inline = [taxonomy.analyzer.extract_skills(text) for text in texts]
+    inline_seconds = time.perf_counter() - start
+
+    print(f"{count} texts, {os.cpu_count()} CPUs")
+    print(f"  inline            {inline_seconds:6.2f} s {count / inline_seconds:8.0f} texts/s")
+    for workers in worker_counts:
+        seconds, results = in_pool(taxonomy, texts, workers)
+        print(f"  pool, {workers:2} workers  {seconds:6.2f} s {count / seconds:8.0f} texts/s "
+              f"({inline_seconds / seconds:.2f}x inline), same results: {results == inline}")
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 20000,
+         [int(n) for n in sys.argv[2].split(",")] if len(sys.argv) > 2 else [1, 2, 4])
@@ -0,0 +1,89 @@
+"""
+Benchmark of the one-pass skill matcher against the per-term search it replaced.
+
+The old extractor ran one \\b-anchored regex per skill and abbreviation over
+each text; it is reproduced below as the baseline, over the same taxonomy
+terms. Texts are synthetic HTML job descriptions. Results must agree except
+for terms that start or end with punctuation, which \\b could not match
+("c++", "c#"). Run from the backend directory:
+
+    python benchmarks/skill_matcher.py [texts]
+"""
+import os
+import random
+import re
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.services.skill_matcher import SkillMatcher
+from app.services.skill_taxonomy import get_taxonomy
+
+SENTENCES = [
+    "We are looking for an engineer to join our platform team.",
+    "You will design, build and operate services used by millions of customers.",
+    "Experience with {} and {} is required; {} is a plus.",
+    "Our stack: {}, {}, {} and {} running in the cloud.",
+    "You care about testing, code review and clear documentation.",
+    "Bonus points for open source contributions in {} or {}.",
+    "Competitive salary, remote-friendly, 30 days of vacation.",
+]
+
+def make_texts(terms: list, count: int, seed: int = 11) -> list:
+    rng = random.Random(seed)
+    texts = []
+    for _ in range(count):
+        paragraphs = []
+        while sum(len(p) for p in paragraphs) < 2200:
+            sentence = rng.choice(SENTENCES)
+            words = [rng.choice(terms) if rng.random() < 0.8 else rng.choice(terms).upper()
+                     for _ in range(sentence.count("{}"))]
+            paragraphs.append(f"<p>{sentence.format(*words)}</p>")
+        texts.append("<div>" + "\n".join(paragraphs) + "</div>")
+    return texts
+
+def old_extract(terms: dict, text: str) -> list:
+    """The old extractor: one regex search per term"""
+    text_clean = re.sub(r'<[^>]+>', ' ', text.lower())
+    found = set()
+    for term, skill in terms.items():
+        if re.search(r'\b' + re.escape(term) + r'\b', text_clean):
+            found.add(skill)
+    return sorted(found)
+
+def timed(fn, texts) -> tuple:
+    fn(texts[0])
+    start = time.perf_counter()
+    results = [fn(text) for text in texts]
+    return (time.perf_counter() - start) / len(texts) * 1000, results
+
+def main(count: int) -> None:
+    taxonomy = get_taxonomy()
+    terms = taxonomy.matcher.terms
+    texts = make_texts(sorted(terms), count)
+
+    start = time.perf_counter()
+    matcher = SkillMatcher(terms)
+    build_ms = (time.perf_counter() - start) * 1000
+
+    old_ms, old = timed(lambda text: old_extract(terms, text), texts)
+    new_ms, new = timed(matcher.extract, texts)
+    analyzer_ms, analyzed = timed(taxonomy.analyzer.extract_skills, texts)
+
+    # Skills only the new matcher can find: those whose terms \b could not delimit
+    punctuated = {skill for term, skill in terms.items() if not re.fullmatch(r'\w(.*\w)?', term)}
+    differences = [(set(n) ^ set(o)) for o, n in zip(old, new)]
+    explained = all(difference <= punctuated for difference in differences)
+
+    size = sum(len(text) for text in texts) / len(texts) / 1024
+    print(f"{count} texts, {size:.1f} KB on average, {len(terms)} terms; matcher built in {build_ms:.0f} ms")
+    print(f"  old per-term search       {old_ms:6.2f} ms/text")
+    print(f"  SkillMatcher.extract      {new_ms:6.2f} ms/text ({old_ms / new_ms:.0f}x)")
+    print(f"  TextAnalyzer.extract      {analyzer_ms:6.2f} ms/text ({old_ms / analyzer_ms:.0f}x)")
+    print(f"  matcher and analyzer agree: {new == analyzed}")
+    print(f"  texts that differ from the old search: {sum(map(bool, differences))}, "
+          f"all in punctuated terms ({', '.join(sorted(punctuated))}): {explained}")
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 200)
@@ -0,0 +1,123 @@
+"""
+Benchmark of the resume text analysis against the code it replaced.
+
+The old code checked each section with its own regex, searched for action
+verbs and numbers separately, and extracted skills with a second scan over
+one alternation of every skill term. Both are reproduced below as the
+baseline. Run from the backend directory:
+
+    python benchmarks/text_analysis.py [resumes]
+"""
+import os
+import random
+import re
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.services.cv_service import parse_resume
+from app.services.skill_matcher import _LEFT_BOUNDARY, _term_pattern
+from app.services.skill_taxonomy import get_taxonomy
+from app.services.text_analyzer import SECTION_HEADINGS
+
+LINES = [
+    "Contact Information", "jane@example.com | +1 555 0100 | Berlin", "Summary",
+    "Backend engineer with 7 years of experience building APIs in Python and Go.",
+    "Work Experience", "Senior Engineer, Acme (2019-2024)",
+    "- Led a team of 5 engineers; increased throughput by 40%",
+    "- Developed data pipelines with Spark, Airflow and Kafka on AWS",
+    "- Managed a $200,000 cloud budget and reduced costs by 25%",
+    "- Built React and TypeScript dashboards used by 10,000 customers",
+    "Education", "MSc Computer Science, TU Berlin", "Skills",
+    "Python, Go, SQL, PostgreSQL, Docker, Kubernetes, Terraform, C++17, C#, Node.js, CI/CD",
+    "Projects", "Open source contributor to FastAPI and Django REST framework",
+    "Raised US$500k in seed funding; 5 Years of mentoring, 3 years on call, 12,5% churn"
+]
+FILLER = ("responsible for the design and delivery of reliable services across several "
+          "teams and time zones with a focus on quality").split()
+
+def make_resumes(count: int, seed: int = 3) -> list:
+    rng = random.Random(seed)
+    resumes = []
+    for i in range(count):
+        body = list(LINES)
+        for _ in range(rng.randint(10, 60)):
+            body.insert(rng.randint(1, len(body)), " ".join(rng.choices(FILLER, k=rng.randint(8, 20))))
+        if i % 3 == 0:
+            body = [line for line in body if line not in ("Summary", "Projects")]
+        if i % 5 == 0:
+            body = [line.replace("Led", "Ran").replace("increased", "raised") for line in body]
+        resumes.append("\n".join(body))
+    return resumes
+
+def old_checks(text: str) -> dict:
+    """The text checks of the old parse_resume"""
+    word_count = len(text.split())
+    text_lower = text.lower()
+    found = [section for section in SECTION_HEADINGS
+             if re.search(r"\b" + re.escape(section.lower()) + r"\b", text_lower)]
+    return {
+        "word_count": word_count,
+        "sections": found,
+        "has_verbs": bool(re.search(r'\b(achieved|increased|improved|managed|led|developed|created)\b', text.lower())),
+        "has_numbers": bool(re.search(r'\d+%|\$\d+|\d+,\d+|\d+ years?', text)),
+        "lines": len(text.split('\n'))
+    }
+
+def old_numbers(text: str) -> list:
+    """Every match of the old number check, with its offset"""
+    return [(match.group(), match.start()) for match in re.finditer(r'\d+%|\$\d+|\d+,\d+|\d+ years?', text)]
+
+def old_skill_pattern(terms: dict):
+    """The old skill matcher: one alternation of every term, longest first"""
+    ordered = sorted(terms, key=lambda term: (-len(term), term))
+    return re.compile(_LEFT_BOUNDARY + '(' + '|'.join(_term_pattern(term) for term in ordered) + ')')
+
+def old_skills(pattern, matcher, text: str) -> list:
+    skills = set()
+    for term in set(pattern.findall(re.sub(r'<[^>]+>', ' ', text.lower()))):
+        skills |= matcher.skills_for(term)
+    return sorted(skills)
+
+def timed(fn, texts, repeat: int = 5):
+    fn(texts[0])
+    start = time.perf_counter()
+    for _ in range(repeat):
+        results = [fn(text) for text in texts]
+    return (time.perf_counter() - start) / (len(texts) * repeat) * 1e6, results
+
+def main(count: int) -> None:
+    resumes = make_resumes(count)
+    taxonomy = get_taxonomy()
+    analyzer = taxonomy.analyzer
+    pattern = old_skill_pattern(taxonomy.matcher.terms)
+
+    checks_us, checks = timed(old_checks, resumes)
+    old_skills_us, skills = timed(lambda text: old_skills(pattern, taxonomy.matcher, text), resumes)
+    analyze_us, analyses = timed(analyzer.analyze, resumes)
+    extract_us, extracted = timed(analyzer.extract_skills, resumes)
+    review_us, _ = timed(lambda text: parse_resume(text.encode(), "cv.txt", structured_only=True), resumes)
+
+    same = all(
+        check["sections"] == list(analysis["sections"])
+        and check["has_verbs"] == bool(analysis["action_verbs"])
+        and check["has_numbers"] == bool(analysis["quantified"])
+        and old_numbers(text) == analysis["quantified"]
+        and check["word_count"] == analysis["word_count"]
+        and old == analysis["skills"] == new
+        for text, check, old, analysis, new in zip(resumes, checks, skills, analyses, extracted)
+    )
+
+    words = sum(check["word_count"] for check in checks) / len(checks)
+    print(f"{count} resumes, {words:.0f} words on average, microseconds per resume:")
+    print(f"  old section, verb and number checks  {checks_us:8.0f}")
+    print(f"  old skill extraction                 {old_skills_us:8.0f}")
+    print(f"  old total                            {checks_us + old_skills_us:8.0f}")
+    print(f"  TextAnalyzer.analyze (all of it)     {analyze_us:8.0f}")
+    print(f"  TextAnalyzer.extract_skills          {extract_us:8.0f}")
+    print(f"  parse_resume, structured only        {review_us:8.0f}")
+    print(f"  same results: {same}")
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 200)
@@ -0,0 +1,156 @@
+"""
+Benchmark of the memory used by a large resume upload: read into memory and
+sent to the parser worker, as before, against spooled to disk and opened by
+the worker.
+
+Starts the app with uvicorn in a child process, with an extra route that
+reproduces the old endpoint, streams a large PDF to each endpoint and reads
+the peak RSS (VmHWM) of the server and of its parser worker from /proc,
+after resetting it with clear_refs. Linux only. Run from the backend directory:
+
+    python benchmarks/upload_memory.py [MB]
+"""
+import os
+import signal
+import socket
+import subprocess
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import httpx
+
+OLD_ENDPOINT = "/api/cv-review-inline/"
+
+# Resume lines repeated on every page of the generated PDFs
+LINES = ["Work Experience", "Senior Engineer at Acme, 2019-2024",
+         "Led a team of 5 engineers and increased throughput by 40%",
+         "Built data pipelines with Python, Spark, Airflow and Kafka on AWS",
+         "Education", "MSc Computer Science", "Skills", "Python, SQL, Docker, Kubernetes, Terraform"]
+
+def make_pdf(pages: int, tag: str = "", lines_per_page: int = 40) -> bytes:
+    """A PDF of text pages in Helvetica, each starting with tag so that documents differ"""
+    def text_stream(page: int) -> bytes:
+        commands = ["BT /F1 10 Tf 50 780 Td 12 TL", f"({tag} page {page}) Tj T*"]
+        commands += [f"({LINES[(page + i) % len(LINES)]}) Tj T*" for i in range(lines_per_page)]
+        return ("\n".join(commands) + "\nET").encode("latin-1")
+
+    objects = [b"<< /Type /Catalog /Pages 2 0 R >>", None,
+               b"<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica >>"]
+    kids = []
+    for page in range(pages):
+        stream = text_stream(page)
+        objects.append(b"<< /Length %d >>\nstream\n%s\nendstream" % (len(stream), stream))
+        objects.append(b"<< /Type /Page /Parent 2 0 R /MediaBox [0 0 612 792] "
+                       b"/Resources << /Font << /F1 3 0 R >> >> /Contents %d 0 R >>" % len(objects))
+        kids.append(b"%d 0 R" % len(objects))
+    objects[1] = b"<< /Type /Pages /Kids [%s] /Count %d >>" % (b" ".join(kids), pages)
+
+    pdf = bytearray(b"%PDF-1.4\n")
+    offsets = []
+    for number, body in enumerate(objects, 1):
+        offsets.append(len(pdf))
+        pdf += b"%d 0 obj\n%s\nendobj\n" % (number, body)
+    xref = len(pdf)
+    pdf += b"xref\n0 %d\n0000000000 65535 f \n" % (len(objects) + 1)
+    pdf += b"".join(b"%010d 00000 n \n" % offset for offset in offsets)
+    pdf += b"trailer\n<< /Size %d /Root 1 0 R >>\nstartxref\n%d\n%%%%EOF\n" % (len(objects) + 1, xref)
+    return bytes(pdf)
+
+def serve(port: int) -> None:
+    """Run the app with the old endpoint added"""
+    os.environ["DATABASE_PATH"] = os.path.join(tempfile.mkdtemp(prefix="upload-memory-"), "job_tracker.db")
+    import uvicorn
+    from fastapi import File, UploadFile
+    from app.main import app
+    from app.services.cv_parser_pool import resume_parser
+
+    @app.post(OLD_ENDPOINT)
+    async def review_cv_inline(file: UploadFile = File(...)):
+        # The endpoint before spooling: the whole upload is read and pickled to the worker
+        contents = await file.read()
+        return await resume_parser.parse(contents, file.filename)
+
+    uvicorn.run(app, port=port, log_level="warning")
+
+def status(pid: int, field: str) -> int:
+    """A /proc/<pid>/status memory field, in KB"""
+    with open(f"/proc/{pid}/status") as f:
+        for line in f:
+            if line.startswith(field + ":"):
+                return int(line.split()[1])
+    raise KeyError(field)
+
+def parser_workers(pid: int) -> list:
+    """Pids of the spawned pool workers of a process"""
+    workers = []
+    for entry in os.listdir("/proc"):
+        try:
+            with open(f"/proc/{entry}/stat") as f:
+                parent = int(f.read().rsplit(")", 1)[1].split()[1])
+            with open(f"/proc/{entry}/cmdline", "rb") as f:
+                cmdline = f.read()
+        except (ValueError, OSError):
+            continue
+        if parent == pid and b"spawn_main" in cmdline:
+            workers.append(int(entry))
+    return workers
+
+def reset_peak(pid: int) -> None:
+    with open(f"/proc/{pid}/clear_refs", "w") as f:
+        f.write("5")
+
+def upload(client: httpx.Client, endpoint: str, path: str) -> None:
+    with open(path, "rb") as f:
+        response = client.post(endpoint, files={"file": ("resume.pdf", f, "application/pdf")})
+    assert response.status_code == 200, response.text[:200]
+
+def main(megabytes: int) -> None:
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        port = s.getsockname()[1]
+    server = subprocess.Popen([sys.executable, os.path.abspath(__file__), "--serve", str(port)])
+    pdf = make_pdf(megabytes * 1024 * 1024 * 100 // len(make_pdf(100)))
+    small = make_pdf(2)
+    try:
+        with tempfile.TemporaryDirectory() as tmp, \
+                httpx.Client(base_url=f"http://127.0.0.1:{port}", timeout=None) as client:
+            for _ in range(100):
+                try:
+                    client.get("/api/metrics/")
+                    break
+                except httpx.ConnectError:
+                    time.sleep(0.2)
+            large_path, small_path = os.path.join(tmp, "large.pdf"), os.path.join(tmp, "small.pdf")
+            with open(large_path, "wb") as f:
+                f.write(pdf)
+            with open(small_path, "wb") as f:
+                f.write(small)
+
+            print(f"Upload of a {len(pdf) / (1024 * 1024):.1f} MB PDF, peak RSS above the idle processes:")
+            for name, endpoint in (("read into memory", OLD_ENDPOINT), ("spooled to disk", "/api/cv-review/")):
+                # A small upload first, so that imports and the worker are in place
+                upload(client, endpoint, small_path)
+                workers = parser_workers(server.pid)
+                for pid in [server.pid] + workers:
+                    reset_peak(pid)
+                idle = {pid: status(pid, "VmRSS") for pid in [server.pid] + workers}
+                upload(client, endpoint, large_path)
+                server_mb = (status(server.pid, "VmHWM") - idle[server.pid]) / 1024
+                worker_mb = max((status(pid, "VmHWM") - idle[pid] for pid in workers), default=0) / 1024
+                print(f"  {name:17} server +{server_mb:5.1f} MB, parser worker +{worker_mb:5.1f} MB")
+    finally:
+        # Pool workers can outlive a terminated server and hold its output open
+        workers = parser_workers(server.pid)
+        server.terminate()
+        server.wait()
+        for pid in workers:
+            os.kill(pid, signal.SIGTERM)
+
+if __name__ == "__main__":
+    if sys.argv[1:2] == ["--serve"]:
+        serve(int(sys.argv[2]))
+    else:
+        main(int(sys.argv[1]) if len(sys.argv) > 1 else 8)
@@ -0,0 +1,43 @@
+import os
+import tempfile
+import pytest
+from stub_upstream import StubUpstream
+
+# The app creates its tables as soon as it is imported; keep that out of the
+# tracked job_tracker.db. Set before any test module imports the app
+os.environ.setdefault("DATABASE_PATH", os.path.join(tempfile.mkdtemp(prefix="job-tracker-tests-"), "job_tracker.db"))
+
+@pytest.fixture
+def stub():
+    upstream = StubUpstream().start()
+    yield upstream
+    upstream.stop()
+
+@pytest.fixture
+def languagetool(stub, monkeypatch):
+    """LanguageTool replaced by the stub, with a fresh breaker and result cache"""
+    from app.services import grammar_service
+    from app.services.resilience import CircuitBreaker
+    monkeypatch.setattr(grammar_service, "LANGUAGETOOL_ENDPOINT", stub.url)
+    monkeypatch.setattr(grammar_service, "_languagetool_breaker",
+                        CircuitBreaker("languagetool-test", failure_threshold=5, reset_timeout=30))
+    monkeypatch.setattr(grammar_service, "paragraph_checks", grammar_service.ParagraphCheckCache())
+    return stub
+
+@pytest.fixture
+def database(tmp_path):
+    """A fresh database for the test"""
+    from app.database import db_manager
+    from app.database.connection import set_database_path, DATABASE_PATH
+    set_database_path(str(tmp_path / "job_tracker.db"))
+    db_manager.init_database()
+    yield
+    set_database_path(DATABASE_PATH)
+
+@pytest.fixture
+def client(database):
+    """A test client of the app, on a fresh database"""
+    from fastapi.testclient import TestClient
+    from app.main import app
+    with TestClient(app) as client:
+        yield client
@@ -0,0 +1,58 @@
+import threading
+import time
+from typing import Callable, List, Optional
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+class StubUpstream:
+    """
+    Local HTTP server standing in for an upstream API, with injectable faults.
+    Every request gets the configured status after the configured delay; hits
+    counts the requests that reached it and requests keeps their bodies.
+    Setting respond to a function of the request body serves its result
+    instead of the fixed body.
+    """
+
+    def __init__(self):
+        self.status = 200
+        self.body = b'{"matches": [], "jobs": []}'
+        self.respond: Optional[Callable[[bytes], bytes]] = None
+        self.delay = 0.0
+        self.hits = 0
+        self.requests: List[bytes] = []
+        self._lock = threading.Lock()
+        stub = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def _respond(self):
+                length = int(self.headers.get("Content-Length") or 0)
+                request = self.rfile.read(length) if length else b""
+                with stub._lock:
+                    stub.hits += 1
+                    stub.requests.append(request)
+                if stub.delay:
+                    time.sleep(stub.delay)
+                body = stub.respond(request) if stub.respond else stub.body
+                self.send_response(stub.status)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            do_GET = _respond
+            do_POST = _respond
+
+            def log_message(self, format, *args):
+                pass
+
+        self.server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        self.server.daemon_threads = True
+        self.url = f"http://127.0.0.1:{self.server.server_port}/"
+        self._thread = threading.Thread(target=self.server.serve_forever, daemon=True)
+
+    def start(self) -> "StubUpstream":
+        self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        self.server.shutdown()
+        self.server.server_close()
@@ -0,0 +1,36 @@
+import io
+import json
+from app.routers import cv_review
+from app.services import uploads
+
+RESUME = b"Summary\nWork Experience\nEducation\nSkills: Python, SQL, Docker\n"
+
+def resumes(count: int, content: bytes = RESUME) -> list:
+    return [("files", (f"cv-{i}.txt", io.BytesIO(content), "text/plain")) for i in range(count)]
+
+def test_batch_over_the_file_limit_is_refused_while_parsing(client, monkeypatch):
+    monkeypatch.setattr(cv_review, "CV_BATCH_MAX_FILES", 2)
+    response = client.post("/api/cv-review/batch", files=resumes(3))
+    assert response.status_code == 400
+    assert "Too many files" in response.json()["detail"]
+
+def test_batch_without_files_is_refused(client):
+    response = client.post("/api/cv-review/batch", data={"other": "value"})
+    assert response.status_code == 400
+
+def test_batch_files_are_spooled_to_disk_past_one_chunk(client, monkeypatch):
+    uploaded = []
+    read_uploaded_files = uploads.read_uploaded_files
+
+    async def recording(*args):
+        files = await read_uploaded_files(*args)
+        uploaded.extend(files)
+        return files
+
+    monkeypatch.setattr(cv_review, "read_uploaded_files", recording)
+    large = RESUME + b"x" * (uploads.UPLOAD_CHUNK_SIZE * 2)
+    response = client.post("/api/cv-review/batch", params={"structured": True},
+                           files=resumes(1) + resumes(1, large))
+    lines = [json.loads(line) for line in response.text.splitlines()]
+    assert lines[-1]["type"] == "summary" and lines[-1]["total_files"] == 2
+    assert [upload.file._rolled for upload in uploaded] == [False, True]
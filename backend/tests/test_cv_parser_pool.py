@@ -0,0 +1,34 @@
+import asyncio
+import os
+import time
+from app.services import metrics
+from app.services.cv_parser_pool import ResumeParserPool, ResumeParseTimeoutError
+
+# Run in the spawned workers, which import this module by name
+
+def hang(path: str, filename: str) -> None:
+    time.sleep(60)
+
+def worker_pid(path: str, filename: str) -> int:
+    time.sleep(0.5)
+    return os.getpid()
+
+def test_timeout_kills_the_hung_worker_and_the_pool_is_replaced():
+    pool = ResumeParserPool(workers=2, timeout=10, memory_limit_mb=0)
+    restarts = metrics.snapshot()["counters"].get("cv.pool_restarts", 0)
+
+    async def run():
+        # Start the workers first, so that the short timeout only covers running the tasks
+        first = await asyncio.gather(pool._run(worker_pid, "", "warm-up-1"), pool._run(worker_pid, "", "warm-up-2"))
+        pool.timeout = 2
+        hung, fine = await asyncio.gather(pool._run(hang, "", "hung.pdf"), pool._run(worker_pid, "", "fine.pdf"),
+                                          return_exceptions=True)
+        pool.timeout = 10
+        return first, hung, fine, await pool._run(worker_pid, "", "after.pdf")
+
+    first, hung, fine, after = asyncio.run(run())
+    assert isinstance(hung, ResumeParseTimeoutError)
+    assert fine in first
+    assert after not in first
+    assert metrics.snapshot()["counters"]["cv.pool_restarts"] == restarts + 1
+    assert not pool._running
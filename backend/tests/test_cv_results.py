@@ -0,0 +1,32 @@
+import glob
+import os
+import tempfile
+from app.services import cv_results
+
+RESUME = b"Summary\nWork Experience\nEducation\nSkills: Python, SQL, Docker\n"
+
+def leftover_copies() -> set:
+    return set(glob.glob(os.path.join(tempfile.gettempdir(), "upload-*.parse")))
+
+def test_upload_is_copied_off_the_event_loop_without_hard_links(client, monkeypatch):
+    def no_links(source, target):
+        raise OSError("hard links are not supported")
+
+    copies = []
+    run_in_threadpool = cv_results.run_in_threadpool
+
+    async def recording(fn, *args):
+        copies.append(fn)
+        return await run_in_threadpool(fn, *args)
+
+    monkeypatch.setattr(os, "link", no_links)
+    monkeypatch.setattr(cv_results, "run_in_threadpool", recording)
+    monkeypatch.setattr(cv_results, "resume_results", cv_results.ResumeResultCache())
+    before = leftover_copies()
+
+    response = client.post("/api/cv-review/", params={"structured": True},
+                           files={"file": ("cv.txt", RESUME, "text/plain")})
+    assert response.status_code == 200
+    assert response.json()["word_count"] == 8
+    assert copies == [cv_results._copy]
+    assert leftover_copies() == before
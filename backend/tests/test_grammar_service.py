@@ -0,0 +1,77 @@
+import json
+import re
+from urllib.parse import parse_qs
+import pytest
+from app.services import grammar_service
+from app.services.grammar_service import check_grammar, format_grammar_suggestions
+
+MISSPELLINGS = {"teh": "the", "recieve": "receive"}
+
+def fake_matches(text: str) -> list:
+    """LanguageTool matches for a text: one per known misspelling"""
+    return [
+        {"offset": match.start(), "length": len(match.group()), "message": "Possible spelling mistake",
+         "replacements": [{"value": MISSPELLINGS[match.group()]}], "rule": {"id": "MORFOLOGIK_RULE_EN_US"}}
+        for match in re.finditer("|".join(MISSPELLINGS), text)
+    ]
+
+def sent_text(request: bytes) -> str:
+    return parse_qs(request.decode(), keep_blank_values=True)["text"][0]
+
+@pytest.fixture
+def fake_languagetool(languagetool):
+    languagetool.respond = lambda request: json.dumps({"matches": fake_matches(sent_text(request))}).encode()
+    return languagetool
+
+def errors(result: dict) -> list:
+    return [(s["offset"], s["error_text"], s["suggested_correction"]) for s in result["suggestions"]]
+
+@pytest.mark.parametrize("text", [
+    "I saw teh cat.",
+    "Dear team,\n\nI saw teh cat.\nYou will recieve teh letter.\n",
+    "Dear team,\r\n\r\nI saw teh cat.\r\nYou will recieve teh letter.\r\n",
+    "  teh\n\n\n   \nteh teh\n",
+    "No mistakes here.\nNone at all.",
+])
+def test_offsets_refer_to_the_original_text(fake_languagetool, text):
+    result = check_grammar(text)
+    # The same suggestions as checking the whole text in one piece
+    assert result == format_grammar_suggestions(text, {"matches": fake_matches(text)})
+    for offset, error_text, correction in errors(result):
+        assert text[offset:offset + len(error_text)] == error_text == {v: k for k, v in MISSPELLINGS.items()}[correction]
+
+def test_only_changed_paragraphs_are_sent(fake_languagetool):
+    paragraphs = ["Dear team,", "I saw teh cat.", "You will recieve the letter.", "Best regards"]
+    check_grammar("\r\n".join(paragraphs))
+    assert fake_languagetool.hits == 1
+
+    paragraphs[2] = "You will recieve teh letter."
+    edited = "\r\n".join(paragraphs)
+    result = check_grammar(edited)
+    assert fake_languagetool.hits == 2
+    assert sent_text(fake_languagetool.requests[-1]) == "You will recieve teh letter.\r"
+    assert [error for _, error, _ in errors(result)] == ["teh", "recieve", "teh"]
+
+    assert check_grammar(edited) == result
+    assert fake_languagetool.hits == 2
+
+def test_repeated_paragraphs_are_sent_once(fake_languagetool):
+    text = "I saw teh cat.\nOther line.\nI saw teh cat."
+    result = check_grammar(text)
+    assert sent_text(fake_languagetool.requests[0]) == "I saw teh cat.\nOther line."
+    assert [offset for offset, _, _ in errors(result)] == [6, 33]
+
+def test_unchanged_paragraphs_come_from_the_cache(fake_languagetool):
+    check_grammar("First teh.\nSecond teh.")
+    cache = grammar_service.paragraph_checks
+    assert len(cache) == 2
+
+    check_grammar("Second teh.\nFirst teh.\nThird.")
+    assert sent_text(fake_languagetool.requests[-1]) == "Third."
+    assert len(cache) == 3
+
+def test_failed_check_caches_nothing(languagetool):
+    languagetool.status = 503
+    with pytest.raises(RuntimeError):
+        check_grammar("I saw teh cat.")
+    assert len(grammar_service.paragraph_checks) == 0
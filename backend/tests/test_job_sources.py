@@ -0,0 +1,54 @@
+import pytest
+from app.services import metrics
+from app.services.job_sources import JobAggregator, JobSource
+
+class ListSource(JobSource):
+    """A source serving a fixed list of jobs"""
+
+    def __init__(self, name: str, count: int):
+        self.name = name
+        self.jobs = [{"guid": f"{name}-{i}", "title": f"Job {i}"} for i in range(count)]
+
+    def fetch_raw(self, limit, offset):
+        return self.jobs[offset:offset + limit]
+
+def guids(jobs) -> list:
+    return [job["guid"] for job in jobs]
+
+def test_merged_page_is_truncated_to_limit():
+    aggregator = JobAggregator([ListSource("a", 50), ListSource("b", 50)])
+    jobs = aggregator.fetch(20, 0)
+    assert len(jobs) == 20
+    assert guids(jobs)[:4] == ["a-0", "b-0", "a-1", "b-1"]
+
+def test_pages_of_the_merged_list_line_up():
+    aggregator = JobAggregator([ListSource("a", 50), ListSource("b", 50), ListSource("c", 50)])
+    everything = guids(aggregator.fetch(63, 0))
+    pages = []
+    for offset in range(0, 63, 7):
+        pages += guids(aggregator.fetch(7, offset))
+    assert pages == everything
+
+def test_failed_source_is_skipped():
+    class Broken(ListSource):
+        def fetch_raw(self, limit, offset):
+            raise RuntimeError("down")
+
+    aggregator = JobAggregator([ListSource("a", 10), Broken("b", 10)])
+    assert guids(aggregator.fetch(5, 0)) == ["a-0", "a-1", "a-2", "a-3", "a-4"]
+
+def test_source_without_fetch_raw_cannot_be_created():
+    class Incomplete(JobSource):
+        name = "incomplete"
+
+    with pytest.raises(TypeError):
+        Incomplete()
+
+def test_every_fetch_adds_to_the_latency_sum_and_count():
+    counters = metrics.snapshot()["counters"]
+    aggregator = JobAggregator([ListSource("timed", 10)])
+    aggregator.fetch(5, 0)
+    aggregator.fetch(5, 5)
+    after = metrics.snapshot()["counters"]
+    assert after["jobsource.timed.latency_count"] - counters.get("jobsource.timed.latency_count", 0) == 2
+    assert after["jobsource.timed.latency_ms_sum"] >= counters.get("jobsource.timed.latency_ms_sum", 0)
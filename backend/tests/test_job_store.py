@@ -0,0 +1,96 @@
+import pytest
+from app.services import job_store as job_store_module
+from app.services.job_fingerprint import SIMHASH_MAX_DISTANCE, description_simhash
+from app.services.job_store import JobStore, make_job_id
+
+BASE_HASH = 0x0123456789ABCDEF
+
+def posting(guid: str, title: str = "Backend Engineer", company: str = "Acme Inc.",
+            location: str = "Germany", description: str = "") -> dict:
+    return {"guid": guid, "title": title, "companyName": company,
+            "locationRestrictions": [{"name": location}], "description": description}
+
+def flipped(bits: list) -> str:
+    """A description whose (stubbed) simhash differs from BASE_HASH in the given bits"""
+    simhash = BASE_HASH
+    for bit in bits:
+        simhash ^= 1 << bit
+    return str(simhash)
+
+@pytest.fixture
+def store(monkeypatch):
+    # Descriptions of these tests are their simhash, so distances can be set exactly
+    monkeypatch.setattr(job_store_module, "description_simhash",
+                        lambda job: int(job["description"]) if job["description"] else 0)
+    return JobStore()
+
+def add(store: JobStore, *jobs) -> list:
+    return store.add_jobs(list(jobs), enrich=False)
+
+def test_exact_fingerprint_collapses_reposts(store):
+    [kept] = add(store, posting("a"))
+    [repost] = add(store, posting("b", title="backend engineer!", company="ACME inc"))
+    assert repost is kept
+    assert len(store) == 1
+    assert store.get(make_job_id({"guid": "b"})) is kept
+
+def test_other_location_is_not_a_duplicate(store):
+    add(store, posting("a"), posting("b", location="France"))
+    assert len(store) == 2
+
+@pytest.mark.parametrize("bits, collapsed", [
+    ([5], True),
+    # At SIMHASH_MAX_DISTANCE, within one band and spread over several
+    ([0, 1, 2], True),
+    ([0, 16, 32], True),
+    # Just past it
+    ([1, 2, 3, 4], False),
+    ([0, 16, 32, 48], False),
+])
+def test_near_duplicate_descriptions(store, bits, collapsed):
+    assert SIMHASH_MAX_DISTANCE == 3
+    add(store, posting("a", description=str(BASE_HASH)))
+    add(store, posting("b", title="Senior Backend Engineer", description=flipped(bits)))
+    assert (len(store) == 1) is collapsed
+
+def test_near_duplicates_must_share_the_company(store):
+    add(store, posting("a", description=str(BASE_HASH)))
+    add(store, posting("b", title="Other title", company="Globex", description=flipped([1])))
+    assert len(store) == 2
+
+def test_known_alias_resolves_without_fingerprinting(store, monkeypatch):
+    [kept] = add(store, posting("a"))
+    add(store, posting("b"))
+    monkeypatch.setattr(job_store_module, "exact_fingerprint", lambda job: pytest.fail("fingerprinted"))
+    assert add(store, posting("b")) == [kept]
+
+def test_evicting_a_job_drops_its_aliases():
+    store = JobStore(max_jobs=1)
+    add(store, posting("a"), posting("b"))
+    alias = make_job_id({"guid": "b"})
+    assert store.get(alias) is not None
+
+    add(store, posting("c", title="Designer"))
+    assert store.get(alias) is None
+    assert not store._aliases and not store._aliases_by_job
+
+    # The repost is a job of its own now that the original is gone
+    [job] = add(store, posting("b"))
+    assert job["id"] == alias
+
+def test_expired_job_drops_its_aliases(monkeypatch):
+    store = JobStore(ttl=10)
+    now = [1000.0]
+    monkeypatch.setattr(job_store_module.time, "time", lambda: now[0])
+    add(store, posting("a"), posting("b"))
+    now[0] += 11
+    assert store.get(make_job_id({"guid": "b"})) is None
+    assert len(store) == 0 and not store._aliases
+
+def test_simhash_of_real_descriptions():
+    text = " ".join(f"word{i}" for i in range(200))
+    edited = text.replace("word100", "changed")
+    assert description_simhash({"description": "too short"}) == 0
+    assert description_simhash({"description": f"<p>{text}</p>"}) == description_simhash({"description": text})
+    assert bin(description_simhash({"description": text}) ^ description_simhash({"description": edited})).count("1") \
+        <= SIMHASH_MAX_DISTANCE
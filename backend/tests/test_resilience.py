@@ -0,0 +1,151 @@
+import socket
+import threading
+import time
+import pytest
+import requests
+from app.services import grammar_service
+from app.services.resilience import CircuitBreaker, CircuitOpenError, SingleFlight, is_upstream_failure
+
+def fetch(url: str, timeout: float = 2) -> dict:
+    response = requests.get(url, timeout=timeout)
+    response.raise_for_status()
+    return response.json()
+
+def closed_port_url() -> str:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return f"http://127.0.0.1:{sock.getsockname()[1]}/"
+
+def test_single_flight_coalesces_concurrent_calls(stub):
+    stub.delay = 0.2
+    flight = SingleFlight("test")
+    results = []
+
+    def call():
+        results.append(flight.do(stub.url, lambda: fetch(stub.url)))
+
+    threads = [threading.Thread(target=call) for _ in range(10)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert stub.hits == 1
+    assert len(results) == 10
+
+def test_single_flight_shares_errors(stub):
+    stub.status = 500
+    flight = SingleFlight("test")
+    with pytest.raises(requests.exceptions.HTTPError):
+        flight.do(stub.url, lambda: fetch(stub.url))
+
+def test_breaker_opens_after_consecutive_server_errors(stub):
+    stub.status = 503
+    breaker = CircuitBreaker("test", failure_threshold=5, reset_timeout=30)
+    for _ in range(5):
+        with pytest.raises(requests.exceptions.HTTPError):
+            breaker.call(fetch, stub.url)
+    assert breaker.state == CircuitBreaker.OPEN
+
+    with pytest.raises(CircuitOpenError):
+        breaker.call(fetch, stub.url)
+    assert stub.hits == 5
+
+def test_client_errors_do_not_open_breaker(stub):
+    stub.status = 400
+    breaker = CircuitBreaker("test", failure_threshold=5, reset_timeout=30)
+    for _ in range(10):
+        with pytest.raises(requests.exceptions.HTTPError):
+            breaker.call(fetch, stub.url)
+    assert breaker.state == CircuitBreaker.CLOSED
+    assert breaker.consecutive_failures == 0
+
+def test_client_error_resets_consecutive_failures(stub):
+    breaker = CircuitBreaker("test", failure_threshold=3, reset_timeout=30)
+    for status in (500, 500, 422, 500, 500):
+        stub.status = status
+        with pytest.raises(requests.exceptions.HTTPError):
+            breaker.call(fetch, stub.url)
+    assert breaker.state == CircuitBreaker.CLOSED
+
+def test_timeouts_count_as_failures(stub):
+    stub.delay = 0.5
+    breaker = CircuitBreaker("test", failure_threshold=2, reset_timeout=30)
+    for _ in range(2):
+        with pytest.raises(requests.exceptions.Timeout):
+            breaker.call(fetch, stub.url, timeout=0.1)
+    assert breaker.state == CircuitBreaker.OPEN
+
+def test_connection_errors_count_as_failures():
+    url = closed_port_url()
+    breaker = CircuitBreaker("test", failure_threshold=2, reset_timeout=30)
+    for _ in range(2):
+        with pytest.raises(requests.exceptions.ConnectionError):
+            breaker.call(fetch, url)
+    assert breaker.state == CircuitBreaker.OPEN
+
+def test_slow_calls_count_as_failures(stub):
+    stub.delay = 0.15
+    breaker = CircuitBreaker("test", failure_threshold=2, reset_timeout=30, latency_budget=0.05)
+    for _ in range(2):
+        breaker.call(fetch, stub.url)
+    assert breaker.state == CircuitBreaker.OPEN
+
+def test_half_open_probe_closes_breaker_on_success(stub):
+    stub.status = 500
+    breaker = CircuitBreaker("test", failure_threshold=1, reset_timeout=0.1)
+    with pytest.raises(requests.exceptions.HTTPError):
+        breaker.call(fetch, stub.url)
+    assert breaker.state == CircuitBreaker.OPEN
+
+    time.sleep(0.15)
+    stub.status = 200
+    breaker.call(fetch, stub.url)
+    assert breaker.state == CircuitBreaker.CLOSED
+
+def test_failed_half_open_probe_reopens_breaker(stub):
+    stub.status = 500
+    breaker = CircuitBreaker("test", failure_threshold=3, reset_timeout=0.1)
+    for _ in range(3):
+        with pytest.raises(requests.exceptions.HTTPError):
+            breaker.call(fetch, stub.url)
+
+    time.sleep(0.15)
+    with pytest.raises(requests.exceptions.HTTPError):
+        breaker.call(fetch, stub.url)
+    assert breaker.state == CircuitBreaker.OPEN
+    with pytest.raises(CircuitOpenError):
+        breaker.call(fetch, stub.url)
+
+def test_is_upstream_failure():
+    def http_error(status: int) -> requests.exceptions.HTTPError:
+        response = requests.Response()
+        response.status_code = status
+        return requests.exceptions.HTTPError(response=response)
+
+    assert is_upstream_failure(http_error(500))
+    assert is_upstream_failure(http_error(503))
+    assert not is_upstream_failure(http_error(400))
+    assert not is_upstream_failure(http_error(413))
+    assert is_upstream_failure(requests.exceptions.ReadTimeout())
+    assert is_upstream_failure(requests.exceptions.ConnectionError())
+    assert not is_upstream_failure(ValueError())
+
+def test_rejected_grammar_checks_keep_languagetool_available(languagetool):
+    languagetool.status = 400
+    for i in range(10):
+        with pytest.raises(RuntimeError):
+            grammar_service.check_grammar(f"Invalid text number {i}.")
+
+    languagetool.status = 200
+    assert grammar_service.check_grammar("A valid text.")["total_errors"] == 0
+
+def test_languagetool_outage_fails_fast(languagetool):
+    languagetool.status = 502
+    for i in range(5):
+        with pytest.raises(RuntimeError):
+            grammar_service.check_grammar(f"Text number {i}.")
+
+    with pytest.raises(CircuitOpenError):
+        grammar_service.check_grammar("One more text.")
+    assert languagetool.hits == 5
@@ -0,0 +1,47 @@
+from app.database import ScrapeCacheManager
+from app.database.connection import get_connection
+from app.services import skill_service
+from app.services.skill_taxonomy import get_taxonomy
+
+URL = "https://jobs.example.com/1"
+
+def last_accessed(url: str) -> float:
+    with get_connection() as conn:
+        return conn.execute("SELECT last_accessed FROM scrape_cache WHERE url = ?", (url,)).fetchone()[0]
+
+def set_last_accessed(url: str, value: float) -> None:
+    with get_connection() as conn:
+        conn.execute("UPDATE scrape_cache SET last_accessed = ? WHERE url = ?", (value, url))
+
+def test_reads_refresh_the_access_time_only_once_it_is_old(database):
+    cache = ScrapeCacheManager()
+    cache.store_entry(URL, "Python developer", ["python"], skills_digest="digest")
+    stored = last_accessed(URL)
+    assert cache.get_entry(URL)["skills"] == ["python"]
+    assert last_accessed(URL) == stored
+
+    set_last_accessed(URL, 1000.0)
+    cache.get_entry(URL)
+    assert last_accessed(URL) > 1000.0
+
+def test_fresh_page_uses_the_skills_stored_with_the_current_taxonomy(database, monkeypatch):
+    def extract(text):
+        raise AssertionError("skills should come from the cache")
+
+    monkeypatch.setattr(skill_service, "extract_skills_from_text", extract)
+    skill_service._scrape_cache.store_entry(URL, "Python developer", ["python"], skills_digest=get_taxonomy().digest)
+    assert skill_service.scrape_job_details(URL) == {"description": "Python developer", "skills": ["python"]}
+
+def test_skills_stored_with_another_taxonomy_are_extracted_again(database, monkeypatch):
+    extracted = []
+
+    def extract(text):
+        extracted.append(text)
+        return ["django", "python"]
+
+    monkeypatch.setattr(skill_service, "extract_skills_from_text", extract)
+    skill_service._scrape_cache.store_entry(URL, "Python and Django", ["python"], skills_digest="old-taxonomy")
+    assert skill_service.scrape_job_details(URL)["skills"] == ["django", "python"]
+    assert skill_service.scrape_job_details(URL)["skills"] == ["django", "python"]
+    assert extracted == ["Python and Django"]
+    assert skill_service._scrape_cache.get_entry(URL)["skills_digest"] == get_taxonomy().digest
@@ -0,0 +1,51 @@
+from app.services import skill_cache
+from app.services.skill_cache import SkillExtractionCache
+
+class MemoryDisk:
+    """Disk tier kept in a dict, with the interface of SkillCacheManager"""
+
+    def __init__(self):
+        self.entries = {}
+        self.lookups = 0
+
+    def get_skills(self, text_hash, taxonomy_digest):
+        self.lookups += 1
+        return self.entries.get((text_hash, taxonomy_digest))
+
+    def store_skills(self, entries, taxonomy_digest):
+        for text_hash, skills in entries:
+            self.entries[(text_hash, taxonomy_digest)] = skills
+
+    def evict(self, max_entries):
+        pass
+
+    def delete_other_taxonomies(self, taxonomy_digest):
+        pass
+
+def test_evicted_entries_are_found_before_they_reach_disk():
+    disk = MemoryDisk()
+    cache = SkillExtractionCache(max_entries=2, disk=disk)
+    for i in range(3):
+        cache.put(f"text-{i}", "digest", [f"skill-{i}"])
+    assert not disk.entries
+
+    assert cache.get("text-0", "digest") == ["skill-0"]
+    assert disk.lookups == 0
+    assert len(cache) == 2
+
+def test_evicted_entries_are_spilled_in_batches(monkeypatch):
+    monkeypatch.setattr(skill_cache, "SKILL_CACHE_SPILL_BATCH", 2)
+    disk = MemoryDisk()
+    cache = SkillExtractionCache(max_entries=1, disk=disk)
+    for i in range(3):
+        cache.put(f"text-{i}", "digest", [f"skill-{i}"])
+    assert set(disk.entries) == {("text-0", "digest"), ("text-1", "digest")}
+
+    assert cache.get("text-1", "digest") == ["skill-1"]
+    assert disk.lookups == 1
+
+def test_taxonomy_change_drops_pending_entries():
+    cache = SkillExtractionCache(max_entries=1, disk=MemoryDisk())
+    cache.put("text-0", "old", ["skill-0"])
+    cache.put("text-1", "old", ["skill-1"])
+    assert cache.get("text-0", "new") is None
@@ -0,0 +1,58 @@
+import time
+import pytest
+from app.services.skill_demand import SkillDemandAggregates
+from app.services.skill_service import get_skill_recommendations
+
+def test_demand_rejects_location_and_category_together(client):
+    response = client.get("/api/jobs/demand", params={"location": "Berlin", "category": "Software"})
+    assert response.status_code == 400
+
+def test_top_skills_rejects_location_and_category_together():
+    with pytest.raises(ValueError):
+        SkillDemandAggregates().top_skills(location="Berlin", category="Software")
+
+def job(job_id: str, published, skills=("python",)) -> dict:
+    return {"id": job_id, "pubDate": published, "required_skills": list(skills)}
+
+@pytest.mark.parametrize("published", [0, "0", 1e300, "9999-12-31T00:00:00Z", "4102444800000", float("nan")])
+def test_extreme_posting_dates_are_clamped(published):
+    demand = SkillDemandAggregates()
+    demand.job_added(job("bad", published))
+    demand.job_added(job("fresh", time.time()))
+    top = demand.top_skills()
+    assert top[0]["jobs"] == 2
+    assert 0 < top[0]["demand"] <= 2
+
+    demand.job_removed(job("bad", published))
+    assert demand.top_skills()[0]["jobs"] == 1
+
+def test_alternating_old_and_new_postings_do_not_rebase():
+    demand = SkillDemandAggregates()
+    origin = demand._origin
+    for i in range(10):
+        demand.job_added(job(f"old-{i}", 0))
+        demand.job_added(job(f"new-{i}", "9999-01-01T00:00:00Z"))
+    assert demand._origin == origin
+    assert demand.top_skills()[0]["jobs"] == 20
+
+def test_old_postings_still_count_towards_recommendations():
+    demand = SkillDemandAggregates()
+    two_months_ago = time.time() - 60 * 24 * 60 * 60
+    for i in range(2):
+        demand.job_added(job(f"old-{i}", two_months_ago, ["kubernetes"]))
+    demand.job_added(job("single", time.time(), ["rust"]))
+
+    kubernetes = next(entry for entry in demand.top_skills() if entry["skill"] == "kubernetes")
+    assert kubernetes["demand"] < 1
+    assert get_skill_recommendations(["python"], demand.job_counts()) == ["kubernetes"]
+
+def test_location_names_with_commas_keep_their_own_bucket():
+    demand = SkillDemandAggregates()
+    demand.job_added(dict(job("dc", time.time()), location="Washington, D.C., Canada",
+                          locationRestrictions=[{"name": "Washington, D.C."}, {"name": "Canada"}]))
+    demand.job_added(job("anywhere", time.time(), ["go"]))
+
+    assert demand.job_counts(location="Washington, D.C.") == {"python": 1}
+    assert demand.job_counts(location="Canada") == {"python": 1}
+    assert demand.job_counts(location="D.C.") == {}
+    assert demand.job_counts(location="Worldwide") == {"go": 1}
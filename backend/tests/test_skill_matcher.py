@@ -0,0 +1,47 @@
+import pytest
+from app.services.skill_matcher import SkillMatcher
+from app.services.text_analyzer import TextAnalyzer
+
+TERMS = {
+    "c": "c", "c++": "c++", "c#": "c#", ".net": ".net", "node.js": "node.js", "nodejs": "node.js",
+    "javascript": "javascript", "js": "javascript", "java": "java",
+    "sql": "sql", "sql server": "sql server", "mysql": "mysql", "r": "r"
+}
+
+matcher = SkillMatcher(TERMS)
+
+@pytest.fixture(params=["matcher", "analyzer", "artifact"])
+def extract(request):
+    """Every way skills are extracted, all of which must agree"""
+    if request.param == "matcher":
+        return matcher.extract
+    if request.param == "analyzer":
+        return TextAnalyzer(matcher).extract_skills
+    return SkillMatcher.from_artifact(matcher.to_artifact()).extract
+
+@pytest.mark.parametrize("text, skills", [
+    ("C++ and C# developer", ["c#", "c++"]),
+    ("Modern c++17, c#10 and C", ["c", "c#", "c++"]),
+    ("c+++ is not a language", []),
+    ("c++ or c", ["c", "c++"]),
+    ("cpp and objective-c", ["c"]),
+    ("cpp", []),
+    (".NET Core services", [".net"]),
+    # "node.js" contains the token "js"
+    ("Node.js and NodeJS", ["javascript", "node.js"]),
+    ("node.json files", []),
+    ("JS, not Java", ["java", "javascript"]),
+    ("JavaScript", ["javascript"]),
+    ("SQL Server", ["sql", "sql server"]),
+    ("MySQL", ["mysql"]),
+    ("sql", ["sql"]),
+    ("<li>R</li><b>C#</b>", ["c#", "r"]),
+    ("R&D budget", ["r"]),
+    ("", []),
+])
+def test_punctuated_terms_match_whole_tokens(extract, text, skills):
+    assert extract(text) == skills
+
+def test_every_term_finds_its_skill_on_its_own(extract):
+    for term, skill in TERMS.items():
+        assert skill in extract(f"Experience with {term}.")
@@ -0,0 +1,51 @@
+import json
+import pytest
+from app.services import skill_taxonomy
+from app.services.skill_taxonomy import _TaxonomyHolder, load_taxonomy
+
+VALID = {
+    "version": 1,
+    "skills": {
+        "python": {"category": "Languages", "aliases": ["py"]},
+        "django": {"category": "Frameworks"}
+    },
+    "relationships": {"python": ["django"]}
+}
+
+@pytest.fixture(autouse=True)
+def matcher_cache(tmp_path, monkeypatch):
+    monkeypatch.setattr(skill_taxonomy, "SKILL_MATCHER_CACHE_DIR", str(tmp_path / "matchers"))
+
+def write(path, document) -> str:
+    path.write_text(json.dumps(document))
+    return str(path)
+
+@pytest.mark.parametrize("skills, relationships", [
+    ({"python": {"aliases": [""]}}, {}),
+    ({"python": {"aliases": ["  "]}}, {}),
+    ({"python": {"aliases": [3]}}, {}),
+    ({"python": {"aliases": [None]}}, {}),
+    ({"python": {"aliases": "py"}}, {}),
+    ({"python": {"category": ["Languages"]}}, {}),
+    ({"python": {}}, {"python": "django"}),
+    ({"python": {}}, {"python": ["django", 1]}),
+    ({"python": {}}, []),
+    ({"Python": {}}, {}),
+])
+def test_invalid_taxonomies_are_rejected(tmp_path, skills, relationships):
+    path = write(tmp_path / "taxonomy.json", {"skills": skills, "relationships": relationships})
+    with pytest.raises(ValueError):
+        load_taxonomy(path)
+
+def test_valid_taxonomy_loads(tmp_path):
+    taxonomy = load_taxonomy(write(tmp_path / "taxonomy.json", VALID))
+    assert taxonomy.analyzer.extract_skills("Py and Django") == ["django", "python"]
+
+def test_invalid_edit_keeps_last_good_version(tmp_path):
+    path = write(tmp_path / "taxonomy.json", VALID)
+    holder = _TaxonomyHolder(path)
+    good = holder.taxonomy
+
+    invalid = dict(VALID, skills={"python": {"aliases": ["", 7]}})
+    write(tmp_path / "taxonomy.json", invalid)
+    assert holder.reload() is good
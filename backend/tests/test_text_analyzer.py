@@ -0,0 +1,43 @@
+import random
+import re
+import pytest
+from app.services.skill_taxonomy import get_taxonomy
+from app.services.text_analyzer import QUANTIFIED_PATTERN
+from benchmarks.text_analysis import make_resumes, old_checks, old_numbers, old_skill_pattern, old_skills
+
+# The number check of the resume review before TextAnalyzer
+BASELINE_QUANTIFIED = r'\d+%|\$\d+|\d+,\d+|\d+ years?'
+
+@pytest.fixture(scope="module")
+def taxonomy():
+    return get_taxonomy()
+
+@pytest.mark.parametrize("text, expected", [
+    ("Raised US$500k", [("$500", 9)]),
+    ("5 Years of mentoring", []),
+    ("5 years, 1 year", [("5 years", 0), ("1 year", 9)]),
+    ("grew 40% to 10,000 users", [("40%", 5), ("10,000", 12)]),
+    ("abc123% and $ 5 and $%", [("123%", 3)]),
+])
+def test_quantified_matches_the_old_check(taxonomy, text, expected):
+    assert taxonomy.analyzer.analyze(text)["quantified"] == expected == old_numbers(text)
+
+def test_quantified_pattern_is_equivalent_to_the_baseline():
+    rng = random.Random(5)
+    baseline, pattern = re.compile(BASELINE_QUANTIFIED), re.compile(QUANTIFIED_PATTERN)
+    for _ in range(5000):
+        text = "".join(rng.choice("0123456789$%, yearsY\n") for _ in range(30))
+        assert [(m.group(), m.start()) for m in pattern.finditer(text)] == \
+               [(m.group(), m.start()) for m in baseline.finditer(text)]
+
+def test_analysis_matches_the_old_checks_on_a_fixed_corpus(taxonomy):
+    analyzer = taxonomy.analyzer
+    pattern = old_skill_pattern(taxonomy.matcher.terms)
+    for text in make_resumes(60):
+        check = old_checks(text)
+        analysis = analyzer.analyze(text)
+        assert list(analysis["sections"]) == check["sections"]
+        assert bool(analysis["action_verbs"]) == check["has_verbs"]
+        assert analysis["quantified"] == old_numbers(text)
+        assert analysis["word_count"] == check["word_count"]
+        assert analysis["skills"] == old_skills(pattern, taxonomy.matcher, text) == analyzer.extract_skills(text)
@@ -0,0 +1,9 @@
+from app.services.uploads import CV_MAX_UPLOAD_BYTES
+
+ORIGIN = "http://localhost:3000"
+
+def test_oversized_upload_is_refused_with_cors_headers(client):
+    response = client.post("/api/cv-review/", headers={"Origin": ORIGIN},
+                           files={"file": ("cv.txt", b"x" * (CV_MAX_UPLOAD_BYTES + 1), "text/plain")})
+    assert response.status_code == 413
+    assert response.headers["access-control-allow-origin"] == ORIGIN
@@ -0,0 +1,80 @@
+import json
+import random
+import time
+import pytest
+import requests
+from app.services import upstream
+
+@pytest.fixture
+def cassettes(tmp_path, monkeypatch):
+    monkeypatch.setattr(upstream, "UPSTREAM_CASSETTE_DIR", str(tmp_path / "cassettes"))
+    return tmp_path / "cassettes"
+
+def replay(monkeypatch, latency: float = 0, error_rate: float = 0, seed: int = 0) -> None:
+    """Switch to replay mode, with the network disabled"""
+    monkeypatch.setattr(upstream, "UPSTREAM_MODE", "replay")
+    monkeypatch.setattr(upstream, "UPSTREAM_REPLAY_LATENCY", latency)
+    monkeypatch.setattr(upstream, "UPSTREAM_REPLAY_ERROR_RATE", error_rate)
+    monkeypatch.setattr(upstream, "_replay_random", random.Random(seed))
+    monkeypatch.setattr(upstream.requests, "request", lambda *args, **kwargs: pytest.fail("network used"))
+
+def record(monkeypatch) -> None:
+    monkeypatch.setattr(upstream, "UPSTREAM_MODE", "record")
+
+def test_recorded_responses_replay_without_network(stub, cassettes, monkeypatch):
+    stub.status = 201
+    stub.body = json.dumps({"jobs": [{"title": "Engineer"}]}).encode()
+    record(monkeypatch)
+    recorded = upstream.get(stub.url, params={"limit": 5}, timeout=2)
+    posted = upstream.post(stub.url, data={"text": "Hello"}, timeout=2)
+    assert stub.hits == 2
+    assert len(list(cassettes.iterdir())) == 2
+
+    stub.stop()
+    replay(monkeypatch)
+    replayed = upstream.get(stub.url, params={"limit": 5}, timeout=2)
+    assert replayed.status_code == 201
+    assert replayed.json() == recorded.json() == {"jobs": [{"title": "Engineer"}]}
+    assert replayed.headers["content-type"] == "application/json"
+    assert upstream.post(stub.url, data={"text": "Hello"}).content == posted.content
+
+def test_missing_cassette_is_a_connection_error(cassettes, monkeypatch):
+    replay(monkeypatch)
+    with pytest.raises(requests.exceptions.ConnectionError, match="No recorded response"):
+        upstream.get("https://example.invalid/jobs", params={"limit": 5})
+
+def test_requests_differing_in_body_have_their_own_cassettes(stub, cassettes, monkeypatch):
+    record(monkeypatch)
+    upstream.post(stub.url, data={"text": "one"}, timeout=2)
+    replay(monkeypatch)
+    upstream.post(stub.url, data={"text": "one"})
+    with pytest.raises(requests.exceptions.ConnectionError):
+        upstream.post(stub.url, data={"text": "two"})
+
+def test_injected_errors_are_repeatable_with_a_seed(stub, cassettes, monkeypatch):
+    record(monkeypatch)
+    upstream.get(stub.url, timeout=2)
+
+    def outcomes() -> list:
+        replay(monkeypatch, error_rate=0.5, seed=42)
+        results = []
+        for _ in range(20):
+            try:
+                upstream.get(stub.url)
+                results.append("ok")
+            except requests.exceptions.ConnectionError as e:
+                assert "Injected upstream error" in str(e)
+                results.append("error")
+        return results
+
+    first = outcomes()
+    assert first == outcomes()
+    assert "ok" in first and "error" in first
+
+def test_injected_latency(stub, cassettes, monkeypatch):
+    record(monkeypatch)
+    upstream.get(stub.url, timeout=2)
+    replay(monkeypatch, latency=0.2)
+    started = time.monotonic()
+    upstream.get(stub.url)
+    assert time.monotonic() - started >= 0.2
@@ -603,14 +603,26 @@ function showJobDetails(jobIndex) {
   }
   document.getElementById('modal-salary').textContent = salaryText;
 
-  // Clean and display description
-  var description = job.description || job.excerpt || 'No description available.';
-  // Remove HTML tags for basic display
-  description = description.replace(/<[^>]*>/g, '').trim();
-  if (description.length > 500) {
-    description = description.substring(0, 497) + '...';
+  // Listings only carry the excerpt; show it while the full description loads
+  displayJobDescription(job.description || job.excerpt);
+  if (!job.description && job.id) {
+    fetch(BASE_URL + '/api/jobs/' + encodeURIComponent(job.id) + '?fields=description')
+      .then(function(response) {
+        if (!response.ok) {
+          throw new Error('Job details not available');
+        }
+        return response.json();
+      })
+      .then(function(details) {
+        job.description = details.description;
+        if (window.currentJob === job && job.description) {
+          displayJobDescription(job.description);
+        }
+      })
+      .catch(function(error) {
+        console.log('Keeping the job excerpt:', error.message);
+      });
   }
-  document.getElementById('modal-description').textContent = description;
 
   // Display categories
   var categoriesContainer = document.getElementById('modal-categories');
@@ -633,6 +645,16 @@ function showJobDetails(jobIndex) {
   document.body.style.overflow = 'hidden';
 }
 
+function displayJobDescription(description) {
+  description = description || 'No description available.';
+  // Remove HTML tags for basic display
+  description = description.replace(/<[^>]*>/g, '').trim();
+  if (description.length > 500) {
+    description = description.substring(0, 497) + '...';
+  }
+  document.getElementById('modal-description').textContent = description;
+}
+
 function closeJobModal() {
   document.getElementById('job-modal').style.display = 'none';
   document.body.style.overflow = 'auto';
@@ -722,8 +744,12 @@ function fetchJobSkillsAndResources(job) {
     job.requirements || ''
   ].join(' ');
 
-  // First, try to get skills from the job ID if available
-  var skillsUrl = BASE_URL + '/api/jobs/' + (job.id || 'dummy') + '/skills';
+  // Jobs listed by the backend carry a stable id; skip the lookup otherwise
+  if (!job.id) {
+    extractSkillsFromDescription(jobDescription);
+    return;
+  }
+  var skillsUrl = BASE_URL + '/api/jobs/' + encodeURIComponent(job.id) + '/skills';
 
   fetch(skillsUrl)
     .then(function(response) {
@@ -734,7 +760,14 @@ function fetchJobSkillsAndResources(job) {
       return response.json();
     })
     .then(function(skillsData) {
-      displaySkillsAndResources(skillsData.skills || [], skillsData.resources || []);
+      var resourcesBySkill = skillsData.learning_resources || {};
+      var allResources = [];
+      Object.keys(resourcesBySkill).forEach(function(skill) {
+        allResources = allResources.concat(resourcesBySkill[skill].map(function(resource) {
+          return Object.assign({}, resource, { skill: skill });
+        }));
+      });
+      displaySkillsAndResources(skillsData.skills || [], allResources);
     })
     .catch(function(error) {
       console.log('Falling back to description-based skill extraction');
@@ -743,33 +776,57 @@ function fetchJobSkillsAndResources(job) {
     });
 }
 
-function extractSkillsFromDescription(description) {
-  // Define common tech skills to look for
-  var commonSkills = [
-    'javascript', 'python', 'java', 'react', 'angular', 'vue', 'node.js', 'typescript',
-    'html', 'css', 'sql', 'mongodb', 'postgresql', 'mysql', 'aws', 'azure', 'docker',
-    'kubernetes', 'git', 'linux', 'machine learning', 'data science', 'artificial intelligence',
-    'c++', 'c#', 'php', 'ruby', 'go', 'rust', 'swift', 'kotlin', 'flutter', 'react native',
-    'express', 'django', 'flask', 'spring', 'laravel', 'rails', 'selenium', 'jenkins',
-    'terraform', 'ansible', 'redis', 'elasticsearch', 'graphql', 'rest api', 'microservices'
-  ];
-
-  var foundSkills = [];
-  var lowerDescription = description.toLowerCase();
-
-  commonSkills.forEach(function(skill) {
-    if (lowerDescription.includes(skill.toLowerCase())) {
-      foundSkills.push(skill);
-    }
-  });
+// Skill taxonomy shared with the backend, fetched once per page load
+// (the browser revalidates it with its ETag)
+var skillTaxonomyPromise = null;
 
-  // If no skills found, add some generic ones
-  if (foundSkills.length === 0) {
-    foundSkills = ['programming', 'software development', 'problem solving'];
+function loadSkillTaxonomy() {
+  if (!skillTaxonomyPromise) {
+    skillTaxonomyPromise = fetch(BASE_URL + '/api/skills/taxonomy')
+      .then(function(response) {
+        if (!response.ok) {
+          throw new Error('Skill taxonomy not available');
+        }
+        return response.json();
+      })
+      .catch(function(error) {
+        console.warn('Could not load the skill taxonomy:', error.message);
+        skillTaxonomyPromise = null;
+        return { skills: {} };
+      });
   }
+  return skillTaxonomyPromise;
+}
+
+function escapeRegExp(text) {
+  return text.replace(/[.*+?^${}()|[\]\\]/g, '\\$&');
+}
 
-  // Fetch resources for found skills
-  fetchResourcesForSkills(foundSkills);
+function extractSkillsFromDescription(description) {
+  loadSkillTaxonomy().then(function(taxonomy) {
+    var lowerDescription = description.toLowerCase();
+    var foundSkills = [];
+
+    // Match each skill by its name or any alias, as a whole token like the backend does
+    Object.keys(taxonomy.skills).forEach(function(skill) {
+      var terms = [skill].concat(taxonomy.skills[skill].aliases || []);
+      var found = terms.some(function(term) {
+        var pattern = new RegExp('(^|[^\\w+#])' + escapeRegExp(term.toLowerCase()) + '(?![\\w+#])');
+        return pattern.test(lowerDescription);
+      });
+      if (found) {
+        foundSkills.push(skill);
+      }
+    });
+
+    // If no skills found, add some generic ones
+    if (foundSkills.length === 0) {
+      foundSkills = ['programming', 'software development', 'problem solving'];
+    }
+
+    // Fetch resources for found skills
+    fetchResourcesForSkills(foundSkills);
+  });
 }
 
 function fetchResourcesForSkills(skills) {
@@ -168,13 +168,13 @@ function displayJobs(jobs) {
                 ${job.employmentType ? `<span>📄 ${job.employmentType}</span>` : ''}
                 ${job.salaryMin && job.salaryMax ? 
                     `<span>💰 $${job.salaryMin.toLocaleString()} - $${job.salaryMax.toLocaleString()}</span>` : 
-                    (job.salary ? `<span>💰 ${job.salary}</span>` : '')
+                    (job.salary && job.salary.display ? `<span>💰 ${job.salary.display}</span>` : '')
                 }
                 ${job.location ? `<span>📍 ${job.location}</span>` : ''}
             </div>
 
-            ${job.description ? `
-                <div class="job-description">${job.description}</div>
+            ${job.excerpt ? `
+                <div class="job-description">${job.excerpt}</div>
             ` : ''}
 
             ${job.required_skills && job.required_skills.length > 0 ? `